@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dedupe import dedupe_records, identity_key
+from pipeline import FilterPipeline, PARSED
+
+DEFAULT_MAX_RESULTS = 20
+DEDUPE_FILTER = "not claimed by another query"
+
+def parse_job_line(line: str, default_max_results: int = DEFAULT_MAX_RESULTS) -> Optional[Dict[str, Any]]:
+    """
+    One job from a queries-file line: "cafes in Kumasi", "cafes in Kumasi | 50" or
+    "cafes in Kumasi<TAB>50". Blank lines and lines starting with # give None.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    for sep in ("\t", "|"):
+        query, found, limit = line.rpartition(sep)
+        if found and limit.strip().isdigit() and query.strip():
+            return {"query": query.strip(), "max_results": int(limit)}
+    return {"query": line, "max_results": default_max_results}
+
+def load_jobs(path: str, default_max_results: int = DEFAULT_MAX_RESULTS) -> List[Dict[str, Any]]:
+    """
+    Reads a queries file: plain text (see parse_job_line) or, for .jsonl files, one
+    {"query": ..., "max_results": ...} object per line.
+    """
+    jobs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if path.lower().endswith(".jsonl"):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    job = {"query": str(entry["query"]).strip(),
+                           "max_results": int(entry.get("max_results") or default_max_results)}
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(f"{path}:{number}: invalid job ({e})")
+            else:
+                job = parse_job_line(line, default_max_results)
+            if job and job["query"]:
+                jobs.append(job)
+    return jobs
+
+class CrossQueryDedupe:
+    """
+    Hands each business to the first query that parses it. Other queries drop it at the parsed
+    stage, before a social lookup is spent on it. Claims use the identity key (name plus phone,
+    plus code or address), so same-named branches found by different queries are both kept;
+    records without a key are never claimed. A retried query keeps the businesses it claimed
+    on its earlier attempt.
+    """
+
+    def __init__(self):
+        self._owners: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, owner: Any) -> bool:
+        if not key:
+            return True
+        with self._lock:
+            return self._owners.setdefault(key, owner) == owner
+
+    def predicate(self, owner: Any) -> Callable[[Dict[str, Any]], bool]:
+        return lambda biz: self.claim(identity_key(biz), owner)
+
+def run_batch(jobs: List[Dict[str, Any]], run: Callable[..., List[Dict[str, Any]]],
+              make_filters: Callable[[], FilterPipeline], concurrency=1, retries=1, retry_delay=5.0,
+              resume=False, log: Callable[[str], None] = print,
+              stop_flag_func: Optional[Callable[[], bool]] = None, request_stop: Optional[Callable[[], None]] = None,
+              **run_options) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Runs every job through `run` (run_extraction) on `concurrency` threads.
+    A failed job is retried up to `retries` times and resumes from its checkpoint. On Ctrl+C,
+    `request_stop` is called so running jobs stop (keeping their checkpoints) and queued ones are dropped.
+    Returns (unique records in job order, near-duplicates merged; one report entry per job).
+    """
+    dedupe = CrossQueryDedupe()
+    results: Dict[int, List[Dict[str, Any]]] = {}
+    report: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+
+    def run_job(index: int, job: Dict[str, Any]):
+        tag = f"[{index + 1}/{len(jobs)}] "
+        entry = {"query": job["query"], "max_results": job["max_results"], "status": "skipped",
+                 "attempts": 0, "collected": 0, "duplicates": 0, "seconds": 0.0, "error": None}
+        report[index] = entry
+        if stop_flag_func and stop_flag_func():
+            return
+
+        filters = make_filters().add(PARSED, DEDUPE_FILTER, dedupe.predicate(index))
+        started = time.perf_counter()
+        for attempt in range(retries + 1):
+            entry["attempts"] = attempt + 1
+            try:
+                records = run(job["query"], job["max_results"], filters=filters, resume=resume or attempt > 0,
+                              log_func=lambda msg: log(tag + msg), reset_stats=False, raise_errors=True,
+                              **run_options)
+                results[index] = records
+                entry["status"] = "stopped" if stop_flag_func and stop_flag_func() else "ok"
+                entry["collected"] = len(records)
+                entry["error"] = None
+                break
+            except Exception as e:
+                entry["status"] = "failed"
+                entry["error"] = str(e)
+                if attempt < retries and not (stop_flag_func and stop_flag_func()):
+                    delay = retry_delay * (2 ** attempt)
+                    log(f"{tag}🔁 '{job['query']}' failed ({e}); retrying in {delay:.0f}s\n")
+                    time.sleep(delay)
+                else:
+                    break
+        entry["duplicates"] = filters.counters[DEDUPE_FILTER]["dropped"]
+        entry["seconds"] = round(time.perf_counter() - started, 1)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="batch")
+    futures = [executor.submit(run_job, i, job) for i, job in enumerate(jobs)]
+    try:
+        for future in futures:
+            future.result()
+    except KeyboardInterrupt:
+        if request_stop:
+            request_stop()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+    merges = []
+    records = dedupe_records((biz for index in sorted(results) for biz in results[index]), on_decision=merges.append)
+    if merges:
+        log(f"🔗 Merged {len(merges)} records that different queries found under other names\n")
+    return records, [entry for entry in report if entry is not None]
+
+def format_report(report: List[Dict[str, Any]]) -> str:
+    lines = ["📋 Batch report:"]
+    for entry in report:
+        line = (f"   {entry['status']:>7}  {entry['query']}: {entry['collected']}/{entry['max_results']} collected, "
+                f"{entry['duplicates']} duplicates skipped, {entry['attempts']} attempt(s), {entry['seconds']}s")
+        if entry["error"]:
+            line += f" ({entry['error']})"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+def write_report(report: List[Dict[str, Any]], path: str):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
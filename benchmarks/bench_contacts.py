@@ -0,0 +1,112 @@
+"""
+Contact-crawler benchmark against local HTTP servers.
+
+    python -m benchmarks.bench_contacts [--sites 500] [--hosts 50] [--latency-ms 100]
+                                        [--workers 16] [--host-delay 0.2]
+
+Each fake host (one port on 127.0.0.1) serves `--sites / --hosts` business sites, each with a
+home page linking to a contact page that holds an email and a phone; every third site only
+writes its contacts in the page text, every fifth has only an email on its home page (so the
+fallback paths are tried) and every seventh is a dead link. Reports sites/hour, pages fetched
+and the share of sites whose email and phone were found, then re-runs the crawl to show the cache.
+"""
+import argparse
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+from contacts import ContactCrawler
+
+def site_pages(site: int) -> dict:
+    """Path -> HTML of one fake business site."""
+    email, phone = f"info@biz{site}.com.gh", f"030 2{site % 100:02d} {site % 10000:04d}"
+    filler = "<p>" + "Fresh food daily. " * 200 + "</p>"
+    if site % 5 == 0:
+        # No contact page: the email is on the home page and the fallback paths answer 404.
+        return {f"/s{site}/": f"<html><body><footer>Mail {email}</footer>{filler}</body></html>"}
+    if site % 3 == 0:
+        contact = f"<p>Write to {email} or call {phone}.</p>"
+    else:
+        contact = f'<a href="mailto:{email}">Email us</a> <a href="tel:{phone}">Call</a>'
+    return {
+        f"/s{site}/": (f"<html><body><nav><a href='/s{site}/menu'>Menu</a>"
+                       f"<a href='/s{site}/contact-us.html'>Contact us</a></nav>{filler}</body></html>"),
+        f"/s{site}/contact-us.html": f"<html><body><h1>Contact</h1>{contact}{filler}</body></html>",
+    }
+
+def start_hosts(sites: int, hosts: int, latency: float) -> Tuple[List[ThreadingHTTPServer], List[str]]:
+    pages = {}
+    for site in range(sites):
+        pages.update(site_pages(site))
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            body = pages.get(self.path)
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            data = (body or "<h1>Not found</h1>").encode("utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    servers = []
+    for _ in range(hosts):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    urls = []
+    for site in range(sites):
+        port = servers[site % hosts].server_address[1]
+        path = f"/s{site}/" if site % 7 else f"/gone{site}/"
+        urls.append(f"http://127.0.0.1:{port}{path}")
+    return servers, urls
+
+def crawl(crawler: ContactCrawler, urls: List[str]) -> dict:
+    records = [{"name": f"Biz {i}", "website": url, "email": "N/A", "phone": "N/A", "social_links": {}}
+               for i, url in enumerate(urls)]
+    crawler.reset_stats()
+    started = time.perf_counter()
+    crawler.crawl_many(records)
+    elapsed = time.perf_counter() - started
+    live = [biz for i, biz in enumerate(records) if i % 7]
+    return {
+        "seconds": elapsed,
+        "sites_per_hour": len(records) / elapsed * 3600,
+        "email_found": sum(biz["email"] != "N/A" for biz in live) / len(live),
+        "phone_found": sum(biz["phone"] != "N/A" for biz in live) / len(live),
+        "stats": dict(crawler.stats),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the contact crawler against local HTTP servers")
+    parser.add_argument("--sites", type=int, default=500, help="Business sites to crawl (default: 500)")
+    parser.add_argument("--hosts", type=int, default=50, help="Distinct hosts the sites are spread over (default: 50)")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Server delay per request (default: 100)")
+    parser.add_argument("--workers", type=int, default=16, help="Crawler threads (default: 16)")
+    parser.add_argument("--per-host", type=int, default=2, help="Requests in flight per host (default: 2)")
+    parser.add_argument("--host-delay", type=float, default=0.2, help="Seconds between requests to one host (default: 0.2)")
+    args = parser.parse_args()
+
+    servers, urls = start_hosts(args.sites, args.hosts, args.latency_ms / 1000)
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = ContactCrawler(workers=args.workers, per_host=args.per_host, host_delay=args.host_delay,
+                                 cache_file=f"{tmp}/crawl_cache.db")
+        for label in ("cold", "cached"):
+            r = crawl(crawler, urls)
+            print(f"{label:>6}: {len(urls)} sites in {r['seconds']:.1f}s = {r['sites_per_hour']:,.0f} sites/hour, "
+                  f"email {r['email_found']:.0%}, phone {r['phone_found']:.0%} of live sites; "
+                  f"{r['stats']['pages']} pages fetched, {r['stats']['cached']} cached, {r['stats']['errors']} failed",
+                  flush=True)
+        crawler.cache.close()
+    for server in servers:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
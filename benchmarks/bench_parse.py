@@ -0,0 +1,84 @@
+"""
+Micro-benchmark: single-pass parsing.parse_details vs. the previous four-scan extraction.
+
+    python -m benchmarks.bench_parse [--records 5000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import re
+import time
+
+from parsing import parse_details_batch, is_social_media_link, is_non_social_website
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "panel_details.json")
+
+def legacy_parse(details):
+    """The per-call-compiled, four-scan extraction that extract_business_info used to run."""
+    def extract_phones(texts):
+        phones = []
+        phone_regex = re.compile(r'(\+233|0)[235][0-9][ -]?\d{3}[ -]?\d{4}|\+?\d{10,15}')
+        for text in texts:
+            found = phone_regex.findall(text)
+            if found:
+                phones.extend([f[0] if isinstance(f, tuple) else f for f in found])
+        return list(set(phones))
+
+    def extract_emails(texts):
+        emails = []
+        email_regex = re.compile(r"([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)")
+        for text in texts:
+            found = email_regex.findall(text)
+            if found:
+                emails.extend(found)
+        return list(set(emails))
+
+    def extract_websites(texts):
+        urls = []
+        url_regex = re.compile(
+            r"(https?://[^\s]+|www\.[^\s]+|[a-zA-Z0-9-]+\.(?:com|org|net|gh|co|io|ai|me|store|biz|edu)(/[^\s]*)?)"
+        )
+        for text in texts:
+            for url in url_regex.findall(text):
+                url = url[0] if isinstance(url, tuple) else url
+                if not is_social_media_link(url) and is_non_social_website(url):
+                    urls.append(url if url.startswith("http") else "https://" + url)
+        return list(set(urls))
+
+    def extract_address(texts):
+        for text in texts:
+            if re.search(r'\b(Street|St|Ave|Rd|Junction|Accra|Tema|Kumasi|Plot|No\.|Close|Crescent)\b', text, re.I) or \
+               re.search(r'[A-Z0-9]{4,}\+[A-Z0-9]{2,}', text):
+                return text
+        return None
+
+    return extract_phones(details), extract_emails(details), extract_websites(details), extract_address(details)
+
+def _best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark detail-text parsing")
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        samples = [biz["details"] for biz in json.load(f)]
+    details_lists = [samples[i % len(samples)] for i in range(args.records)]
+
+    legacy = _best_of(lambda: [legacy_parse(d) for d in details_lists], args.repeat)
+    engine = _best_of(lambda: parse_details_batch(details_lists), args.repeat)
+
+    print(f"records: {args.records} (best of {args.repeat})")
+    print(f"legacy four-scan : {legacy * 1000:8.1f} ms  ({args.records / legacy:,.0f} records/s)")
+    print(f"single-pass      : {engine * 1000:8.1f} ms  ({args.records / engine:,.0f} records/s)")
+    print(f"speedup          : {legacy / engine:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+End-to-end scraping benchmark against the offline fake Maps driver and stub Custom Search service.
+
+    python -m benchmarks.bench_scrape [--sizes 10,100,1000,10000] [--modes panel,list,parallel,http]
+                                      [--latency-ms 0] [--cse-latency-ms 0] [--stream] [--json out.json]
+                                      [--compare baseline.json] [--threshold 0.2]
+
+Reports businesses/second, WebDriver round-trips (HTTP requests for the http engine) per business, per-stage latency (from the
+metrics module's stage timers) and peak Python memory (tracemalloc) per mode and size.
+Data is deterministic, so a --json result saved on one commit can be passed to --compare on
+another; throughput drops or round-trip increases beyond --threshold are listed as
+regressions and the exit status is 1.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import extract_businesses as eb
+from metrics import metrics
+from pipeline import build_filters
+from readiness import readiness
+from benchmarks.fake_maps import FakeMaps, FakeMapsDriver, FakeMapsSession, FakeCSEService
+
+MODES = ("panel", "list", "parallel", "http")
+
+@contextlib.contextmanager
+def offline_environment(service: FakeCSEService):
+    """Points social lookups at the stub service, disables the on-disk cache and the CSE rate limit,
+    and shortens readiness timeouts so exhausting the fake results list does not dominate small runs."""
+    saved = {
+        "get_google_service": eb.get_google_service,
+        "SOCIAL_CACHE_FILE": eb.SOCIAL_CACHE_FILE,
+        "_social_cache": eb._social_cache,
+        "CSE_QUERIES_PER_MINUTE": eb.CSE_QUERIES_PER_MINUTE,
+    }
+    saved_readiness = (readiness.settle, readiness.poll, readiness.min_timeout, readiness.ceilings)
+    eb.get_google_service = lambda key=None: service
+    eb.SOCIAL_CACHE_FILE = None
+    eb._social_cache = None
+    eb.CSE_QUERIES_PER_MINUTE = 10 ** 9
+    readiness.settle, readiness.poll, readiness.min_timeout = 0.0, 0.001, 0.01
+    readiness.ceilings = {"scroll": 0.05, "panel": 1.0}
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(eb, name, value)
+        readiness.settle, readiness.poll, readiness.min_timeout, readiness.ceilings = saved_readiness
+
+def run_once(mode: str, size: int, args) -> Dict[str, Any]:
+    maps = FakeMaps(size, website_share=args.website_share)
+    service = FakeCSEService(latency=args.cse_latency_ms / 1000)
+    latency = args.latency_ms / 1000
+    drivers = [FakeMapsDriver(maps, page_size=args.page_size, latency=latency)]
+    session = FakeMapsSession(maps, latency=latency)
+
+    def driver_factory():
+        drivers.append(FakeMapsDriver(maps, page_size=args.page_size, latency=latency))
+        return drivers[-1]
+
+    with tempfile.TemporaryDirectory() as tmp, offline_environment(service), \
+            open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        readiness.start_run()
+        output_file = os.path.join(tmp, "bench.db")
+        filters = build_filters(include_websites=True)
+        driver = drivers[0]
+        if mode != "http":
+            driver.get("https://www.google.com/maps/search/bench")
+
+        tracemalloc.start()
+        metrics.start_run(mode=mode, size=size)
+        started = time.perf_counter()
+        if mode == "panel":
+            records = eb.iter_panel_businesses(driver, max_results=size, filters=filters)
+        elif mode == "http":
+            records = eb.iter_http_businesses("bench", max_results=size, filters=filters, session=session,
+                                              page_size=args.page_size)
+        elif mode == "list":
+            records = eb.iter_list_businesses(driver, max_results=size, filters=filters)
+        else:
+            records = eb.iter_parallel_businesses(driver, driver_factory, max_results=size, workers=args.workers,
+                                                  filters=filters)
+        if args.stream:
+            collected = sum(1 for _ in eb.save_stream(records, output_file))
+        else:
+            collected = len(eb.collect_businesses(records, output_file))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    round_trips = sum(d.round_trips for d in drivers) + session.round_trips
+    return {
+        "mode": mode,
+        "size": size,
+        "collected": collected,
+        "seconds": elapsed,
+        "businesses_per_sec": collected / elapsed if elapsed else 0.0,
+        "round_trips": round_trips,
+        "round_trips_per_business": round_trips / max(1, collected),
+        "cse_queries": service.queries,
+        "peak_mb": peak / (1024 * 1024),
+        "stages": {
+            stage: {
+                "count": s["count"],
+                "total": s["total"],
+                "p50_ms": s["p50"] * 1000,
+                "p95_ms": s["p95"] * 1000,
+                "p99_ms": s["p99"] * 1000,
+            }
+            for stage, s in metrics.summary()["stages"].items()
+        },
+    }
+
+def format_result(r: Dict[str, Any]) -> str:
+    lines = [
+        f"{r['mode']:>8} {r['size']:>6}: {r['businesses_per_sec']:9.1f} biz/s  {r['seconds']:7.2f}s  "
+        f"{r['round_trips_per_business']:6.1f} round-trips/biz  peak {r['peak_mb']:6.1f} MB"
+        + ("" if r["collected"] == r["size"] else f"  (only {r['collected']} collected)")
+    ]
+    for stage, s in r["stages"].items():
+        lines.append(f"{'':15}{stage:>11}: {s['count']:6} calls  p50 {s['p50_ms']:7.3f} ms  "
+                     f"p95 {s['p95_ms']:7.3f} ms  p99 {s['p99_ms']:7.3f} ms")
+    return "\n".join(lines)
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Regressions against a saved --json run, matched by mode and size."""
+    base = {(r["mode"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        b = base.get((r["mode"], r["size"]))
+        if not b:
+            continue
+        speed = r["businesses_per_sec"] / b["businesses_per_sec"] if b["businesses_per_sec"] else 1.0
+        trips = r["round_trips_per_business"] / b["round_trips_per_business"] if b["round_trips_per_business"] else 1.0
+        print(f"{r['mode']:>8} {r['size']:>6}: throughput x{speed:.2f}, round-trips x{trips:.2f} vs {baseline.get('commit', 'baseline')}")
+        if speed < 1 - threshold:
+            regressions.append(f"{r['mode']}/{r['size']}: throughput {speed:.0%} of baseline")
+        if trips > 1 + threshold:
+            regressions.append(f"{r['mode']}/{r['size']}: {trips:.0%} of baseline WebDriver round-trips")
+    return regressions
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraping loop offline")
+    parser.add_argument("--sizes", default="10,100,1000,10000", help="Comma-separated business counts")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated modes ({', '.join(MODES)})")
+    parser.add_argument("--workers", type=int, default=4, help="Worker drivers in parallel mode (default: 4)")
+    parser.add_argument("--page-size", type=int, default=20, help="Cards loaded per scroll (default: 20)")
+    parser.add_argument("--website-share", type=float, default=0.5, help="Share of businesses with a website")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated delay per WebDriver call")
+    parser.add_argument("--cse-latency-ms", type=float, default=0.0, help="Simulated delay per Custom Search query")
+    parser.add_argument("--stream", action="store_true",
+                        help="Consume the record stream without keeping a result list (shows streaming memory)")
+    parser.add_argument("--json", metavar="PATH", help="Write the results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a JSON file written by --json")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression (default: 0.2)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(sorted(unknown))}")
+
+    results = []
+    for mode in modes:
+        for size in sizes:
+            result = run_once(mode, size, args)
+            results.append(result)
+            print(format_result(result), flush=True)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "options": {k: v for k, v in vars(args).items() if k not in ("json", "compare")},
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Wrote {args.json}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"❌ Regression: {line}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Startup benchmark: wall-clock time of short getbusinesses.py commands and the heavy modules they load.
+
+    python -m benchmarks.bench_startup [--repeat 5] [--budget 1.0] [--top 10]
+
+Each command runs in a fresh interpreter inside a scratch directory (so the default store there
+is empty and the real one is never touched). The median of --repeat runs is reported, and one
+extra run under `python -X importtime` lists which HEAVY_MODULES the command imported and the
+slowest imports overall. Exits with status 1 when a command is over --budget seconds or loads a
+heavy module it should not need.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "getbusinesses.py")
+# Browser, GUI and HTML-parsing stacks; none of the commands below should need them.
+HEAVY_MODULES = ("selenium", "webdriver_manager", "tkinter", "googleapiclient", "bs4", "extract_businesses")
+
+# name -> (arguments, stdin)
+COMMANDS: Dict[str, Tuple[List[str], str]] = {
+    "help": (["--help"], ""),
+    "export": (["export", "-o", "out.csv"], ""),
+    "dedupe": (["dedupe", "--dry-run"], ""),
+    "cli show": (["-t", "cli"], "show\nexit\n"),
+    "cli clear": (["-t", "cli"], "clear\nexit\n"),
+}
+
+def run(args: List[str], stdin: str, cwd: str, importtime: bool = False) -> Tuple[float, str]:
+    flags = ["-X", "importtime"] if importtime else []
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, *flags, SCRIPT, *args], input=stdin, cwd=cwd,
+                          capture_output=True, text=True, encoding="utf-8")
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited with {proc.returncode}:\n{proc.stderr[-2000:]}")
+    return elapsed, proc.stderr
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """(module, cumulative microseconds) for every import in `python -X importtime` output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = line.split(":", 1)[1].split("|")
+        imports.append((name.strip(), int(cumulative)))
+    return imports
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup time")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command (default: 5)")
+    parser.add_argument("--budget", type=float, default=1.0, help="Allowed median seconds per command (default: 1.0)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list per command (default: 10)")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as cwd:
+        for label, (command, stdin) in COMMANDS.items():
+            times = [run(command, stdin, cwd)[0] for _ in range(args.repeat)]
+            median = statistics.median(times)
+            _, stderr = run(command, stdin, cwd, importtime=True)
+            imports = parse_importtime(stderr)
+            heavy = sorted({name.split(".")[0] for name, _ in imports if name.split(".")[0] in HEAVY_MODULES})
+            status = "✅" if median <= args.budget and not heavy else "❌"
+            print(f"{status} {label:<10} median {median * 1000:7.1f} ms (min {min(times) * 1000:.1f} ms)"
+                  f"{'; loads ' + ', '.join(heavy) if heavy else ''}")
+            top_level = [(name, us) for name, us in imports if "." not in name]
+            for name, us in sorted(top_level, key=lambda item: -item[1])[:args.top]:
+                print(f"      {us / 1000:7.1f} ms  {name}")
+            if status == "❌":
+                failures.append(label)
+    if failures:
+        print(f"⚠️ Over budget or loading heavy modules: {', '.join(failures)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Tiling benchmark: how much of an area one capped search finds versus a tiled run.
+
+    python -m benchmarks.bench_tiles [--places 3000] [--cap 120] [--grid 2x2] [--max-depth 4]
+                                     [--concurrency 4] [--latency-ms 20] [--json out.json]
+
+Runs run_extraction over the HTTP engine against FakeTiledMapsSession, whose businesses sit
+around a few dense centres inside --bounds and whose searches stop at --cap results, inside
+a scratch directory (store and checkpoints there, the real ones are never touched).
+The first run is a single search over the whole area; the second splits it into --grid tiles
+and subdivides capped ones. Reports the share of the area's businesses found, searches and
+HTTP requests made, duplicates between tiles and the per-tile coverage summary.
+"""
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+import maps_http
+from benchmarks.bench_scrape import offline_environment
+from benchmarks.fake_maps import FakeMaps, FakeTiledMapsSession, FakeCSEService
+from getbusinesses import run_extraction
+from pipeline import build_filters
+from tiles import parse_bounds, parse_grid, plan_tiles, run_tiles, coverage, format_report
+
+@contextlib.contextmanager
+def scratch_session(session):
+    """Runs in a scratch directory with `session` as the HTTP engine's shared session."""
+    saved_session, cwd = maps_http._session, os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        maps_http._session = session
+        try:
+            yield
+        finally:
+            maps_http._session = saved_session
+            os.chdir(cwd)
+
+def run_once(label: str, args, rows: int, cols: int, max_depth: int) -> Dict[str, Any]:
+    bounds = parse_bounds(args.bounds)
+    maps = FakeMaps(args.places)
+    session = FakeTiledMapsSession(maps, bounds, cap=args.cap, latency=args.latency_ms / 1000)
+    with scratch_session(session), offline_environment(FakeCSEService()), \
+            open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        records, report = run_tiles("bench", plan_tiles(bounds, rows, cols), run_extraction,
+                                    lambda: build_filters(include_websites=True), cap=args.cap,
+                                    max_depth=max_depth, concurrency=args.concurrency, retries=0,
+                                    log=lambda msg: None, engine="http")
+        elapsed = time.perf_counter() - started
+    names = [biz["name"] for biz in records]
+    return {
+        "run": label,
+        "places": args.places,
+        "found": len(set(names)),
+        "duplicates": len(names) - len(set(names)),
+        "found_share": len(set(names)) / args.places,
+        "tiles": len(report),
+        "searches": session.searches,
+        "requests": session.requests,
+        "seconds": elapsed,
+        "coverage": coverage(report),
+        "report": report,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tiled searches against a capped fake Maps")
+    parser.add_argument("--places", type=int, default=3000, help="Businesses in the area (default: 3000)")
+    parser.add_argument("--bounds", default="5.52,-0.30,5.68,-0.12", help="south,west,north,east (default: central Accra)")
+    parser.add_argument("--cap", type=int, default=120, help="Results one search returns (default: 120)")
+    parser.add_argument("--grid", default="2x2", help="Starting grid (default: 2x2)")
+    parser.add_argument("--max-depth", type=int, default=4, help="Splits per tile (default: 4)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Tiles searched at once (default: 4)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Delay per HTTP request (default: 20)")
+    parser.add_argument("--report", action="store_true", help="Print the per-tile report of the tiled run")
+    parser.add_argument("--json", metavar="PATH", help="Write both runs as JSON to PATH")
+    args = parser.parse_args()
+
+    rows, cols = parse_grid(args.grid)
+    results = [run_once("single search", args, 1, 1, 0), run_once(f"tiled {rows}x{cols}", args, rows, cols, args.max_depth)]
+    for r in results:
+        c = r["coverage"]
+        print(f"{r['run']:>14}: {r['found']}/{r['places']} businesses ({r['found_share']:.1%}) in {r['seconds']:.1f}s; "
+              f"{r['tiles']} tiles, {r['searches']} searches, {r['requests']} requests, {r['duplicates']} duplicates kept; "
+              f"area {c['complete']:.1%} complete, {c['capped']:.1%} capped", flush=True)
+    if args.report:
+        print(format_report(results[1]["report"]), end="")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+"""
+Offline stand-ins for Google Maps and the Custom Search API, driven by the recorded
+fixtures in benchmarks/fixtures/.
+
+FakeMapsDriver answers the WebDriver calls the scraping loop makes (find_elements,
+find_element, execute_script, execute_async_script, get_attribute, click, get) for any number of synthetic
+businesses. Each business is the recorded card / panel with its name, address, phone,
+website and plus code swapped out. FakeMapsSession serves the recorded search-endpoint
+response the same way for the HTTP engine, and FakeTiledMapsSession adds map positions and
+the per-search result cap for tiled runs. FakeCSEService replaces get_google_service().
+"""
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import requests
+from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+
+from cards import CARDS_EXTRACT_JS, CARD_LINKS_JS
+from maps_http import (PLACE_PATH, PLACE_FIELDS, XSSI_PREFIX, DEFAULT_DISTANCE, FIELD_OF_VIEW, VIEWPORT_PX,
+                       load_payload, parse_search_payload)
+from panel import PANEL_EXTRACT_JS, TEXT_CLASSES
+from readiness import PANEL_STATE_JS, SCROLL_FEED_JS
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+PANEL_REGION_SELECTOR = 'div.m6QErb.XiKgde[role="region"]'
+
+# Values in the recorded fixtures that are replaced per synthetic business.
+RECORDED = {
+    "name": "Mama's Kitchen",
+    "address": "12 Oxford Street, Accra",
+    "phone": "024 412 3456",
+    "tel": "0244123456",
+    "domain": "mamaskitchen.com.gh",
+    "plus_code": "CCV5+QX",
+}
+
+_ADJECTIVES = ["Golden", "Royal", "Sunrise", "Blue", "Green", "Unity", "Grace", "Prime", "Star", "Happy"]
+_NOUNS = ["Kitchen", "Auto Works", "Pharmacy", "Salon", "Hardware", "Bakery", "Tailors", "Clinic", "Spot", "Mart"]
+_STREETS = ["Oxford", "Liberation", "Ring", "Spintex", "Kojo Thompson", "Castle", "Independence", "Cantonments"]
+
+def _read(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+def _panel_script_result(html: str) -> Dict[str, Any]:
+    """What PANEL_EXTRACT_JS returns for `html` (same traversal, done with BeautifulSoup)."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    def attr(selector, name):
+        el = soup.select_one(selector)
+        return el.get(name) if el else None
+
+    texts = []
+    for cls in TEXT_CLASSES:
+        for div in soup.find_all("div", class_=cls):
+            texts.append(div.get_text(" ", strip=True))
+    texts.extend(span.get_text("", strip=True) for span in soup.find_all("span"))
+    return {
+        "texts": list(dict.fromkeys(t for t in texts if t)),
+        "fields": {
+            "address": attr('[data-item-id="address"]', "aria-label"),
+            "plus_code": attr('[data-item-id="oloc"]', "aria-label"),
+            "phone": attr('[data-item-id^="phone:tel:"]', "data-item-id"),
+            "website": attr('a[data-item-id="authority"]', "href"),
+        },
+    }
+
+def _card_script_result(html: str) -> Dict[str, Any]:
+    """What CARDS_EXTRACT_JS returns for one card (without the `link` element)."""
+    soup = BeautifulSoup(html, "html.parser")
+    text = lambda el: " ".join(el.get_text().split()) if el else None
+    link = soup.select_one("a.hfpxzc")
+    website = soup.select_one('a[data-value="Website"]')
+    lines = [text(div) for div in soup.select("div.W4Efsd") if not div.select_one("div.W4Efsd")]
+    return {
+        "name": link["aria-label"].strip(),
+        "url": link["href"],
+        "rating": text(soup.select_one("span.MW4etd")),
+        "reviews": text(soup.select_one("span.UY7F9")),
+        "website": website["href"] if website else None,
+        "lines": [line for line in lines if line],
+    }
+
+def _substitute(value, replacements):
+    if isinstance(value, str):
+        for old, new in replacements:
+            value = value.replace(old, new)
+        return value
+    if isinstance(value, list):
+        return [_substitute(v, replacements) for v in value]
+    if isinstance(value, dict):
+        return {k: _substitute(v, replacements) for k, v in value.items()}
+    return value
+
+class FakeMaps:
+    """
+    Deterministic synthetic result list of `count` businesses built from the recorded fixtures.
+    Roughly `website_share` of them have a website; the rest have the website block removed.
+    With a `chain` name, every `chain_every`-th business is a branch of that chain: same name,
+    its own address, phone and place ids.
+    """
+
+    def __init__(self, count: int, website_share: float = 0.5, chain: Optional[str] = None, chain_every: int = 5):
+        self.count = count
+        self.website_share = website_share
+        self.chain = chain
+        self.chain_every = chain_every
+        panel_html = _read("panel_region.html")
+        # Top-level RcCsl blocks; the website block is dropped for businesses without one.
+        self._panel_blocks = [b for b in re.split(r'(?=<div class="RcCsl)', panel_html) if b.strip()]
+        self._panel_result = _panel_script_result(panel_html)
+        self._card_result = _card_script_result(_read("result_card.html"))
+        self._search_payload = load_payload(_read("search_page.txt"))
+        self._place = parse_search_payload(self._search_payload)[0]
+
+    def business(self, index: int) -> Dict[str, Any]:
+        name = f"{_ADJECTIVES[index % 10]} {_NOUNS[(index // 10) % 10]} {index}"
+        if self.chain and index % self.chain_every == 0:
+            name = self.chain
+        slug = re.sub(r"[^a-z0-9]+", "", name.lower())
+        feature_id = f"0xbe{index:06x}:0x{index * 7919 + 1:x}"
+        return {
+            "name": name,
+            "address": f"{index % 200 + 1} {_STREETS[index % len(_STREETS)]} Street, Accra",
+            "phone": f"0{2 + index % 4}4 {index % 1000:03d} {index % 10000:04d}",
+            "domain": f"{slug}.com.gh",
+            "plus_code": f"CC{index % 10}{(index // 10) % 10}+{index % 9}X",
+            "has_website": (index * 7919 % 100) < self.website_share * 100,
+            "feature_id": feature_id,
+            "place_id": f"ChIJbench{index}",
+            "url": f"https://www.google.com/maps/place/{urllib.parse.quote_plus(name)}/data=!4m7!3m6!1s{feature_id}!bench{index}",
+        }
+
+    def _replacements(self, biz: Dict[str, Any]):
+        return [
+            (RECORDED["name"], biz["name"]),
+            (RECORDED["address"], biz["address"]),
+            (RECORDED["phone"], biz["phone"]),
+            (RECORDED["tel"], biz["phone"].replace(" ", "")),
+            (RECORDED["domain"], biz["domain"]),
+            (RECORDED["plus_code"], biz["plus_code"]),
+        ]
+
+    def panel_html(self, index: int) -> str:
+        biz = self.business(index)
+        blocks = self._panel_blocks if biz["has_website"] else \
+            [b for b in self._panel_blocks if 'data-item-id="authority"' not in b]
+        return _substitute("".join(blocks), self._replacements(biz))
+
+    def panel_result(self, index: int) -> Dict[str, Any]:
+        biz = self.business(index)
+        result = _substitute(self._panel_result, self._replacements(biz))
+        if not biz["has_website"]:
+            result["fields"]["website"] = None
+            result["texts"] = [t for t in result["texts"] if biz["domain"] not in t]
+        return result
+
+    def card_result(self, index: int) -> Dict[str, Any]:
+        biz = self.business(index)
+        result = _substitute(self._card_result, self._replacements(biz))
+        result["url"] = biz["url"]
+        if not biz["has_website"]:
+            result["website"] = None
+        return result
+
+    def search_entry(self, index: int) -> List[Any]:
+        """One result entry of the search endpoint's payload, as the HTTP engine receives it."""
+        biz = self.business(index)
+        place = _substitute(self._place, self._replacements(biz))
+        if not biz["has_website"]:
+            place[PLACE_FIELDS["website"][0]] = None
+        place[PLACE_FIELDS["feature_id"][0]] = biz["feature_id"]
+        place[PLACE_FIELDS["place_id"][0]] = biz["place_id"]
+        entry = [None] * PLACE_PATH[0] + [place]
+        return entry
+
+    def search_response(self, offset: int, page_size: int, indices: Optional[List[int]] = None) -> str:
+        """
+        The search endpoint's response text for one page (wrapped and prefixed like the recording).
+        `indices` lists the businesses the search found, in result order (default: all of them).
+        """
+        meta = self._search_payload[0][1][0]
+        indices = indices if indices is not None else range(self.count)
+        entries = [self.search_entry(i) for i in indices[offset:offset + page_size]]
+        payload = [[self._search_payload[0][0], [meta] + entries]]
+        inner = XSSI_PREFIX + "\n" + json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        return XSSI_PREFIX + "\n" + json.dumps({"c": 0, "d": inner}, ensure_ascii=False) + '/*""*/'
+
+    def index_of(self, url: str) -> Optional[int]:
+        match = re.search(r"!bench(\d+)", url or "")
+        return int(match.group(1)) if match else None
+
+class FakeElement:
+    """A WebElement handle: a result card, its place link, a panel region or the results feed."""
+
+    def __init__(self, driver: "FakeMapsDriver", kind: str, index: Optional[int] = None):
+        self.driver = driver
+        self.kind = kind
+        self.index = index
+
+    def find_element(self, by, value):
+        self.driver._round_trip("find_element")
+        if self.kind == "card" and by == By.CLASS_NAME and value == "hfpxzc":
+            return FakeElement(self.driver, "link", self.index)
+        raise NoSuchElementException(f"{self.kind} has no element {by}={value}")
+
+    def get_attribute(self, name):
+        self.driver._round_trip("get_attribute")
+        if self.kind == "link":
+            biz = self.driver.maps.business(self.index)
+            return {"aria-label": biz["name"], "href": biz["url"]}.get(name)
+        if self.kind == "region" and name == "innerHTML":
+            return self.driver.maps.panel_html(self.index) if self.index is not None else ""
+        return None
+
+    def click(self):
+        self.driver._round_trip("click")
+        if self.kind in ("card", "link"):
+            self.driver.open_place(self.index)
+
+class FakeMapsDriver:
+    """
+    WebDriver stand-in serving a FakeMaps result list. Every call counts as one WebDriver
+    round-trip (`calls`) and can be slowed by `latency` seconds to mimic a real browser.
+    Scripts the fake does not know raise NotImplementedError, so a new browser call in the
+    scraping loop shows up here instead of silently returning None.
+    """
+
+    def __init__(self, maps: FakeMaps, page_size: int = 20, latency: float = 0.0):
+        self.maps = maps
+        self.page_size = page_size
+        self.latency = latency
+        self.loaded = 0
+        self.open_index: Optional[int] = None
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def _round_trip(self, kind: str):
+        with self._lock:
+            self.calls[kind] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def open_place(self, index: Optional[int]):
+        self.open_index = index
+
+    def get(self, url: str):
+        self._round_trip("get")
+        index = self.maps.index_of(url)
+        if index is not None:
+            self.open_place(index)
+        else:
+            self.loaded = min(self.page_size, self.maps.count)
+            self.open_index = None
+
+    def find_elements(self, by, value) -> List[FakeElement]:
+        self._round_trip("find_elements")
+        if by == By.CLASS_NAME and value == "Nv2PK":
+            return [FakeElement(self, "card", i) for i in range(self.loaded)]
+        if by == By.CSS_SELECTOR and value == PANEL_REGION_SELECTOR:
+            if self.open_index is None:
+                return []
+            return [FakeElement(self, "region"), FakeElement(self, "region", self.open_index)]
+        return []
+
+    def find_element(self, by, value) -> FakeElement:
+        self._round_trip("find_element")
+        if by == By.XPATH and "Results" in value:
+            return FakeElement(self, "feed")
+        if by == By.CLASS_NAME and value == "Nv2PK" and self.loaded:
+            return FakeElement(self, "card", 0)
+        raise NoSuchElementException(f"No element {by}={value}")
+
+    def execute_script(self, script: str, *args):
+        self._round_trip("execute_script")
+        if script == PANEL_STATE_JS:
+            if self.open_index is None:
+                return None
+            html = self.maps.panel_html(self.open_index)
+            return {"size": len(html), "text": len(html), "title": self.maps.business(self.open_index)["name"]}
+        if script == PANEL_EXTRACT_JS:
+            return self.maps.panel_result(self.open_index) if self.open_index is not None else None
+        if script == CARDS_EXTRACT_JS:
+            start = args[0] if args else 0
+            cards = []
+            for i in range(start or 0, self.loaded):
+                card = self.maps.card_result(i)
+                card["link"] = FakeElement(self, "link", i)
+                cards.append(card)
+            return cards
+        if script == CARD_LINKS_JS:
+            start = args[0] if args else 0
+            return [{"name": self.maps.business(i)["name"], "url": self.maps.business(i)["url"],
+                     "link": FakeElement(self, "link", i)} for i in range(start or 0, self.loaded)]
+        if "scrollIntoView" in script:
+            return None
+        raise NotImplementedError(f"FakeMapsDriver does not know this script: {script[:80]!r}")
+
+    def execute_async_script(self, script: str, *args):
+        self._round_trip("execute_async_script")
+        if script == SCROLL_FEED_JS:
+            self.loaded = min(self.loaded + self.page_size, self.maps.count)
+            return {"count": self.loaded, "end": self.loaded >= self.maps.count, "found": True}
+        raise NotImplementedError(f"FakeMapsDriver does not know this async script: {script[:80]!r}")
+
+    def quit(self):
+        self._round_trip("quit")
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.calls.values())
+
+class FakeResponse:
+    def __init__(self, text: str, status_code: int = 200):
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} from fake Maps")
+
+class FakeMapsSession:
+    """
+    requests.Session stand-in for the HTTP engine: answers search-endpoint GETs with pages of
+    the FakeMaps result list. Each request counts as one round-trip and can be slowed by `latency`.
+    """
+
+    def __init__(self, maps: FakeMaps, latency: float = 0.0):
+        self.maps = maps
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Optional[Dict[str, str]] = None, timeout: Optional[float] = None):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        match = re.search(r"!7i(\d+)!8i(\d+)", (params or {}).get("pb", ""))
+        if not match:
+            return FakeResponse("", 400)
+        page_size, offset = int(match.group(1)), int(match.group(2))
+        return FakeResponse(self.maps.search_response(offset, page_size))
+
+    @property
+    def round_trips(self) -> int:
+        return self.requests
+
+class FakeTiledMapsSession(FakeMapsSession):
+    """
+    FakeMapsSession whose businesses have map positions inside `bounds` (south, west, north, east):
+    `cluster_share` of them crowd around a few centres, the rest are spread evenly. A search
+    lists the businesses inside its viewport (the pb camera), most prominent first, and stops
+    at `cap` like Google Maps; a search without a viewport covers all of `bounds`.
+    """
+
+    def __init__(self, maps: FakeMaps, bounds, cap: int = 120, clusters: int = 3, cluster_share: float = 0.6,
+                 latency: float = 0.0, seed: int = 7):
+        super().__init__(maps, latency)
+        self.bounds = bounds
+        self.cap = cap
+        self.searches = 0
+        south, west, north, east = bounds
+        rng = random.Random(seed)
+        centres = [(rng.uniform(south, north), rng.uniform(west, east)) for _ in range(clusters)]
+        spread = min(north - south, east - west) / 25
+        self.positions = []
+        for _ in range(maps.count):
+            if centres and rng.random() < cluster_share:
+                lat, lng = rng.choice(centres)
+                lat = min(north, max(south, rng.gauss(lat, spread)))
+                lng = min(east, max(west, rng.gauss(lng, spread)))
+            else:
+                lat, lng = rng.uniform(south, north), rng.uniform(west, east)
+            self.positions.append((lat, lng))
+        self._prominence = [rng.random() for _ in range(maps.count)]
+
+    def visible(self, pb: str) -> List[int]:
+        """Indices a search with this pb lists, capped and most prominent first."""
+        camera = re.search(r"!1d([\d.]+)!2d(-?[\d.]+)!3d(-?[\d.]+)", pb)
+        distance, lng, lat = (float(v) for v in camera.groups()) if camera else (DEFAULT_DISTANCE, 0.0, 0.0)
+        if distance == DEFAULT_DISTANCE and lat == lng == 0:
+            box = self.bounds
+        else:
+            # Inverse of maps_http.viewport_distance: the viewport's width on the ground, in degrees.
+            width_m = 2 * distance * math.tan(math.radians(FIELD_OF_VIEW / 2))
+            width = width_m / (111320 * math.cos(math.radians(lat)))
+            height = width * VIEWPORT_PX[1] / VIEWPORT_PX[0] * math.cos(math.radians(lat))
+            box = (lat - height / 2, lng - width / 2, lat + height / 2, lng + width / 2)
+        south, west, north, east = box
+        inside = [i for i, (p_lat, p_lng) in enumerate(self.positions)
+                  if south <= p_lat <= north and west <= p_lng <= east]
+        return sorted(inside, key=lambda i: -self._prominence[i])[:self.cap]
+
+    def get(self, url: str, params: Optional[Dict[str, str]] = None, timeout: Optional[float] = None):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        pb = (params or {}).get("pb", "")
+        match = re.search(r"!7i(\d+)!8i(\d+)", pb)
+        if not match:
+            return FakeResponse("", 400)
+        page_size, offset = int(match.group(1)), int(match.group(2))
+        if offset == 0:
+            with self._lock:
+                self.searches += 1
+        return FakeResponse(self.maps.search_response(offset, page_size, self.visible(pb)))
+
+class FakeCSEService:
+    """
+    Stand-in for cse.CustomSearchService: service.cse().list(...).execute().
+    Names whose index is divisible by 3 have no social profiles; the rest get Facebook and Instagram.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def cse(self):
+        return self
+
+    def list(self, q: str, cx: str = None, num: int = 8):
+        return _FakeRequest(self, q)
+
+    def _execute(self, query: str) -> Dict[str, Any]:
+        with self._lock:
+            self.queries += 1
+        if self.latency:
+            time.sleep(self.latency)
+        name = query.split(" site:", 1)[0]
+        digits = re.findall(r"\d+", name)
+        if not digits or int(digits[-1]) % 3 == 0:
+            return {}
+        slug = re.sub(r"[^a-z0-9]+", "", name.lower())
+        return {"items": [
+            {"link": f"https://www.facebook.com/{slug}"},
+            {"link": f"https://www.instagram.com/{slug}/"},
+        ]}
+
+class _FakeRequest:
+    def __init__(self, service: FakeCSEService, query: str):
+        self.service = service
+        self.query = query
+
+    def execute(self):
+        return self.service._execute(self.query)
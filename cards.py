@@ -0,0 +1,76 @@
+import re
+from typing import Any, Dict, List
+
+from parsing import parse_details, to_record
+
+# Reads every result card from index arguments[0] onward in one call. `link` comes back as
+# a WebElement so a card can still be clicked when its details have to come from the panel.
+CARDS_EXTRACT_JS = """
+const cards = Array.from(document.getElementsByClassName('Nv2PK')).slice(arguments[0] || 0);
+const text = el => el ? el.textContent.replace(/\\s+/g, ' ').trim() : null;
+return cards.map(card => {
+    const link = card.querySelector('a.hfpxzc');
+    const website = card.querySelector('a[data-value="Website"]');
+    const lines = Array.from(card.querySelectorAll('div.W4Efsd'))
+        .filter(el => !el.querySelector('div.W4Efsd'))
+        .map(text)
+        .filter(t => t);
+    return {
+        name: link ? (link.getAttribute('aria-label') || '').trim() : '',
+        url: link ? link.getAttribute('href') : null,
+        link: link,
+        rating: text(card.querySelector('span.MW4etd')),
+        reviews: text(card.querySelector('span.UY7F9')),
+        website: website ? website.getAttribute('href') : null,
+        lines: lines
+    };
+});
+"""
+
+# Name, URL and clickable link of every result card from index arguments[0] onward: the
+# cheapest way to read only the cards that arrived since the last batch.
+CARD_LINKS_JS = """
+return Array.from(document.getElementsByClassName('Nv2PK')).slice(arguments[0] || 0).map(card => {
+    const link = card.querySelector('a.hfpxzc');
+    return {
+        name: link ? (link.getAttribute('aria-label') || '').trim() : '',
+        url: link ? link.getAttribute('href') : null,
+        link: link
+    };
+});
+"""
+
+# Star rating / review count lines such as "4.3(128)" carry no contact details.
+_RATING_LINE_RE = re.compile(r"^[\d.,]+\s*(\([\d,.]+\))?$")
+
+def card_segments(lines: List[str]) -> List[str]:
+    """Splits card info lines ("Restaurant · 12 Oxford St") into their '·'-separated parts."""
+    segments = []
+    for line in lines or []:
+        for part in line.split("·"):
+            part = part.strip(" ⋅")
+            if part:
+                segments.append(part)
+    return segments
+
+def card_to_record(card: Dict[str, Any]) -> Dict[str, Any]:
+    """Builds a business record from a CARDS_EXTRACT_JS entry without opening the place panel."""
+    lines = [line for line in card.get("lines") or [] if not _RATING_LINE_RE.match(line)]
+    segments = card_segments(lines)
+    fields = parse_details(segments)
+
+    first_line = card_segments(lines[:1])
+    category = first_line[0] if first_line else None
+    if not fields["address"] and len(first_line) > 1:
+        # Cards show "Category · Address fragment" on their first info line.
+        fields["address"] = first_line[-1]
+    if card.get("website"):
+        fields["website"] = card["website"]
+
+    record = to_record(card.get("name", ""), fields)
+    record["category"] = category or "N/A"
+    record["rating"] = card.get("rating") or "N/A"
+    return record
+
+def missing_fields(record: Dict[str, Any], required) -> List[str]:
+    return [field for field in required if not record.get(field) or record.get(field) == "N/A"]
@@ -0,0 +1,197 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+CHECKPOINT_FILE = "checkpoint.db"
+# Checkpoints written before places were keyed by identity recorded names; they are kept as
+# "legacy-name:<name>" keys so a resumed old run still skips what it processed.
+LEGACY_NAME_PREFIX = "legacy-name:"
+
+class RunCheckpoint:
+    """
+    Crash-safe progress for one extraction run, keyed by its search query.
+    Processed places (by dedupe.place_key, so branches sharing a name stay apart), completed records and the results-list scroll position are
+    buffered and appended in one transaction every `batch_size` items or `interval`
+    seconds, so a crash or Stop loses at most one batch and `resume` skips everything
+    already written. Records are not kept in memory; iter_resumed() reads a resumed run's
+    earlier records back from disk.
+    """
+
+    def __init__(self, query: str, path: str = CHECKPOINT_FILE, batch_size=25, interval=10.0):
+        self.query = query
+        self.path = path
+        self.batch_size = batch_size
+        self.interval = interval
+        self.seen_places = set()
+        self.resumed_records = 0
+        self._resumed_seq = 0
+        self.scroll_position = 0
+        self.settings: Dict[str, Any] = {}
+        self._pending_seen: List[str] = []
+        self._pending_records: List[Dict[str, Any]] = []
+        self._scroll_dirty = False
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        _create_tables(self._conn)
+
+    @classmethod
+    def open(cls, query: str, resume=False, settings: Optional[Dict[str, Any]] = None,
+             path: str = CHECKPOINT_FILE, **kwargs) -> "RunCheckpoint":
+        """Loads the saved state for `query` when resuming; otherwise starts the query over."""
+        checkpoint = cls(query, path, **kwargs)
+        if resume:
+            checkpoint._load()
+        else:
+            checkpoint.discard()
+        if settings:
+            checkpoint.settings.update(settings)
+        with checkpoint._lock, checkpoint._conn:
+            checkpoint._conn.execute(
+                "INSERT OR REPLACE INTO runs (query, settings, scroll, updated) VALUES (?, ?, ?, ?)",
+                (query, json.dumps(checkpoint.settings), checkpoint.scroll_position, time.time())
+            )
+        return checkpoint
+
+    def _load(self):
+        with self._lock:
+            run = self._conn.execute("SELECT settings, scroll FROM runs WHERE query = ?", (self.query,)).fetchone()
+            if run is None:
+                return
+            self.settings = json.loads(run[0] or "{}")
+            self.scroll_position = run[1] or 0
+            self.seen_places = {place for (place,) in self._conn.execute(
+                "SELECT place FROM seen WHERE query = ?", (self.query,))}
+            self.resumed_records, self._resumed_seq = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(seq), 0) FROM records WHERE query = ?", (self.query,)).fetchone()
+        print(f"♻️ Resuming '{self.query}': {self.resumed_records} records, {len(self.seen_places)} places already processed")
+
+    def iter_resumed(self, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Records collected before the run was resumed, in order, read `batch_size` rows at a time."""
+        last_seq = 0
+        while last_seq < self._resumed_seq:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, data FROM records WHERE query = ? AND seq > ? AND seq <= ? ORDER BY seq LIMIT ?",
+                    (self.query, last_seq, self._resumed_seq, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for _, data in rows:
+                yield json.loads(data)
+            last_seq = rows[-1][0]
+
+    def is_done(self, place: str, name: Optional[str] = None) -> bool:
+        """Whether `place` (its place_key) was processed; `name` also matches a legacy checkpoint."""
+        return place in self.seen_places or (name is not None and LEGACY_NAME_PREFIX + name in self.seen_places)
+
+    def mark_seen(self, place: str):
+        """Records a place (its place_key) as processed, kept or filtered out, so a resumed run skips it."""
+        with self._lock:
+            if not place or place in self.seen_places:
+                return
+            self.seen_places.add(place)
+            self._pending_seen.append(place)
+        self._maybe_flush()
+
+    def add_record(self, biz: Dict[str, Any], place: Optional[str] = None):
+        """Stores a finished record; its `place` (place_key) counts as processed too."""
+        with self._lock:
+            self._pending_records.append(biz)
+            if place and place not in self.seen_places:
+                self.seen_places.add(place)
+                self._pending_seen.append(place)
+        self._maybe_flush()
+
+    def set_scroll(self, position: int):
+        """Number of result cards loaded so far; a resumed run scrolls straight back to it."""
+        with self._lock:
+            if position > self.scroll_position:
+                self.scroll_position = position
+                self._scroll_dirty = True
+
+    def _maybe_flush(self):
+        with self._lock:
+            due = len(self._pending_seen) + len(self._pending_records) >= self.batch_size \
+                or time.monotonic() - self._last_flush >= self.interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Appends everything buffered since the last flush in one transaction."""
+        with self._lock:
+            seen, self._pending_seen = self._pending_seen, []
+            records, self._pending_records = self._pending_records, []
+            scroll_dirty, self._scroll_dirty = self._scroll_dirty, False
+            self._last_flush = time.monotonic()
+            if not (seen or records or scroll_dirty):
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO seen (query, place) VALUES (?, ?)", [(self.query, place) for place in seen]
+                )
+                self._conn.executemany(
+                    "INSERT INTO records (query, data) VALUES (?, ?)",
+                    [(self.query, json.dumps(biz, ensure_ascii=False)) for biz in records]
+                )
+                self._conn.execute(
+                    "UPDATE runs SET scroll = ?, updated = ? WHERE query = ?",
+                    (self.scroll_position, time.time(), self.query)
+                )
+
+    def discard(self):
+        """Forgets the saved state for this query (a finished or restarted run)."""
+        with self._lock, self._conn:
+            for table in ("runs", "seen", "records"):
+                self._conn.execute(f"DELETE FROM {table} WHERE query = ?", (self.query,))
+            self._pending_seen, self._pending_records = [], []
+            self._scroll_dirty = False
+            self.resumed_records, self._resumed_seq = 0, 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def _create_tables(conn: sqlite3.Connection):
+    with conn:
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS runs (
+                query TEXT PRIMARY KEY,
+                settings TEXT NOT NULL,
+                scroll INTEGER NOT NULL DEFAULT 0,
+                updated REAL NOT NULL
+            )"""
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS seen (query TEXT NOT NULL, place TEXT NOT NULL, PRIMARY KEY (query, place))")
+        if "name" in [column[1] for column in conn.execute("PRAGMA table_info(seen)")]:
+            conn.execute("ALTER TABLE seen RENAME COLUMN name TO place")
+            conn.execute("UPDATE seen SET place = ? || place", (LEGACY_NAME_PREFIX,))
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS records (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                query TEXT NOT NULL,
+                data TEXT NOT NULL
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_records_query ON records (query, seq)")
+
+def list_checkpoints(path: str = CHECKPOINT_FILE) -> List[Dict[str, Any]]:
+    """Unfinished runs, most recently updated first."""
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        _create_tables(conn)
+        rows = conn.execute(
+            "SELECT r.query, r.settings, r.updated, "
+            "(SELECT COUNT(*) FROM records c WHERE c.query = r.query), "
+            "(SELECT COUNT(*) FROM seen s WHERE s.query = r.query) "
+            "FROM runs r ORDER BY r.updated DESC"
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        {"query": query, "settings": json.loads(settings or "{}"), "updated": updated, "records": records, "seen": seen}
+        for query, settings, updated, records, seen in rows
+    ]
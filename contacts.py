@@ -0,0 +1,343 @@
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from dedupe import e164_phone
+from metrics import metrics, CRAWL
+from panel import HTML_PARSER
+from parsing import is_social_media_link
+
+DAY = 24 * 60 * 60
+CRAWL_CACHE_FILE = "crawl_cache.db"
+USER_AGENT = "Mozilla/5.0 (compatible; getbusiness-contact-crawler/1.0)"
+
+# Links whose URL or text contains one of these are followed from a business's home page.
+CONTACT_HINTS = ("contact", "about", "reach-us", "get-in-touch", "impressum", "kontakt")
+# Tried when the home page links to no contact page at all.
+FALLBACK_PATHS = ("/contact", "/contact-us")
+_HTML_TYPES = ("text/html", "application/xhtml+xml")
+
+EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*\.[a-zA-Z]{2,}")
+# Written-out local and international numbers ("024 412 3456", "+233 (0)30 276 1234").
+PHONE_RE = re.compile(r"(?<![\w+])(?:\+\d{1,3}[ .-]?(?:\(0\)[ .-]?)?|0)\d{2}[ .-]?\d{3}[ .-]?\d{3,4}(?!\d)")
+# Addresses that are asset names, placeholders or tracking endpoints rather than contacts.
+_EMAIL_JUNK_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".css", ".js")
+_EMAIL_JUNK_DOMAINS = ("example.com", "domain.com", "email.com", "sentry.io", "wixpress.com", "sentry-next.wixpress.com")
+
+def _host(url: str) -> str:
+    """Politeness key of a URL: host:port, without a leading www."""
+    netloc = urllib.parse.urlsplit(url).netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+def _clean_email(email: str) -> Optional[str]:
+    email = urllib.parse.unquote(email).strip().strip(".").lower()
+    if not EMAIL_RE.fullmatch(email) or email.endswith(_EMAIL_JUNK_SUFFIXES):
+        return None
+    if email.split("@", 1)[1].endswith(_EMAIL_JUNK_DOMAINS):
+        return None
+    return email
+
+def extract_contacts(html: str, base_url: str) -> Dict[str, Any]:
+    """
+    Emails, phones and contact-page links of one HTML page: {"emails", "phones", "links"}.
+    mailto:/tel: links come first, then addresses and numbers written in the visible text.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    emails: List[str] = []
+    phones: List[str] = []
+    links: List[str] = []
+
+    def add(values, value):
+        if value and value not in values:
+            values.append(value)
+
+    for a in soup.find_all("a", href=True):
+        href = a["href"].strip()
+        lowered = href.lower()
+        if lowered.startswith("mailto:"):
+            add(emails, _clean_email(href[7:].split("?", 1)[0]))
+        elif lowered.startswith("tel:"):
+            add(phones, e164_phone(href[4:]))
+        elif any(hint in lowered or hint in a.get_text(" ", strip=True).lower() for hint in CONTACT_HINTS):
+            add(links, urllib.parse.urljoin(base_url, href).split("#", 1)[0])
+    for tag in soup(["script", "style", "noscript", "template"]):
+        tag.decompose()
+    text = soup.get_text(" ")
+    for match in EMAIL_RE.findall(text):
+        add(emails, _clean_email(match))
+    for match in PHONE_RE.findall(text):
+        add(phones, e164_phone(match))
+    return {"emails": emails, "phones": phones, "links": links}
+
+class ResponseCache:
+    """
+    On-disk cache of fetched pages, keyed by URL. Bodies are stored compressed; failed fetches
+    are cached as negative entries (status 0) for `negative_ttl` so dead sites are not retried
+    on every run. The least recently fetched rows are evicted past `max_entries`.
+    """
+
+    def __init__(self, path=CRAWL_CACHE_FILE, ttl=14 * DAY, negative_ttl=2 * DAY, max_entries=100000):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                final_url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                fetched REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_fetched ON pages (fetched)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Tuple[int, str, str]]:
+        """(status, final_url, html) of a fresh entry, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT status, final_url, body, fetched FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None or time.time() - row[3] > (self.ttl if row[0] else self.negative_ttl):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0], row[1], zlib.decompress(row[2]).decode("utf-8", "replace")
+
+    def put(self, url: str, status: int, final_url: str, html: str):
+        body = zlib.compress(html.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, status, final_url, body, fetched) VALUES (?, ?, ?, ?, ?)",
+                (url, status, final_url, body, time.time())
+            )
+            self._writes += 1
+            # Counting rows on every write would dominate a large crawl; trim every 500 writes instead.
+            if self._writes % 500 == 0:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+                if count > self.max_entries:
+                    self._conn.execute(
+                        "DELETE FROM pages WHERE url IN (SELECT url FROM pages ORDER BY fetched ASC LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class HostLimiter:
+    """
+    Per-host politeness: at most `per_host` requests in flight to one host, and request starts
+    to one host at least `delay` seconds apart. Other hosts are not held up while one waits.
+    """
+
+    def __init__(self, per_host: int = 2, delay: float = 1.0):
+        self.per_host = per_host
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def acquire(self, host: str):
+        with self._lock:
+            slot = self._slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        slot.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host: str):
+        self._slots[host].release()
+
+class ContactCrawler:
+    """
+    Finds emails and phones for businesses on their own websites and social pages.
+    For each record the home page is fetched, then up to `max_pages - 1` contact/about pages it
+    links to (or FALLBACK_PATHS when it links to none); each social link is fetched once.
+    Requests go through one pooled keep-alive session, at most `max_connections` at a time and
+    HostLimiter-paced per host, with a (connect, read) timeout, a `max_seconds` wall-clock cap
+    and a `max_bytes` body cap per page. Fetched pages are served from the ResponseCache first.
+    Disabled until `enabled` is set (the CLI's --crawl-contacts).
+    """
+
+    def __init__(self, workers: int = 16, max_connections: int = 32, per_host: int = 2, host_delay: float = 1.0,
+                 timeout: Tuple[float, float] = (5.0, 10.0), max_seconds: float = 20.0,
+                 max_bytes: int = 512 * 1024, max_pages: int = 4, crawl_social: bool = True,
+                 cache_file: Optional[str] = CRAWL_CACHE_FILE):
+        self.enabled = False
+        self.workers = workers
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.crawl_social = crawl_social
+        self.cache_file = cache_file
+        self.limiter = HostLimiter(per_host, host_delay)
+        self._connections = threading.BoundedSemaphore(max_connections)
+        self._session: Optional[requests.Session] = None
+        self._cache: Optional[ResponseCache] = None
+        self._lock = threading.Lock()
+        self.stats = {"pages": 0, "cached": 0, "errors": 0, "records": 0, "emails": 0, "phones": 0}
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                adapter = HTTPAdapter(pool_connections=self.max_connections, pool_maxsize=self.max_connections)
+                self._session = requests.Session()
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+                self._session.headers.update({"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"})
+            return self._session
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        with self._lock:
+            if self._cache is None and self.cache_file:
+                self._cache = ResponseCache(self.cache_file)
+            return self._cache
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def fetch(self, url: str) -> Tuple[int, str, str]:
+        """(status, final_url, html) of `url`; status 0 with empty html when it could not be read."""
+        cache = self.cache
+        cached = cache.get(url) if cache is not None else None
+        if cached is not None:
+            self._count("cached")
+            return cached
+        host = _host(url)
+        self.limiter.acquire(host)
+        try:
+            with self._connections, metrics.stage(CRAWL):
+                result = self._download(url)
+        finally:
+            self.limiter.release(host)
+        self._count("pages" if result[0] else "errors")
+        if cache is not None:
+            cache.put(url, *result)
+        return result
+
+    def _download(self, url: str) -> Tuple[int, str, str]:
+        deadline = time.monotonic() + self.max_seconds
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True, allow_redirects=True) as response:
+                content_type = response.headers.get("Content-Type", "").lower()
+                if response.status_code >= 400 or (content_type and not content_type.startswith(_HTML_TYPES)):
+                    return 0, response.url, ""
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=16384):
+                    body.extend(chunk)
+                    # Stop at the size cap or wall-clock cap; the head of a page holds its links anyway.
+                    if len(body) >= self.max_bytes or time.monotonic() > deadline:
+                        break
+                encoding = response.encoding or response.apparent_encoding or "utf-8"
+                return response.status_code, response.url, bytes(body[:self.max_bytes]).decode(encoding, "replace")
+        except (requests.RequestException, LookupError, ValueError):
+            return 0, url, ""
+
+    def _site_pages(self, website: str) -> Iterable[Dict[str, Any]]:
+        """extract_contacts() of the home page and the contact pages it leads to, fetched in that order."""
+        status, final_url, html = self.fetch(website)
+        if not status:
+            return
+        contacts = extract_contacts(html, final_url)
+        yield contacts
+        home = _host(final_url)
+        links = [link for link in contacts["links"] if link.startswith("http") and _host(link) == home]
+        if not links:
+            links = [urllib.parse.urljoin(final_url, path) for path in FALLBACK_PATHS]
+        for link in links[:self.max_pages - 1]:
+            status, final_url, html = self.fetch(link)
+            if status:
+                yield extract_contacts(html, final_url)
+
+    def crawl(self, biz: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Emails and phones found for one record: {"emails": [...], "phones": [...]}, best first."""
+        found = {"emails": [], "phones": []}
+
+        def collect(contacts: Dict[str, Any]):
+            for field in ("emails", "phones"):
+                found[field].extend(v for v in contacts[field] if v not in found[field])
+
+        website = biz.get("website")
+        if website and website != "N/A" and not is_social_media_link(website):
+            for contacts in self._site_pages(website):
+                collect(contacts)
+                # Stop once the site has given both an email and a phone.
+                if found["emails"] and found["phones"]:
+                    break
+        if self.crawl_social and not found["emails"]:
+            for link in (biz.get("social_links") or {}).values():
+                if isinstance(link, str) and is_social_media_link(link):
+                    status, final_url, html = self.fetch(link)
+                    if status:
+                        collect(extract_contacts(html, final_url))
+        self._count("records")
+        self._count("emails", bool(found["emails"]))
+        self._count("phones", bool(found["phones"]))
+        return found
+
+    def enrich(self, biz: Dict[str, Any]) -> Dict[str, Any]:
+        """crawl() as record updates: fills a missing email/phone and lists every email found."""
+        found = self.crawl(biz)
+        return merge_contacts(biz, found)
+
+    def crawl_many(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Enriches `records` in place on `workers` threads (e.g. saved records, offline) and returns them."""
+        records = list(records)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crawl") as pool:
+            for biz, updates in zip(records, pool.map(self.enrich, records)):
+                biz.update(updates)
+        return records
+
+    def format_stats(self) -> str:
+        with self._lock:
+            s = dict(self.stats)
+        return (
+            f"📇 Contact crawl: {s['records']} businesses, {s['pages']} pages fetched, {s['cached']} from cache, "
+            f"{s['errors']} failed; emails for {s['emails']}, phones for {s['phones']}\n"
+        )
+
+def merge_contacts(biz: Dict[str, Any], found: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Updates for `biz`: the first email/phone where the record has none, plus all emails found."""
+    updates: Dict[str, Any] = {}
+    if found["emails"]:
+        if not biz.get("email") or biz.get("email") == "N/A":
+            updates["email"] = found["emails"][0]
+        updates["emails"] = "; ".join(found["emails"])
+    if found["phones"] and (not biz.get("phone") or biz.get("phone") == "N/A"):
+        updates["phone"] = found["phones"][0]
+    return updates
+
+contact_crawler = ContactCrawler()
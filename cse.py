@@ -0,0 +1,36 @@
+from typing import Any, Dict, Optional
+
+import requests
+
+# Custom Search JSON API. Called directly instead of through googleapiclient, whose import and
+# discovery-document build cost more than the lookups themselves on short runs.
+CSE_URL = "https://customsearch.googleapis.com/customsearch/v1"
+
+class CustomSearchService:
+    """
+    Minimal Custom Search client with the googleapiclient call shape:
+    service.cse().list(q=..., cx=..., num=...).execute() returns the decoded JSON response.
+    API errors raise requests.HTTPError, whose response carries the status RateLimitedFetcher retries on.
+    """
+
+    def __init__(self, key: str, session: Optional[requests.Session] = None, timeout: float = 20.0):
+        self.key = key
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def cse(self) -> "CustomSearchService":
+        return self
+
+    def list(self, **params) -> "_Request":
+        return _Request(self, params)
+
+class _Request:
+    def __init__(self, service: CustomSearchService, params: Dict[str, Any]):
+        self.service = service
+        self.params = params
+
+    def execute(self) -> Dict[str, Any]:
+        response = self.service.session.get(CSE_URL, params=dict(self.params, key=self.service.key),
+                                            timeout=self.service.timeout)
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,304 @@
+import re
+import unicodedata
+import urllib.parse
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_COUNTRY_CODE = "233"
+# Score (0..1) at which two records are treated as the same business.
+MATCH_THRESHOLD = 0.85
+# Blocks with more members than this (generic words such as "kitchen", chain names) are not
+# used to find candidates; the remaining blocks keep each lookup to a handful of comparisons.
+MAX_BLOCK_SIZE = 200
+# Character ratio at which two canonical addresses count as the same place. Below it the
+# records are different places, even under the same name ("KFC, Oxford St" / "KFC, Spintex Rd").
+ADDRESS_MATCH = 0.85
+
+# Words that say nothing about which business a name refers to.
+NAME_STOPWORDS = {
+    "the", "and", "of", "ltd", "limited", "llc", "inc", "co", "company", "enterprise", "enterprises",
+    "ventures", "gh", "ghana", "plc", "services",
+}
+_ADDRESS_ABBREVIATIONS = {
+    "street": "st", "road": "rd", "avenue": "ave", "close": "cl", "crescent": "cres",
+    "junction": "jn", "number": "no", "plot": "plt",
+}
+# Maps place URLs carry the place's feature id ("!1s0x3fdf9b...:0x5b1c..."), which the search
+# payload lists too. It tells apart branches that share a name before anything is parsed.
+FEATURE_ID_RE = re.compile(r"!1s(0x[0-9a-f]+)(?::|%3a)(0x[0-9a-f]+)", re.IGNORECASE)
+PLUS_CODE_RE = re.compile(r"\b[23456789CFGHJMPQRVWX]{2,8}\+[23456789CFGHJMPQRVWX]{2,3}\b", re.IGNORECASE)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+def _missing(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and value.strip() in ("", "N/A"))
+
+def _fold(text: str) -> str:
+    """Lowercase ASCII: accents stripped, '&' spelled out, apostrophes dropped ("Mama's" -> "mamas")."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"['’`]", "", text.casefold().replace("&", " and "))
+
+def canonical_name(name: Optional[str]) -> str:
+    """
+    'Mama’s Kitchen Ltd.' -> 'mamas kitchen'. Names that fold to nothing (non-Latin scripts such
+    as '北京烤鸭', or only stopwords such as 'Ltd') keep their NFKC-casefolded words instead.
+    """
+    if _missing(name):
+        return ""
+    words = [w for w in _WORD_RE.findall(_fold(name)) if w not in NAME_STOPWORDS]
+    if not words:
+        words = unicodedata.normalize("NFKC", name).casefold().split()
+    return " ".join(words)
+
+def e164_phone(phone: Optional[str], country_code: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """
+    Normalizes a phone as parse_details finds it ("024 412 3456", "+233 24 412 3456",
+    "+233 (0)24 412 3456", "0244123456", "phone:tel:0244123456") to E.164 ("+233244123456").
+    None when it is not a number.
+    """
+    if _missing(phone):
+        return None
+    international = re.sub(r"^(phone:)?tel:", "", phone.strip()).startswith("+")
+    # "+233 (0)30 ..." repeats the trunk 0 that international dialing drops.
+    digits = re.sub(r"\D", "", phone.replace("(0)", ""))
+    if digits.startswith("00"):
+        digits, international = digits[2:], True
+    elif not international and digits.startswith("0"):
+        digits = country_code + digits[1:]
+    elif not international and not digits.startswith(country_code):
+        digits = country_code + digits
+    return "+" + digits if 8 <= len(digits) <= 15 else None
+
+def plus_code(*texts: Optional[str]) -> Optional[str]:
+    """The first Open Location Code in `texts` ("CCV5+QX Accra" -> "CCV5+QX")."""
+    for text in texts:
+        if not _missing(text):
+            match = PLUS_CODE_RE.search(text)
+            if match:
+                return match.group(0).upper()
+    return None
+
+def canonical_address(address: Optional[str]) -> Optional[str]:
+    if _missing(address):
+        return None
+    address = PLUS_CODE_RE.sub(" ", address)
+    words = [_ADDRESS_ABBREVIATIONS.get(w, w) for w in _WORD_RE.findall(_fold(address))]
+    return " ".join(words) or None
+
+def website_domain(website: Optional[str]) -> Optional[str]:
+    if _missing(website):
+        return None
+    url = website if "://" in website else "https://" + website
+    host = urllib.parse.urlsplit(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host or None
+
+def fingerprint(biz: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized matching keys of a business record, plus the blocks it is indexed under."""
+    name = canonical_name(biz.get("name"))
+    tokens = set(name.split())
+    fp = {
+        "name": name,
+        "tokens": tokens,
+        "numbers": {t for t in tokens if t.isdigit()},
+        "chars": Counter(name),
+        "phone": e164_phone(biz.get("phone")),
+        "plus_code": plus_code(biz.get("plus_code"), biz.get("address")),
+        "address": canonical_address(biz.get("address")),
+        "domain": website_domain(biz.get("website")),
+    }
+    blocks = [f"n:{name}"] if name else []
+    # Token prefixes, so "mama" / "mamas" and "bakery" / "bakeries" share a block.
+    blocks.extend(sorted({f"t:{t[:4]}" for t in tokens if len(t) > 2 and not t.isdigit()}))
+    blocks.extend(f"{prefix}:{fp[field]}" for prefix, field in (("p", "phone"), ("c", "plus_code"), ("w", "domain"))
+                  if fp[field])
+    fp["blocks"] = blocks
+    return fp
+
+def key_of(fp: Dict[str, Any]) -> str:
+    """
+    Exact-match key: canonical name plus the strongest contact/location key the record has.
+    Empty for a record without a name, which never matches anything exactly.
+    """
+    if not fp["name"]:
+        return ""
+    return f"{fp['name']}|{fp['phone'] or fp['plus_code'] or fp['address'] or ''}"
+
+def identity_key(biz: Dict[str, Any]) -> str:
+    return key_of(fingerprint(biz))
+
+def place_key(place: Dict[str, Any]) -> str:
+    """
+    Identity of a Maps place as a result list shows it, before it is opened or parsed: a card or
+    link ({"name", "url"}) or the HTTP engine's fields ({"name", "feature_id", "place_id"}).
+    The feature id, else the place_id, else the URL without its query string; the name only
+    when none of them is known. Empty for a place without any of them.
+    """
+    feature_id = place.get("feature_id")
+    url = place.get("url") or ""
+    match = FEATURE_ID_RE.search(url)
+    if not feature_id and match:
+        feature_id = f"{match.group(1)}:{match.group(2)}"
+    if feature_id:
+        return str(feature_id).lower()
+    if place.get("place_id"):
+        return f"id:{place['place_id']}"
+    if url:
+        return "url:" + url.split("?", 1)[0]
+    name = (place.get("name") or "").strip()
+    return f"name:{name}" if name else ""
+
+def name_similarity(a: Dict[str, Any], b: Dict[str, Any], at_least: float = 0.0) -> float:
+    """
+    Similarity of two canonical names (0..1): the better of token overlap and character ratio.
+    Pairs whose cheap upper bound is already below `at_least` skip the full ratio and get that bound.
+    """
+    if not a["name"] or not b["name"]:
+        return 0.0
+    if a["name"] == b["name"]:
+        return 1.0
+    union = a["tokens"] | b["tokens"]
+    jaccard = len(a["tokens"] & b["tokens"]) / len(union) if union else 0.0
+    # "Star Mart 1" and "Star Mart 2" are branches, however similar the rest of the name is.
+    penalty = 0.5 if a["numbers"] != b["numbers"] else 1.0
+    if penalty < at_least:
+        return jaccard * penalty
+    # Shared characters bound the character ratio from above (difflib's quick_ratio).
+    overlap = 2 * sum((a["chars"] & b["chars"]).values()) / (len(a["name"]) + len(b["name"]))
+    score = max(jaccard, overlap) * penalty
+    if score < at_least:
+        return score
+    return max(jaccard, SequenceMatcher(None, a["name"], b["name"]).ratio()) * penalty
+
+def _same_location(a: Dict[str, Any], b: Dict[str, Any]) -> Optional[bool]:
+    """
+    True when plus codes or addresses agree closely, False when both records have one and they
+    do not, None when there is nothing to compare.
+    """
+    if a["plus_code"] and b["plus_code"]:
+        return a["plus_code"] == b["plus_code"]
+    if a["address"] and b["address"]:
+        if a["address"] == b["address"]:
+            return True
+        return SequenceMatcher(None, a["address"], b["address"]).ratio() >= ADDRESS_MATCH
+    return None
+
+def compare(a: Dict[str, Any], b: Dict[str, Any], threshold: float = MATCH_THRESHOLD) -> Tuple[float, str]:
+    """
+    Scores two fingerprints: (score 0..1, reason). Matching name alone only counts when the names
+    are identical and no location is known for the pair, or when a phone, location or website
+    agrees; a location that does not match closely, or a different phone without a matching
+    location, marks the pair as separate branches. Scores below `threshold` are
+    estimates, since pairs that cannot reach it are not fully compared.
+    """
+    # Agreeing evidence scores 0.5 + 0.5 * similarity, so names below this can never match.
+    similarity = name_similarity(a, b, at_least=2 * threshold - 1)
+    if similarity < 2 * threshold - 1:
+        return similarity * 0.5, "different name"
+    location = _same_location(a, b)
+    if location is False:
+        return similarity * 0.5, "different location"
+    if a["phone"] and b["phone"] and a["phone"] != b["phone"] and location is not True:
+        return similarity * 0.5, "different phone"
+    for reason, agrees in (
+        ("phone", a["phone"] and a["phone"] == b["phone"]),
+        ("plus code" if a["plus_code"] and b["plus_code"] else "address", location),
+        ("website", a["domain"] and a["domain"] == b["domain"]),
+    ):
+        if agrees:
+            return 0.5 + 0.5 * similarity, reason
+    if similarity == 1.0:
+        return 1.0, "same name"
+    return similarity * 0.8, "similar name"
+
+def merge_records(kept: Dict[str, Any], duplicate: Dict[str, Any]) -> Dict[str, Any]:
+    """`kept` with its missing fields filled from `duplicate` and both sets of social links."""
+    merged = dict(kept)
+    for field, value in duplicate.items():
+        if field == "social_links":
+            links = dict(value or {})
+            links.update(merged.get("social_links") or {})
+            merged["social_links"] = links
+        elif _missing(merged.get(field)) and not _missing(value):
+            merged[field] = value
+    return merged
+
+def decision(biz: Dict[str, Any], matched: Dict[str, Any], score: float, reason: str) -> Dict[str, Any]:
+    """One merge decision as reported to the user and written to dedupe reports."""
+    return {"name": biz.get("name", ""), "matched": matched.get("name", ""), "score": round(score, 3), "reason": reason,
+            "phone": biz.get("phone"), "address": biz.get("address")}
+
+class DedupeIndex:
+    """
+    Blocking index of fingerprints. Records are filed under their exact-name, name-token, phone,
+    plus-code and website-domain blocks. A lookup only scores records that share a phone, plus
+    code, website or exact name with it, or at least two name-token blocks, so the cost per record
+    does not grow with the archive. Subclasses (BusinessStore's index) keep the blocks somewhere
+    other than memory.
+    """
+
+    def __init__(self, threshold: float = MATCH_THRESHOLD, max_block: int = MAX_BLOCK_SIZE):
+        self.threshold = threshold
+        self.max_block = max_block
+        self._blocks: Dict[str, List[Any]] = defaultdict(list)
+        self._fingerprints: Dict[Any, Dict[str, Any]] = {}
+
+    def members(self, block: str) -> List[Any]:
+        """Records filed under `block`; none when it holds more than `max_block`."""
+        members = self._blocks.get(block) or []
+        return members if len(members) <= self.max_block else []
+
+    def fingerprint_of(self, ref: Any) -> Optional[Dict[str, Any]]:
+        return self._fingerprints.get(ref)
+
+    def add(self, ref: Any, fp: Dict[str, Any]):
+        self._fingerprints[ref] = fp
+        for block in fp["blocks"]:
+            members = self._blocks[block]
+            if ref not in members[-1:]:
+                members.append(ref)
+
+    def candidates(self, fp: Dict[str, Any]) -> Iterable[Any]:
+        token_blocks = [block for block in fp["blocks"] if block.startswith("t:")]
+        needed = min(2, len(token_blocks))
+        strong = set()
+        token_hits = Counter()
+        for block in fp["blocks"]:
+            if block.startswith("t:"):
+                token_hits.update(set(self.members(block)))
+            else:
+                strong.update(self.members(block))
+        return strong.union(ref for ref, hits in token_hits.items() if hits >= needed)
+
+    def match(self, fp: Dict[str, Any]) -> Optional[Tuple[Any, float, str]]:
+        """Best indexed record scoring at least `threshold`: (ref, score, reason), or None."""
+        best = None
+        for ref in self.candidates(fp):
+            other = self.fingerprint_of(ref)
+            if other is None:
+                continue
+            score, reason = compare(fp, other, self.threshold)
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (ref, score, reason)
+        return best
+
+def dedupe_records(records: Iterable[Dict[str, Any]], index: Optional[DedupeIndex] = None,
+                   on_decision: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """
+    Unique records in input order; each duplicate is merged into the first record it matches
+    and reported to `on_decision`.
+    """
+    index = index if index is not None else DedupeIndex()
+    unique: List[Dict[str, Any]] = []
+    for biz in records:
+        fp = fingerprint(biz)
+        found = index.match(fp)
+        if found is None:
+            index.add(len(unique), fp)
+            unique.append(biz)
+            continue
+        ref, score, reason = found
+        if on_decision:
+            on_decision(decision(biz, unique[ref], score, reason))
+        unique[ref] = merge_records(unique[ref], biz)
+        index.add(ref, fingerprint(unique[ref]))
+    return unique
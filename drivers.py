@@ -0,0 +1,162 @@
+import atexit
+import threading
+from typing import List, Optional
+
+from metrics import metrics, DRIVER_STARTUP
+
+# Lean profile: requests Chrome is told to drop. Cards and panels are text; images, fonts,
+# video, map tiles and Street View imagery only cost bandwidth and render time.
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm",
+    "*/maps/vt*", "*/kh/v=*", "*khms*.google.com*", "*streetviewpixels*", "*googleusercontent.com/p/*",
+]
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+}
+
+# Selenium and webdriver_manager are imported where a browser is actually started or checked,
+# so commands that never open one (export, show, dedupe) do not pay for loading them.
+
+def chrome_options(lean: bool = False):
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--window-size=1920,1080")
+    if lean:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_experimental_option("prefs", LEAN_PREFS)
+    return options
+
+def block_heavy_requests(driver):
+    """Drops LEAN_BLOCKED_URLS through the DevTools protocol (Chrome only; other drivers are left as is)."""
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+    except (AttributeError, WebDriverException) as e:
+        print(f"⚠️ Could not enable request blocking: {e}")
+
+def is_alive(driver) -> bool:
+    """Cheap health check: the session answers a script call."""
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        driver.execute_script("return document.readyState")
+        return True
+    except WebDriverException:
+        return False
+
+def quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+class DriverManager:
+    """
+    Keeps Chrome sessions alive between searches instead of launching one per query.
+    The chromedriver path is resolved once per process. acquire() hands out an idle session
+    after a health check (dead or worn-out sessions are restarted) and release() returns it.
+    Up to `max_idle` sessions are kept; extras are quit.
+    """
+
+    def __init__(self, lean: bool = False, max_idle: int = 1, max_uses: int = 50):
+        self.lean = lean
+        self.max_idle = max_idle
+        self.max_uses = max_uses
+        self.started = 0
+        self.restarts = 0
+        self.reused = 0
+        self._driver_path: Optional[str] = None
+        self._idle: List = []
+        self._uses = {}
+        self._lock = threading.Lock()
+
+    def driver_path(self) -> str:
+        with self._lock:
+            if self._driver_path is None:
+                from webdriver_manager.chrome import ChromeDriverManager
+
+                self._driver_path = ChromeDriverManager().install()
+            return self._driver_path
+
+    def create(self):
+        """Launches a new session with the configured profile."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        with metrics.stage(DRIVER_STARTUP):
+            driver = webdriver.Chrome(service=Service(self.driver_path()), options=chrome_options(self.lean))
+            if self.lean:
+                block_heavy_requests(driver)
+        with self._lock:
+            self.started += 1
+            self._uses[id(driver)] = 0
+        return driver
+
+    def acquire(self):
+        """A healthy session: an idle one when available, otherwise a new one."""
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                driver = self.create()
+                break
+            if self._uses.get(id(driver), 0) < self.max_uses and is_alive(driver):
+                with self._lock:
+                    self.reused += 1
+                break
+            print("♻️ Restarting browser session")
+            self._discard(driver)
+            with self._lock:
+                self.restarts += 1
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        return driver
+
+    def release(self, driver):
+        """Returns a session for reuse; it is quit when the idle pool is full or it has died."""
+        from selenium.common.exceptions import WebDriverException
+
+        keep = is_alive(driver)
+        if keep:
+            try:
+                driver.get("about:blank")
+            except WebDriverException:
+                keep = False
+        with self._lock:
+            if keep and len(self._idle) < self.max_idle:
+                self._idle.append(driver)
+                return
+        self._discard(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        quit_quietly(driver)
+
+    def close(self):
+        """Quits every idle session."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+    def format_stats(self) -> str:
+        return (f"🧭 Browser sessions: {self.started} started, {self.reused} reused, "
+                f"{self.restarts} restarted, {len(self._idle)} idle\n")
+
+driver_manager = DriverManager()
+atexit.register(driver_manager.close)
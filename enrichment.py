@@ -0,0 +1,185 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+def http_status(error: Exception) -> Optional[int]:
+    """Best-effort HTTP status of an API client error (requests HTTPError, googleapiclient HttpError, ...)."""
+    resp = getattr(error, "resp", None) or getattr(error, "response", None)
+    status = getattr(resp, "status", None) or getattr(resp, "status_code", None) or getattr(error, "status_code", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Takes a token and returns 0, or returns the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+class RateLimitedFetcher:
+    """
+    Wraps a `fetch(name, max_results, credentials=...)` callable with one token bucket per
+    (api_key, cse_id) pair, round-robin key rotation, and retries with exponential backoff.
+    A key that answers 429 is benched for `cooldown` seconds while the others carry on.
+    """
+
+    def __init__(self, fetch: Callable[..., Dict[str, str]], credentials: Sequence[Tuple[str, str]],
+                 queries_per_minute=100, max_retries=4, backoff=1.0, cooldown=60.0):
+        if not credentials:
+            raise ValueError("At least one (api_key, cse_id) pair is required.")
+        self.fetch = fetch
+        self.credentials = list(credentials)
+        self.buckets = [TokenBucket(queries_per_minute / 60.0, capacity=max(1, queries_per_minute // 10))
+                        for _ in self.credentials]
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self._benched_until = [0.0] * len(self.credentials)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _pick(self) -> int:
+        """Next credential index in rotation, waiting out cooldowns and rate limits."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                order = [(self._next + i) % len(self.credentials) for i in range(len(self.credentials))]
+                waits = []
+                for index in order:
+                    if self._benched_until[index] > now:
+                        waits.append(self._benched_until[index] - now)
+                        continue
+                    wait = self.buckets[index].try_acquire()
+                    if not wait:
+                        self._next = (index + 1) % len(self.credentials)
+                        return index
+                    waits.append(wait)
+            time.sleep(min(waits))
+
+    def __call__(self, business_name: str, max_results: int = 4) -> Dict[str, str]:
+        for attempt in range(self.max_retries + 1):
+            index = self._pick()
+            try:
+                return self.fetch(business_name, max_results, credentials=self.credentials[index])
+            except Exception as e:
+                status = http_status(e)
+                if status not in RETRYABLE_STATUSES or attempt == self.max_retries:
+                    raise
+                if status == 429:
+                    with self._lock:
+                        self._benched_until[index] = time.monotonic() + self.cooldown
+                    if len(self.credentials) > 1:
+                        continue
+                delay = self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+                print(f"⏳ Lookup for '{business_name}' got HTTP {status}, retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+class EnrichmentStage:
+    """
+    Runs `enrich(record) -> updates` on a thread pool so scraping continues while lookups
+    are in flight. Finished records are collected for the caller's thread to pick up via
+    completed()/drain(), so callbacks keep running where the scraping loop runs.
+    With `max_pending`, submit() blocks while that many records are in flight, so slow
+    lookups hold scraping back instead of queueing without bound.
+    """
+
+    def __init__(self, enrich: Callable[[Dict[str, Any]], Dict[str, Any]], workers=4,
+                 max_pending: Optional[int] = None):
+        self.enrich = enrich
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich")
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._finished: List[Dict[str, Any]] = []
+        self._in_flight: Dict[int, Dict[str, Any]] = {}
+        self._abandoned = False
+
+    def _run(self, record):
+        try:
+            updates = self.enrich(record)
+        except Exception as e:
+            print(f"❌ Enrichment failed for '{record.get('name')}': {e}")
+            updates = None
+        with self._done:
+            if self._abandoned:
+                return
+            if updates:
+                record.update(updates)
+            self._in_flight.pop(id(record), None)
+            self._finished.append(record)
+            self._done.notify_all()
+
+    def submit(self, record: Dict[str, Any]):
+        with self._done:
+            while self.max_pending and len(self._in_flight) >= self.max_pending and not self._abandoned:
+                self._done.wait()
+            if self._abandoned:
+                return
+            self._in_flight[id(record)] = record
+        self._executor.submit(self._run, record)
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def completed(self) -> List[Dict[str, Any]]:
+        """Records finished since the last call (non-blocking)."""
+        with self._lock:
+            finished, self._finished = self._finished, []
+        return finished
+
+    def drain(self, timeout: Optional[float] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Waits up to `timeout` seconds for in-flight lookups and shuts the pool down.
+        Returns (finished, still_pending); pending records are left untouched.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._done:
+            while self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._done.wait(remaining)
+            self._abandoned = True
+            finished, self._finished = self._finished, []
+            pending = list(self._in_flight.values())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        return finished, pending
+
+    def close(self):
+        """Abandons whatever is still queued or running (the consumer stopped early); a no-op after drain()."""
+        with self._done:
+            self._abandoned = True
+            self._done.notify_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
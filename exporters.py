@@ -0,0 +1,142 @@
+import csv
+import json
+import os
+import re
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+SOCIAL_PLATFORMS = ["facebook", "instagram", "twitter", "linkedin", "youtube", "tiktok"]
+BASE_FIELDS = ["name", "address", "phone", "email", "website"]
+DEFAULT_FIELDS = BASE_FIELDS + [f"social_{platform}" for platform in SOCIAL_PLATFORMS]
+FORMATS = ("csv", "jsonl", "json", "parquet")
+
+Row = Dict[str, Any]
+
+def flatten_record(biz: Dict[str, Any]) -> Row:
+    """One flat row per business: social_links become social_<platform> columns."""
+    row = {key: value for key, value in biz.items() if key not in ("social_links", "details")}
+    socials = biz.get("social_links") or {}
+    if isinstance(socials, dict):
+        for platform in SOCIAL_PLATFORMS:
+            row[f"social_{platform}"] = socials.get(platform, "")
+        for platform, link in socials.items():
+            row.setdefault(f"social_{platform}", link)
+    return row
+
+_CONDITION = re.compile(r"^\s*(\w+)\s*(!=|=|~|!~)\s*(.*?)\s*$")
+
+def parse_where(conditions: Optional[Iterable[str]]) -> Optional[Callable[[Row], bool]]:
+    """
+    Builds a row filter from conditions such as "phone!=N/A", "address~Accra" or
+    "social_facebook!=" (all must match; ~ is a case-insensitive substring test).
+    """
+    tests = []
+    for condition in conditions or []:
+        match = _CONDITION.match(condition)
+        if not match:
+            raise ValueError(f"Invalid filter '{condition}'. Use field=value, field!=value, field~text or field!~text.")
+        field, op, value = match.groups()
+        tests.append((field, op, value, value.casefold()))
+    if not tests:
+        return None
+
+    def row_filter(row: Row) -> bool:
+        for field, op, value, folded in tests:
+            actual = "" if row.get(field) is None else str(row.get(field))
+            if op == "=" and actual != value:
+                return False
+            if op == "!=" and actual == value:
+                return False
+            if op == "~" and folded not in actual.casefold():
+                return False
+            if op == "!~" and folded in actual.casefold():
+                return False
+        return True
+
+    return row_filter
+
+def iter_chunks(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def guess_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return {"ndjson": "jsonl", "pq": "parquet"}.get(ext, ext if ext in FORMATS else "csv")
+
+def _write_csv(chunks, path, fields):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for chunk in chunks:
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+def _write_jsonl(chunks, path, fields):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write("".join(json.dumps({k: row.get(k, "") for k in fields}, ensure_ascii=False) + "\n" for row in chunk))
+            count += len(chunk)
+    return count
+
+def _write_json(chunks, path, fields):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for chunk in chunks:
+            for row in chunk:
+                f.write(",\n" if count else "\n")
+                f.write(json.dumps({k: row.get(k, "") for k in fields}, ensure_ascii=False))
+                count += 1
+        f.write("\n]" if count else "]")
+    return count
+
+def _write_parquet(chunks, path, fields):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+
+    schema = pa.schema([(field, pa.string()) for field in fields])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            columns = {field: ["" if row.get(field) is None else str(row.get(field)) for row in chunk] for field in fields}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(chunk)
+    return count
+
+WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "json": _write_json, "parquet": _write_parquet}
+
+def export_records(records: Iterable[Dict[str, Any]], path: str, fmt: Optional[str] = None,
+                   fields: Optional[List[str]] = None, where: Optional[Iterable[str]] = None,
+                   chunk_size: int = 1000) -> int:
+    """
+    Streams records to `path` in bounded chunks and returns the number of rows written.
+    Records are flattened, filtered by `where` and projected onto `fields`.
+    """
+    fmt = fmt or guess_format(path)
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(FORMATS)}")
+    fields = list(fields or DEFAULT_FIELDS)
+    row_filter = parse_where(where)
+
+    rows = (flatten_record(biz) for biz in records)
+    if row_filter:
+        rows = filter(row_filter, rows)
+
+    tmp_path = path + ".tmp"
+    try:
+        count = WRITERS[fmt](iter_chunks(rows, chunk_size), tmp_path, fields)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
@@ -1,274 +1,880 @@
 import time
-import re
-import json
 import urllib.parse
-from typing import List, Dict, Optional, Any
-from bs4 import BeautifulSoup
-import requests
-from googleapiclient.discovery import build
+import queue
+import threading
+from typing import List, Dict, Optional, Any, Callable, Iterable, Iterator, Sequence, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
-    StaleElementReferenceException, TimeoutException, ElementClickInterceptedException
+    StaleElementReferenceException, TimeoutException, ElementClickInterceptedException,
+    WebDriverException
+)
+
+from readiness import readiness
+from social_cache import SocialCache
+from cse import CustomSearchService
+from enrichment import EnrichmentStage, RateLimitedFetcher
+from pipeline import FilterPipeline, build_filters, CARD, PARSED
+from store import STORE_FILE, get_store
+from checkpoint import RunCheckpoint
+from dedupe import place_key
+from drivers import driver_manager, quit_quietly
+from contacts import contact_crawler
+from metrics import metrics, PAGE_LOAD, FETCH, DISCOVER, SCROLL, CLICK, PANEL_WAIT, EXTRACT, PARSE, SOCIAL, SAVE
+from cards import CARDS_EXTRACT_JS, CARD_LINKS_JS, card_to_record, missing_fields
+from maps_http import PAGE_SIZE, fetch_search_page, get_session, place_fields
+from panel import PANEL_EXTRACT_JS, TEXT_CLASSES, panel_fields, parse_panel_html
+from parsing import (
+    SOCIAL_DOMAINS, NON_SOCIAL_TLDS, SHORT_DOMAINS, parse_details, to_record,
+    is_social_media_link, is_non_social_website, has_non_social_website
 )
 
 api_key = ""
 cse_id = "a595ae02b0cab45d2"
 
-SOCIAL_DOMAINS = {
-    "facebook.com", "instagram.com", "twitter.com", "x.com", "linkedin.com",
-    "youtube.com", "tiktok.com", "snapchat.com", "whatsapp.com", "gmail.com"
-}
-NON_SOCIAL_TLDS = ['.com', '.org', '.net', '.edu', '.ai', '.co', '.io', '.me', '.store', '.biz', '.gh', '.com.gh']
-SHORT_DOMAINS = {"bit.ly", "bitly.com", "tinyurl.com", "goo.gl", "t.co", "linktr.ee"}
+# Extra (api_key, cse_id) pairs to rotate through; the pair above is used when this is empty.
+CSE_CREDENTIALS: List[tuple] = []
+CSE_QUERIES_PER_MINUTE = 100  # Per key; matches the default Custom Search per-minute quota.
+ENRICH_WORKERS = 4
+ENRICH_DRAIN_TIMEOUT = 60  # Seconds to wait for in-flight lookups before records go out as pending.
+ENRICH_MAX_PENDING = 100  # Records waiting on lookups before scraping pauses for enrichment to catch up.
+SAVE_BATCH_SIZE = 50  # Records per store transaction while a run streams its results.
 
-_google_service = None  # Cache for Google API client
+# "script": extract panel text in the browser; "html": ship innerHTML and parse it locally.
+PANEL_EXTRACTION_MODE = "script"
 
-def get_google_service():
-    global _google_service
-    if _google_service is None:
-        _google_service = build("customsearch", "v1", developerKey=api_key)
-    return _google_service
+SOCIAL_QUERY_TEMPLATE = (
+    "{name} site:facebook.com OR site:instagram.com OR site:twitter.com "
+    "OR site:linkedin.com OR site:youtube.com OR site:tiktok.com"
+)
 
-def safe_click(driver, element, max_retries=3, delay=1):
-    """Attempts to safely click an element with retries and scrolling."""
-    for attempt in range(max_retries):
+# Social lookup cache settings (seconds / rows). Set SOCIAL_CACHE_FILE = None to disable caching.
+SOCIAL_CACHE_FILE = "social_cache.db"
+SOCIAL_CACHE_TTL = 30 * 24 * 60 * 60
+SOCIAL_CACHE_NEGATIVE_TTL = 7 * 24 * 60 * 60
+SOCIAL_CACHE_MAX_ENTRIES = 50000
+
+_google_services = {}  # Cache for Google API clients, one per API key
+_social_cache = None  # Cache for social lookup results
+
+def get_google_service(key: Optional[str] = None):
+    key = api_key if key is None else key
+    if key not in _google_services:
+        _google_services[key] = CustomSearchService(key)
+    return _google_services[key]
+
+def get_cse_credentials() -> List[tuple]:
+    return list(CSE_CREDENTIALS) or [(api_key, cse_id)]
+
+def get_social_cache() -> Optional[SocialCache]:
+    global _social_cache
+    if _social_cache is None and SOCIAL_CACHE_FILE:
+        _social_cache = SocialCache(
+            SOCIAL_CACHE_FILE,
+            ttl=SOCIAL_CACHE_TTL,
+            negative_ttl=SOCIAL_CACHE_NEGATIVE_TTL,
+            max_entries=SOCIAL_CACHE_MAX_ENTRIES,
+        )
+    return _social_cache
+
+def make_social_enricher(max_results: int = 4, filters: Optional[FilterPipeline] = None) -> EnrichmentStage:
+    """
+    Background social-link lookups, rate limited per CSE key and served from the cache first.
+    With contact_crawler.enabled, each record's website and social pages are then crawled for
+    emails and phones, on enough workers to keep the crawler's connections busy.
+    """
+    fetcher = RateLimitedFetcher(_fetch_social_media_links, get_cse_credentials(), CSE_QUERIES_PER_MINUTE)
+    crawl = contact_crawler.enabled
+
+    def enrich(biz):
+        if filters is not None:
+            filters.count_enriched()
+        updates = {"social_links": search_social_media_links(biz["name"], max_results, fetcher=fetcher) or {}}
+        if crawl:
+            updates.update(contact_crawler.enrich(dict(biz, **updates)))
+        return updates
+
+    workers = max(ENRICH_WORKERS, contact_crawler.workers) if crawl else ENRICH_WORKERS
+    return EnrichmentStage(enrich, workers=workers, max_pending=ENRICH_MAX_PENDING)
+
+def _emit_enriched(records, checkpoint: Optional[RunCheckpoint] = None) -> Iterator[Dict[str, Any]]:
+    """Checkpoints finished records under their place_key, which is dropped from the record, and yields them."""
+    for biz in records:
+        place = biz.pop("place_key", None)
+        if checkpoint is not None:
+            checkpoint.add_record(biz, place)
+        print(f"✅ Collected: {biz['name']}\n")
+        yield biz
+
+def _drain_enrichment(enricher: EnrichmentStage) -> List[Dict[str, Any]]:
+    """Waits for outstanding lookups; records whose lookup is still running come last, marked as pending."""
+    if enricher.pending_count:
+        print(f"⏳ Waiting for {enricher.pending_count} enrichment lookups...")
+    finished, pending = enricher.drain(ENRICH_DRAIN_TIMEOUT)
+    for biz in pending:
+        biz["social_status"] = "pending"
+    return finished + pending
+
+def _finish_enrichment(enricher: EnrichmentStage, checkpoint: Optional[RunCheckpoint] = None) -> Iterator[Dict[str, Any]]:
+    """Yields the records of the outstanding lookups (see _drain_enrichment) and flushes the checkpoint."""
+    yield from _emit_enriched(_drain_enrichment(enricher), checkpoint)
+    if checkpoint is not None:
+        checkpoint.flush()
+
+class _DiscoveryOrder:
+    """
+    Reorder buffer for the parallel engine: every queued place settles its discovery index with
+    a finished record or None, and ready() releases records once all earlier places are settled.
+    It only holds places that finished ahead of an earlier one still being opened or enriched.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._settled: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._next = 0
+
+    def settle(self, index: int, biz: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._settled[index] = biz
+
+    def ready(self) -> List[Dict[str, Any]]:
+        released = []
+        with self._lock:
+            while self._next in self._settled:
+                biz = self._settled.pop(self._next)
+                self._next += 1
+                if biz is not None:
+                    released.append(biz)
+        return released
+
+def _resumed(checkpoint: Optional[RunCheckpoint]) -> Iterator[Dict[str, Any]]:
+    """Records a resumed run collected before, streamed back from the checkpoint ahead of new ones."""
+    if checkpoint is not None:
+        yield from checkpoint.iter_resumed()
+
+def _mark_seen(checkpoint: Optional[RunCheckpoint], place: str):
+    if checkpoint is not None:
+        checkpoint.mark_seen(place)
+
+class FeedReader:
+    """
+    Incremental reader over the results feed. read() returns only the cards added since the
+    previous call (one script call, `script` picks the card fields), and scroll() waits on
+    the feed's MutationObserver instead of sleeping. The feed counts as exhausted at the
+    end-of-list marker or after `max_empty_scrolls` scrolls that load nothing.
+    """
+
+    def __init__(self, driver, script: str = CARD_LINKS_JS, max_empty_scrolls: int = 3):
+        self.driver = driver
+        self.script = script
+        self.max_empty_scrolls = max_empty_scrolls
+        self.cursor = 0
+        self.loaded = 0
+        self.exhausted = False
+        self._at_end = False
+        self._empty_scrolls = 0
+
+    def read(self) -> List[Dict[str, Any]]:
+        with metrics.stage(DISCOVER):
+            cards = self.driver.execute_script(self.script, self.cursor) or []
+        self.cursor += len(cards)
+        self.loaded = max(self.loaded, self.cursor)
+        return cards
+
+    def scroll(self) -> bool:
+        """Loads the next batch of cards; False once the list is exhausted."""
+        if self._at_end and self.loaded <= self.cursor:
+            self.exhausted = True
+        if self.exhausted:
+            return False
         try:
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(delay)
-            element.click()
-            return True
-        except (StaleElementReferenceException, ElementClickInterceptedException) as e:
-            print(f"⚠️ Click attempt {attempt+1} failed: {e}")
-            time.sleep(1)
-    return False
-
-def save_unique_businesses(businesses, output_file="businesses.json"):
-    """Saves unique businesses to JSON, skipping duplicates."""
-    try:
-        with open(output_file, "r", encoding="utf-8") as f:
-            existing = json.load(f)
-    except FileNotFoundError:
-        existing = []
-
-    existing_names = {biz["name"] for biz in existing}
-    new_entries = [biz for biz in businesses if biz["name"] not in existing_names]
-
-    if new_entries:
-        print(f"💾 Saving {len(new_entries)} new businesses...")
-        existing.extend(new_entries)
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(existing, f, indent=4, ensure_ascii=False)
+            with metrics.stage(SCROLL):
+                result = readiness.scroll_for_more_cards(self.driver, self.loaded)
+        except WebDriverException as e:
+            print(f"⚠️ Scroll failed: {e}")
+            self.exhausted = True
+            return False
+        self.loaded = result["count"]
+        self._at_end = result["end"]
+        if not result["found"]:
+            print("⚠️ Results feed not found; stopping.")
+            self.exhausted = True
+        elif result["grew"]:
+            self._empty_scrolls = 0
+        elif result["end"]:
+            self.exhausted = True
+        else:
+            self._empty_scrolls += 1
+            self.exhausted = self._empty_scrolls >= self.max_empty_scrolls
+        return not self.exhausted
+
+    def restore(self, position: int, stop_flag_func=None):
+        """Scrolls until `position` cards are loaded, without reading or opening any of them."""
+        if self.loaded < position:
+            print(f"⏩ Scrolling back to card {position}...")
+        while self.loaded < position and not (stop_flag_func and stop_flag_func()):
+            if not self.scroll():
+                break
+
+def safe_click(driver, element, max_retries=3, delay=0):
+    """Attempts to safely click an element with retries and scrolling."""
+    with metrics.stage(CLICK):
+        for attempt in range(max_retries):
+            try:
+                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+                if delay:
+                    time.sleep(delay)
+                element.click()
+                return True
+            except (StaleElementReferenceException, ElementClickInterceptedException) as e:
+                print(f"⚠️ Click attempt {attempt+1} failed: {e}")
+                # Back off only on failure; the scroll above is synchronous.
+                time.sleep(0.5 * (attempt + 1))
+        return False
+
+def _save_batch(businesses, output_file=STORE_FILE) -> Tuple[int, int]:
+    """Adds `businesses` to the store in one transaction and reports merges: (new records, merged records)."""
+    decisions = []
+    with metrics.stage(SAVE):
+        new_entries = get_store(output_file).add_many(businesses, on_decision=decisions.append)
+    for d in decisions:
+        if d["name"] != d["matched"]:
+            print(f"🔗 '{d['name']}' merged into saved '{d['matched']}' ({d['reason']}, score {d['score']})")
+    return len(new_entries), len(decisions)
+
+def _report_saved(added: int, merged: int):
+    if added:
+        print(f"💾 Saved {added} new businesses.")
     else:
         print("📭 No new businesses found to save.")
+    if merged:
+        print(f"🔗 {merged} already saved; missing fields filled in from the new results.")
+
+def save_unique_businesses(businesses, output_file=STORE_FILE):
+    """
+    Appends unique businesses to the result store. Records that match a saved business (same
+    place under a slightly different name, phone format, ...) are merged into it and reported.
+    """
+    _report_saved(*_save_batch(businesses, output_file))
 
-def extract_businesses(driver, max_results=3, output_file="businesses.json", live_callback=None, stop_flag_func=None):
-    """Extracts business information from Google Maps results, filtering for businesses with NO website."""
+def save_stream(records: Iterable[Dict[str, Any]], output_file=STORE_FILE,
+                batch_size: int = SAVE_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Passes `records` through, saving them to the store every `batch_size` records and once more
+    when the stream ends or the consumer stops, so results reach the store while the run goes on.
+    """
+    batch = []
+    added = merged = 0
+    try:
+        for biz in records:
+            batch.append(biz)
+            yield biz
+            if len(batch) >= batch_size:
+                new, dup = _save_batch(batch, output_file)
+                added, merged, batch = added + new, merged + dup, []
+    finally:
+        close = getattr(records, "close", None)
+        if close:
+            close()
+        if batch:
+            new, dup = _save_batch(batch, output_file)
+            added, merged = added + new, merged + dup
+        _report_saved(added, merged)
+
+def collect_businesses(records: Iterable[Dict[str, Any]], output_file=STORE_FILE,
+                       live_callback=None) -> List[Dict[str, Any]]:
+    """Runs a record stream to the end: saves it as it goes, calls `live_callback` per record and returns the list."""
     businesses = []
-    seen_names = set()
-    scroll_attempts = 0
-    max_scroll_attempts = 2
+    for biz in save_stream(records, output_file):
+        if live_callback:
+            live_callback(biz)
+        businesses.append(biz)
+    print(f"\n🎉 Done! Saved {len(businesses)} businesses to {output_file}")
+    return businesses
 
-    while len(businesses) < max_results and scroll_attempts < max_scroll_attempts:
-        print(f"📦 Collecting business cards ({len(businesses)}/{max_results})...")
+def _parse_panel(name: str, panel: Dict[str, Any]) -> Dict[str, Any]:
+    """Record from a panel read; the raw panel text is not kept on it."""
+    with metrics.stage(PARSE):
+        return to_record(name, panel_fields(panel))
 
-        cards = driver.find_elements(By.CLASS_NAME, "Nv2PK")
-        new_found = False
+def iter_panel_businesses(driver, max_results=3, stop_flag_func=None, filters: Optional[FilterPipeline] = None,
+                          checkpoint: Optional[RunCheckpoint] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Opens each result's panel and yields its record once parsed, filtered and enriched.
+    `filters` decides which records are kept (default: businesses with NO website); cheap
+    filters run before the panel is opened or before enrichment, so dropped records cost nothing extra.
+    With a `checkpoint`, progress is saved as the run goes and places it already holds are skipped.
+    """
+    filters = filters if filters is not None else build_filters()
+    collected = 0
+    for biz in _resumed(checkpoint):
+        collected += 1
+        yield biz
+    seen_places = set()
+    feed = FeedReader(driver)
+    enricher = make_social_enricher(filters=filters)
+    if checkpoint:
+        feed.restore(checkpoint.scroll_position, stop_flag_func)
 
-        for i, card in enumerate(cards):
-            try:
-                link = card.find_element(By.CLASS_NAME, "hfpxzc")
-                name = link.get_attribute("aria-label").strip()
+    try:
+        while collected < max_results and not (stop_flag_func and stop_flag_func()):
+            print(f"📦 Collecting business cards ({collected}/{max_results})...")
+
+            for card in feed.read():
+                try:
+                    name = (card.get("name") or "").strip()
+                    link = card.get("link")
+                    key = place_key(card)
+
+                    if not name or link is None or key in seen_places:
+                        continue
+
+                    seen_places.add(key)
+
+                    if checkpoint and checkpoint.is_done(key, name):
+                        continue
+
+                    if not filters.accepts(CARD, {"name": name, "place_key": key}):
+                        _mark_seen(checkpoint, key)
+                        continue
+
+                    if not safe_click(driver, link):
+                        print(f"❌ Could not click on {name}")
+                        continue
 
-                if not name or name in seen_names:
+                    biz = _parse_panel(name, get_panel_details(driver, name))
+                    biz["place_key"] = key
+                    if filters.accepts(PARSED, biz):
+                        enricher.submit(biz)
+                        collected += 1
+                    else:
+                        _mark_seen(checkpoint, key)
+
+                    yield from _emit_enriched(enricher.completed(), checkpoint)
+
+                    if collected >= max_results:
+                        break
+
+                    if stop_flag_func and stop_flag_func():
+                        break
+
+                except (StaleElementReferenceException, TimeoutException, ElementClickInterceptedException) as e:
+                    print(f"⛔ Skipped card due to error: {e}")
                     continue
 
-                seen_names.add(name)
-                new_found = True
+            if checkpoint:
+                checkpoint.set_scroll(feed.cursor)
+            if collected >= max_results or not feed.scroll():
+                break
+
+        yield from _finish_enrichment(enricher, checkpoint)
+    finally:
+        enricher.close()
+
+def iter_list_businesses(driver, max_results=3, stop_flag_func=None, filters: Optional[FilterPipeline] = None,
+                         required_fields=("phone",), checkpoint: Optional[RunCheckpoint] = None) -> Iterator[Dict[str, Any]]:
+    """
+    List-only mode: reads every visible result card with one script call per scroll batch
+    and builds records from the card text. The place panel is opened only for records that
+    are missing one of `required_fields`.
+    """
+    filters = filters if filters is not None else build_filters()
+    collected = 0
+    for biz in _resumed(checkpoint):
+        collected += 1
+        yield biz
+    seen_places = set()
+    feed = FeedReader(driver, CARDS_EXTRACT_JS)
+    panels_opened = 0
+    enricher = make_social_enricher(filters=filters)
+    if checkpoint:
+        feed.restore(checkpoint.scroll_position, stop_flag_func)
+
+    try:
+        while collected < max_results and not (stop_flag_func and stop_flag_func()):
+            cards = feed.read()
+            print(f"📦 Read {len(cards)} new cards ({collected}/{max_results} collected)...")
+
+            for card in cards:
+                name = (card.get("name") or "").strip()
+                key = place_key(card)
+                if not name or key in seen_places:
+                    continue
+                seen_places.add(key)
 
-                if not safe_click(driver, link):
-                    print(f"❌ Could not click on {name}")
+                if checkpoint and checkpoint.is_done(key, name):
                     continue
 
-                details_text = get_panel_details_text(driver)
-                if details_text is None:
+                if not filters.accepts(CARD, {"name": name, "place_key": key}):
+                    _mark_seen(checkpoint, key)
                     continue
 
-                business = {
-                    "name": name,
-                    "details": details_text
-                }
+                with metrics.stage(PARSE):
+                    biz = card_to_record(card)
+                biz["place_key"] = key
+                missing = missing_fields(biz, required_fields)
+                if missing and card.get("link") is not None:
+                    try:
+                        if safe_click(driver, card["link"]):
+                            panels_opened += 1
+                            details = panel_fields(get_panel_details(driver, name))
+                            for field in missing:
+                                if details.get(field):
+                                    biz[field] = details[field]
+                    except (StaleElementReferenceException, TimeoutException, ElementClickInterceptedException) as e:
+                        print(f"⛔ Could not open panel for {name}: {e}")
+
+                if filters.accepts(PARSED, biz):
+                    enricher.submit(biz)
+                    collected += 1
+                else:
+                    _mark_seen(checkpoint, key)
+
+                yield from _emit_enriched(enricher.completed(), checkpoint)
+                if collected >= max_results or (stop_flag_func and stop_flag_func()):
+                    break
 
-                cleaned_data = extract_business_info([business])
+            if checkpoint:
+                checkpoint.set_scroll(feed.cursor)
+            if collected >= max_results or not feed.scroll():
+                break
 
-                # === FILTER: Only add if NO website ===
-                for biz in cleaned_data:
-                    if not biz.get("website") or biz.get("website") == "N/A":
-                        if live_callback:
-                            live_callback(biz)
-                        print(f"✅ Collected (no website): {name}\n")
-                        businesses.append(biz)
-                        if len(businesses) >= max_results:
-                            break
+        yield from _finish_enrichment(enricher, checkpoint)
+    finally:
+        enricher.close()
+    print(f"⚡ List mode: {len(seen_places)} cards read, {panels_opened} panels opened")
 
-                if len(businesses) >= max_results:
-                    break
+def iter_http_businesses(query: str, max_results=3, stop_flag_func=None, filters: Optional[FilterPipeline] = None,
+                         checkpoint: Optional[RunCheckpoint] = None, session=None,
+                         page_size: int = PAGE_SIZE, viewport: Optional[Sequence[float]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Browser-free engine: pages through the Maps search endpoint over a pooled HTTP `session`
+    (default: maps_http.get_session()) and builds records straight from the JSON payload, one
+    request per `page_size` places. Records have the same shape as the panel engine's.
+    `viewport` (lat, lng, zoom) searches that map view instead of the query's own area.
+    """
+    session = session if session is not None else get_session()
+    filters = filters if filters is not None else build_filters()
+    collected = 0
+    for biz in _resumed(checkpoint):
+        collected += 1
+        yield biz
+    seen_places = set()
+    offset = checkpoint.scroll_position if checkpoint else 0
+    pages = 0
+    enricher = make_social_enricher(filters=filters)
+
+    try:
+        while collected < max_results and not (stop_flag_func and stop_flag_func()):
+            print(f"🌐 Fetching results {offset + 1}-{offset + page_size} ({collected}/{max_results} collected)...")
+            with metrics.stage(FETCH):
+                places = fetch_search_page(session, query, offset, page_size, viewport=viewport)
+            pages += 1
+            if not places:
+                print("📭 No more results.")
+                break
+
+            for place in places:
+                with metrics.stage(PARSE):
+                    fields = place_fields(place)
+                name = str(fields["name"]).strip()
+                key = place_key(fields)
+                if not name or key in seen_places:
+                    continue
+                seen_places.add(key)
+
+                if checkpoint and checkpoint.is_done(key, name):
+                    continue
+
+                if not filters.accepts(CARD, {"name": name, "place_key": key}):
+                    _mark_seen(checkpoint, key)
+                    continue
 
-                if stop_flag_func and stop_flag_func():
+                biz = to_record(name, {
+                    "address": fields["address"],
+                    "phone": fields["phone"],
+                    "email": None,
+                    "website": fields["website"],
+                })
+                biz["place_key"] = key
+                if filters.accepts(PARSED, biz):
+                    enricher.submit(biz)
+                    collected += 1
+                else:
+                    _mark_seen(checkpoint, key)
+
+                yield from _emit_enriched(enricher.completed(), checkpoint)
+                if collected >= max_results or (stop_flag_func and stop_flag_func()):
                     break
+            else:
+                # The whole page was handled; a resumed run starts at the next one.
+                offset += len(places)
+                if checkpoint:
+                    checkpoint.set_scroll(offset)
+                continue
+            break
+
+        yield from _finish_enrichment(enricher, checkpoint)
+    finally:
+        enricher.close()
+    print(f"🌐 HTTP engine: {len(seen_places)} places read, {pages} result pages fetched")
 
-            except (StaleElementReferenceException, TimeoutException, ElementClickInterceptedException) as e:
-                print(f"⛔ Skipped card due to error: {e}")
+def iter_place_links(driver, stop_flag_func=None,
+                     on_scroll: Optional[Callable[[int], None]] = None) -> Iterator[Dict[str, str]]:
+    """
+    Scrolls the results feed and yields each place's name, URL and place_key without opening it.
+    `on_scroll` gets the number of loaded cards after each batch.
+    """
+    seen_places = set()
+    feed = FeedReader(driver)
+
+    while True:
+        for card in feed.read():
+            name = (card.get("name") or "").strip()
+            url = card.get("url")
+            key = place_key(card)
+            if not name or not url or key in seen_places:
                 continue
 
-        if not new_found:
-            scroll_attempts += 1
-        else:
-            scroll_attempts = 0
+            seen_places.add(key)
+            yield {"name": name, "url": url, "place_key": key}
+
+            if stop_flag_func and stop_flag_func():
+                return
 
+        if on_scroll:
+            on_scroll(feed.cursor)
+        if not feed.scroll():
+            return
+
+def _place_worker(driver_factory, link_queue, on_result, stop_event, driver_release=None):
+    """
+    Opens queued (index, link) place URLs in a dedicated driver and calls on_result(index, record)
+    for every item it takes, with None as the record for places skipped, failed or not parsed.
+    A driver that fails with anything but a WebDriver error (a crashed Chrome raises urllib3's
+    MaxRetryError or ProtocolError) is replaced; a worker that cannot start one exits.
+    """
+    release = driver_release or quit_quietly
+
+    def start():
         try:
-            scroll_area = WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, '//div[@role="main"]//div[contains(@aria-label, "Results")]'))
-            )
-            driver.execute_script("arguments[0].scrollBy(0, 1500)", scroll_area)
-            time.sleep(2)
+            return driver_factory()
         except Exception as e:
-            print(f"⚠️ Scroll failed: {e}")
-            break
+            print(f"❌ Worker could not start a driver: {e}")
+            return None
 
-    save_unique_businesses(businesses, output_file)
-    print(f"\n🎉 Done! Saved {len(businesses)} businesses to {output_file}")
-    return businesses
-
-def get_panel_details_text(driver) -> Optional[List[str]]:
-    """Extracts visible details text from the business side panel."""
+    driver = start()
     try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, 'div.m6QErb.WNBkOb.XiKgde[role="main"]'))
-        )
-        time.sleep(3)
-        panel_elements = driver.find_elements(By.CSS_SELECTOR, 'div.m6QErb.XiKgde[role="region"]')
-        time.sleep(3)
-        if len(panel_elements) < 2:
-            raise Exception("Panel element not found or structure changed.")
-
-        panel_html = panel_elements[1].get_attribute("innerHTML")
-        time.sleep(2)
-        soup = BeautifulSoup(panel_html, "html.parser")
-
-        text_classes = [
-            "fontBodyMedium", "fontBodySmall", "HlvSq", "UsdlK", "rogA2c"
-        ]
-        seen_texts = set()
-        extracted_texts = []
-
-        for class_name in text_classes:
-            for div in soup.find_all("div", class_=class_name):
-                text = div.get_text(separator=' ', strip=True)
-                if text and text not in seen_texts:
-                    seen_texts.add(text)
-                    extracted_texts.append(text)
-
-        for span in soup.find_all("span"):
-            text = span.get_text(strip=True)
-            if text and text not in seen_texts:
-                seen_texts.add(text)
-                extracted_texts.append(text)
-
-        return extracted_texts if extracted_texts else ["N/A"]
+        while driver is not None:
+            item = link_queue.get()
+            if item is None:
+                break
+            index, link = item
+            biz = None
+            try:
+                if not stop_event.is_set():
+                    driver.get(link["url"])
+                    biz = _parse_panel(link["name"], get_panel_details(driver, link["name"]))
+                    biz["place_key"] = link["place_key"]
+            except (TimeoutException, WebDriverException) as e:
+                print(f"⛔ Skipped {link['name']} due to error: {e}")
+            except Exception as e:
+                print(f"⛔ Skipped {link['name']}; restarting its browser after: {e!r}")
+                quit_quietly(driver)
+                driver = start()
+            finally:
+                on_result(index, biz)
+    finally:
+        if driver is not None:
+            release(driver)
+
+def _workers_alive(threads: List[threading.Thread]) -> bool:
+    return any(thread.is_alive() for thread in threads)
+
+def iter_parallel_businesses(driver, driver_factory: Callable[[], Any], max_results=3, workers=2,
+                             stop_flag_func=None, filters: Optional[FilterPipeline] = None,
+                             checkpoint: Optional[RunCheckpoint] = None,
+                             driver_release: Optional[Callable[[Any], None]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Worker-pool variant of iter_panel_businesses.
+    `driver` discovers place links on the search page while `workers` drivers built by
+    `driver_factory` open and parse the detail panels. Records are yielded in discovery order:
+    one that finishes early waits until every place queued before it is done. A place whose
+    worker fails is skipped, and the run ends early once no worker is left.
+    Worker drivers are handed to `driver_release` when done (quit when it is None).
+    """
+    filters = filters if filters is not None else build_filters()
+    link_queue = queue.Queue(maxsize=workers * 4)
+    stop_event = threading.Event()
+    lock = threading.Lock()
+    collected = 0
+    order = _DiscoveryOrder()
+    # Discovery index of each record while its lookup runs.
+    indexes: Dict[int, int] = {}
+    for biz in _resumed(checkpoint):
+        collected += 1
+        yield biz
+    if collected >= max_results:
+        # A resumed run that already holds max_results records has nothing left to collect.
+        stop_event.set()
+    enricher = make_social_enricher(filters=filters)
+    if checkpoint and not stop_event.is_set():
+        FeedReader(driver).restore(checkpoint.scroll_position, stop_flag_func)
+
+    def should_stop():
+        if stop_flag_func and stop_flag_func():
+            stop_event.set()
+        return stop_event.is_set()
+
+    def accept(index, biz) -> bool:
+        nonlocal collected
+        if not filters.accepts(PARSED, biz):
+            _mark_seen(checkpoint, biz["place_key"])
+            return False
+        with lock:
+            if stop_event.is_set() or collected >= max_results:
+                return False
+            collected += 1
+            indexes[id(biz)] = index
+            enricher.submit(biz)
+            if collected >= max_results:
+                stop_event.set()
+            should_stop()
+        return True
+
+    def on_result(index, biz):
+        accepted = False
+        try:
+            accepted = biz is not None and accept(index, biz)
+        finally:
+            # Whatever went wrong, the place is settled so later ones are not held back.
+            if not accepted:
+                order.settle(index)
+
+    threads = [
+        threading.Thread(target=_place_worker, args=(driver_factory, link_queue, on_result, stop_event, driver_release),
+                         daemon=True)
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    def released() -> List[Dict[str, Any]]:
+        for biz in enricher.completed():
+            order.settle(indexes.pop(id(biz)), biz)
+        return order.ready()
+
+    queued = 0
+    try:
+        try:
+            on_scroll = checkpoint.set_scroll if checkpoint else None
+            for link in iter_place_links(driver, should_stop, on_scroll):
+                if checkpoint and checkpoint.is_done(link["place_key"], link["name"]):
+                    continue
+                if not filters.accepts(CARD, link):
+                    _mark_seen(checkpoint, link["place_key"])
+                    continue
+                print(f"📦 Queued {link['name']} ({collected}/{max_results} collected)")
+                yield from _emit_enriched(released(), checkpoint)
+                while not should_stop():
+                    if not _workers_alive(threads):
+                        print("❌ Every worker has stopped; ending the run.")
+                        stop_event.set()
+                        break
+                    try:
+                        link_queue.put((queued, link), timeout=0.5)
+                        queued += 1
+                        break
+                    except queue.Full:
+                        continue
+                if should_stop():
+                    break
+        except BaseException:
+            # The consumer closed the stream (or discovery failed): workers skip what is still queued.
+            stop_event.set()
+            raise
+        finally:
+            for _ in threads:
+                while _workers_alive(threads):
+                    try:
+                        link_queue.put(None, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+            for thread in threads:
+                thread.join()
+            # Places no worker took (every worker stopped) are skipped.
+            while True:
+                try:
+                    item = link_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    order.settle(item[0])
+        yield from _emit_enriched(released(), checkpoint)
+        for biz in _drain_enrichment(enricher):
+            order.settle(indexes.pop(id(biz)), biz)
+        yield from _emit_enriched(order.ready(), checkpoint)
+        if checkpoint is not None:
+            checkpoint.flush()
+    finally:
+        enricher.close()
+
+def search_url(query: str, viewport: Optional[Sequence[float]] = None) -> str:
+    """Maps search URL; `viewport` (lat, lng, zoom) opens the results for that map view."""
+    url = f"https://www.google.com/maps/search/{urllib.parse.quote(query)}"
+    if viewport is not None:
+        lat, lng, zoom = viewport
+        url += f"/@{lat:.6f},{lng:.6f},{zoom:g}z"
+    return url
+
+def iter_businesses(query: str, max_results=3, engine="browser", mode="panel", workers=1,
+                    filters: Optional[FilterPipeline] = None, required_fields=("phone",),
+                    checkpoint: Optional[RunCheckpoint] = None, stop_flag_func=None,
+                    output_file: Optional[str] = STORE_FILE,
+                    viewport: Optional[Sequence[float]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Runs one search and yields each business as soon as it is finished (parsed, filtered and
+    enriched), e.g. to insert it into a database while the search goes on.
+    The run only advances while the consumer asks for the next record, so a slow consumer
+    throttles scraping instead of letting records pile up, and at most ENRICH_MAX_PENDING
+    records wait on lookups. Records never carry the raw panel text. They are saved to
+    `output_file` every SAVE_BATCH_SIZE records (None: the consumer stores them itself).
+    engine="browser" takes a Chrome session from driver_manager (panel mode, list mode, or
+    `workers` > 1 parallel panels); engine="http" uses the browser-free engine.
+    `viewport` (lat, lng, zoom) runs the search over that map view (see tiles.py).
+    Closing the generator early stops the run and returns its browsers.
+    """
+    driver = None
+    if engine == "http":
+        records = iter_http_businesses(query, max_results, stop_flag_func, filters, checkpoint, viewport=viewport)
+    else:
+        driver = driver_manager.acquire()
+        try:
+            with metrics.stage(PAGE_LOAD):
+                driver.get(search_url(query, viewport))
+                WebDriverWait(driver, 15).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "Nv2PK"))
+                )
+        except Exception:
+            driver_manager.release(driver)
+            raise
+        if mode == "list":
+            records = iter_list_businesses(driver, max_results, stop_flag_func, filters, required_fields, checkpoint)
+        elif workers > 1:
+            records = iter_parallel_businesses(driver, driver_manager.acquire, max_results, workers, stop_flag_func,
+                                               filters, checkpoint, driver_release=driver_manager.release)
+        else:
+            records = iter_panel_businesses(driver, max_results, stop_flag_func, filters, checkpoint)
+    try:
+        yield from save_stream(records, output_file) if output_file else records
+    finally:
+        if driver is not None:
+            driver_manager.release(driver)
+
+def extract_businesses(driver, max_results=3, output_file=STORE_FILE, live_callback=None, stop_flag_func=None,
+                       filters: Optional[FilterPipeline] = None, checkpoint: Optional[RunCheckpoint] = None):
+    """iter_panel_businesses run to the end: the records are saved and returned as a list."""
+    records = iter_panel_businesses(driver, max_results, stop_flag_func, filters, checkpoint)
+    return collect_businesses(records, output_file, live_callback)
+
+def extract_businesses_fast(driver, max_results=3, output_file=STORE_FILE, live_callback=None, stop_flag_func=None,
+                            filters: Optional[FilterPipeline] = None, required_fields=("phone",),
+                            checkpoint: Optional[RunCheckpoint] = None):
+    """iter_list_businesses run to the end: the records are saved and returned as a list."""
+    records = iter_list_businesses(driver, max_results, stop_flag_func, filters, required_fields, checkpoint)
+    return collect_businesses(records, output_file, live_callback)
+
+def extract_businesses_http(query: str, max_results=3, output_file=STORE_FILE, live_callback=None, stop_flag_func=None,
+                            filters: Optional[FilterPipeline] = None, checkpoint: Optional[RunCheckpoint] = None,
+                            session=None, page_size: int = PAGE_SIZE):
+    """iter_http_businesses run to the end: the records are saved and returned as a list."""
+    records = iter_http_businesses(query, max_results, stop_flag_func, filters, checkpoint, session, page_size)
+    return collect_businesses(records, output_file, live_callback)
+
+def extract_businesses_parallel(driver, driver_factory: Callable[[], Any], max_results=3, workers=2,
+                                output_file=STORE_FILE, live_callback=None, stop_flag_func=None,
+                                filters: Optional[FilterPipeline] = None, checkpoint: Optional[RunCheckpoint] = None,
+                                driver_release: Optional[Callable[[Any], None]] = None):
+    """iter_parallel_businesses run to the end: the records are saved and returned as a list."""
+    records = iter_parallel_businesses(driver, driver_factory, max_results, workers, stop_flag_func, filters,
+                                       checkpoint, driver_release)
+    return collect_businesses(records, output_file, live_callback)
+
+def get_panel_details(driver, name: Optional[str] = None, mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Reads the business side panel once it is ready, as {"texts", "fields"} (see panel_fields).
+    "script" mode collects the text nodes and data-item-id fields in the browser with one
+    execute_script call; "html" mode (and the fallback) parses the panel innerHTML.
+    """
+    mode = mode or PANEL_EXTRACTION_MODE
+    try:
+        with metrics.stage(PANEL_WAIT):
+            settled = readiness.wait_for_panel(driver, name)
+        if not settled:
+            print(f"⚠️ Panel for {name or 'business'} did not settle; parsing what is loaded.")
+
+        with metrics.stage(EXTRACT):
+            if mode == "script":
+                result = driver.execute_script(PANEL_EXTRACT_JS, TEXT_CLASSES)
+                if result:
+                    return result
+
+            panel_elements = driver.find_elements(By.CSS_SELECTOR, 'div.m6QErb.XiKgde[role="region"]')
+            if len(panel_elements) < 2:
+                raise Exception("Panel element not found or structure changed.")
+
+            return parse_panel_html(panel_elements[1].get_attribute("innerHTML"))
     except Exception as e:
         print(f"❌ Error extracting panel details: {e}")
-        return ["N/A"]
-
-def extract_business_info(business_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Extracts structured info (phone, email, address, website, socials) from business details."""
-    def extract_phones(texts):
-        phones = []
-        phone_regex = re.compile(r'(\+233|0)[235][0-9][ -]?\d{3}[ -]?\d{4}|\+?\d{10,15}')
-        for text in texts:
-            found = phone_regex.findall(text)
-            if found:
-                phones.extend([f[0] if isinstance(f, tuple) else f for f in found])
-        return list(set(phones))
-
-    def extract_emails(texts):
-        emails = []
-        email_regex = re.compile(r"([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)")
-        for text in texts:
-            found = email_regex.findall(text)
-            if found:
-                emails.extend(found)
-        return list(set(emails))
-
-    def extract_websites(texts):
-        urls = []
-        url_regex = re.compile(
-            r"(https?://[^\s]+|www\.[^\s]+|[a-zA-Z0-9-]+\.(?:com|org|net|gh|co|io|ai|me|store|biz|edu)(/[^\s]*)?)"
-        )
-        for text in texts:
-            found = url_regex.findall(text)
-            for url in found:
-                url = url[0] if isinstance(url, tuple) else url
-                if not is_social_media_link(url) and is_non_social_website(url):
-                    urls.append(url if url.startswith("http") else "https://" + url)
-        return list(set(urls))
-
-    def extract_address(texts):
-        for text in texts:
-            if re.search(r'\b(Street|St|Ave|Rd|Junction|Accra|Tema|Kumasi|Plot|No\.|Close|Crescent)\b', text, re.I) or \
-               re.search(r'[A-Z0-9]{4,}\+[A-Z0-9]{2,}', text):
-                return text
-        return None
+        return {"texts": [], "fields": {}}
 
+def extract_business_info(business_list: List[Dict[str, Any]], enrich: bool = True) -> List[Dict[str, Any]]:
+    """
+    Extracts structured info (phone, email, address, website, socials) from business details.
+    With enrich=False the social lookup is skipped so it can run in a separate stage.
+    """
     cleaned_data = []
     for biz in business_list:
         name = biz.get("name", "")
-        details = biz.get("details", [])
-
-        phones = extract_phones(details)
-        emails = extract_emails(details)
-        websites = extract_websites(details)
-        address = extract_address(details)
-
-        socials = search_social_media_links(name)
-
-        cleaned_data.append({
-            "name": name,
-            "address": address or "N/A",
-            "phone": phones[0] if phones else "N/A",
-            "email": emails[0] if emails else "N/A",
-            "website": websites[0] if websites else "N/A",
-            "social_links": socials or {},
-        })
+        with metrics.stage(PARSE):
+            fields = parse_details(biz.get("details", []))
+        socials = search_social_media_links(name) if enrich else {}
+        cleaned_data.append(to_record(name, fields, socials))
 
     return cleaned_data
 
-def is_social_media_link(text: str) -> bool:
-    if not text or not isinstance(text, str):
-        return False
-    return any(domain in text.lower() for domain in SOCIAL_DOMAINS)
-
-def is_non_social_website(text: str) -> bool:
-    if not text or not isinstance(text, str):
-        return False
-    if ' ' in text or is_social_media_link(text):
-        return False
-    return any(tld in text.lower() for tld in NON_SOCIAL_TLDS)
-
-def has_non_social_website(texts: List[str]) -> bool:
-    if not isinstance(texts, list):
-        return False
-    for text in texts:
-        if is_non_social_website(text):
-            return True
-    return False
-
-def search_social_media_links(business_name: str, max_results: int = 4) -> Dict[str, str]:
+def search_social_media_links(business_name: str, max_results: int = 4,
+                              fetcher: Optional[Callable[..., Dict[str, str]]] = None) -> Dict[str, str]:
     """
     Searches for a business's social media links using Google Custom Search API.
     Returns a dict with one link per platform (Facebook, Instagram, Twitter/X, LinkedIn).
+    Results, including empty ones, are served from the on-disk social cache when fresh.
     """
+    cache = get_social_cache()
+    cache_template = f"{SOCIAL_QUERY_TEMPLATE}|{max_results}"
+    if cache is not None:
+        cached = cache.get(business_name, cache_template)
+        if cached is not None:
+            return cached
+
+    try:
+        with metrics.stage(SOCIAL):
+            social_links = (fetcher or _fetch_social_media_links)(business_name, max_results)
+    except Exception as e:
+        # Failed lookups are not cached so the next run retries them.
+        print(f"❌ Error searching social media for '{business_name}': {e}")
+        return {}
+
+    if cache is not None:
+        cache.put(business_name, cache_template, social_links)
+    return social_links
+
+def _fetch_social_media_links(business_name: str, max_results: int = 4,
+                              credentials: Optional[tuple] = None) -> Dict[str, str]:
+    """Runs the Custom Search query for one business. Raises on API errors."""
+    key, cx = credentials or (api_key, cse_id)
     social_domains = {
         "facebook": "facebook.com",
         "instagram": "instagram.com",
@@ -277,24 +883,20 @@ def search_social_media_links(business_name: str, max_results: int = 4) -> Dict[
         "youtube": "youtube.com",
         "tiktok": "tiktok.com"
     }
-    query = f"{business_name} site:facebook.com OR site:instagram.com OR site:twitter.com OR site:linkedin.com OR site:youtube.com OR site:tiktok.com"
-    try:
-        service = get_google_service()
-        res = service.cse().list(q=query, cx=cse_id, num=8).execute()
-        social_links = {}
-        if 'items' in res:
-            for item in res['items']:
-                link = item.get('link', '').lower()
-                for platform, domain in social_domains.items():
-                    if isinstance(domain, list):
-                        match = any(d in link for d in domain)
-                    else:
-                        match = domain in link
-                    if match and platform not in social_links:
-                        social_links[platform] = link
-                if len(social_links) >= max_results:
-                    break
-        return social_links
-    except Exception as e:
-        print(f"❌ Error searching social media for '{business_name}': {e}")
-        return {}
\ No newline at end of file
+    query = SOCIAL_QUERY_TEMPLATE.format(name=business_name)
+    service = get_google_service(key)
+    res = service.cse().list(q=query, cx=cx, num=8).execute()
+    social_links = {}
+    if 'items' in res:
+        for item in res['items']:
+            link = item.get('link', '').lower()
+            for platform, domain in social_domains.items():
+                if isinstance(domain, list):
+                    match = any(d in link for d in domain)
+                else:
+                    match = domain in link
+                if match and platform not in social_links:
+                    social_links[platform] = link
+            if len(social_links) >= max_results:
+                break
+    return social_links
\ No newline at end of file
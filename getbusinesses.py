@@ -1,111 +1,170 @@
 import time
-import json
-import urllib.parse
 import threading
 import argparse
+import json
+from contextlib import closing
+import os
 import sys
-import csv
-from tkinter import (
-    Tk, Entry, Button, Text, Scrollbar, Label,
-    END, DISABLED, NORMAL, Frame, messagebox, filedialog, Toplevel
-)
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-
-from extract_businesses import extract_businesses
+
+from pipeline import build_filters
+from store import STORE_FILE, get_store
+from exporters import export_records, guess_format, FORMATS, DEFAULT_FIELDS
+from checkpoint import RunCheckpoint, list_checkpoints
+from metrics import metrics, write_json_summary, write_prometheus_textfile
+from drivers import driver_manager
+from batch import load_jobs, run_batch, format_report as format_batch_report, write_report, DEFAULT_MAX_RESULTS
+from dedupe import dedupe_records
+from tiles import RESULT_CAP, MAX_DEPTH
+
+# Selenium, the extractors (and their HTML parser), the contact crawler and tkinter are imported
+# inside the functions that use them, so `export`, `dedupe`, `--help` and the CLI's show/clear
+# start without loading a browser stack or a GUI toolkit (see benchmarks/bench_startup.py).
 
 # === DRIVER SETUP ===
 def setup_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--window-size=1920,1080")
-    service = Service(ChromeDriverManager().install())
-    return webdriver.Chrome(service=service, options=chrome_options)
-
-# === FLAGS ===
-stop_flag = False
-pause_flag = False
-
-def run_extraction(query, max_results, text_box=None, log_func=None):
-    global stop_flag, pause_flag
-    stop_flag = False
-    pause_flag = False
-    encoded_query = urllib.parse.quote(query)
-    search_url = f"https://www.google.com/maps/search/{encoded_query}"
+    """A fresh, unmanaged Chrome session (runs take theirs from driver_manager instead)."""
+    return driver_manager.create()
+
+def report_metrics(log, metrics_json=None, metrics_prom=None):
+    """Logs the stage timings and writes the JSON summary / Prometheus textfile when asked to."""
+    log(metrics.format_report())
+    for path, writer in ((metrics_json, write_json_summary), (metrics_prom, write_prometheus_textfile)):
+        if not path:
+            continue
+        try:
+            writer(metrics, path)
+        except OSError as e:
+            log(f"⚠️ Could not write metrics to {path}: {e}\n")
+
+def run_extraction(query, max_results, log_func=None, workers=1, filters=None,
+                   mode="panel", required_fields=("phone",), resume=False, metrics_json=None, metrics_prom=None,
+                   reset_stats=True, raise_errors=False, engine="browser", keep_results=True, viewport=None,
+                   stop_event=None, pause_event=None):
+    """
+    Runs one search end to end over extract_businesses.iter_businesses and returns the collected
+    businesses. Messages go to `log_func` (the GUI passes LogView.write, which is safe to call
+    from this worker thread) or stdout. Pause holds the stream, so scraping waits with it.
+    engine="http" reads the results over pooled HTTP instead of Chrome; `mode` and `workers` then do not apply.
+    Batch jobs pass reset_stats=False so concurrent runs share one timing report, and
+    raise_errors=True so a failed run is reported (and retried) instead of returning [].
+    The GUI and CLI pass keep_results=False: records are only logged and saved, and [] is returned.
+    `viewport` (lat, lng, zoom) searches one map view; tile runs pass it, and each view keeps its own checkpoint.
+    `stop_event` / `pause_event` (threading.Event) belong to the caller: the GUI makes a pair per
+    run, while batch and tile runs share one stop event between all their jobs, so one Stop or
+    Ctrl+C reaches every job, including those that start afterwards.
+    """
+    from extract_businesses import iter_businesses, get_social_cache
+    from readiness import readiness
+    from contacts import contact_crawler
+
+    stop_event = stop_event or threading.Event()
+    pause_event = pause_event or threading.Event()
 
     def log(msg):
-        if text_box:
-            text_box.config(state=NORMAL)
-            text_box.insert(END, msg)
-            text_box.see(END)
-            text_box.config(state=DISABLED)
-        elif log_func:
+        if log_func:
             log_func(msg)
         else:
             print(msg, end="")
 
-    log(f"🔍 Starting extraction for: {query} (max {max_results} results)\n")
-
-    driver = setup_driver()
-    driver.get(search_url)
-
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "Nv2PK"))
-        )
-    except Exception as e:
-        log(f"❌ Timed out: {e}\n")
-        driver.quit()
-        return []
-
+    if engine == "http":
+        log(f"🔍 Starting extraction for: {query} (max {max_results} results, HTTP engine)\n")
+    else:
+        log(f"🔍 Starting extraction for: {query} (max {max_results} results, {mode} mode, {workers} worker(s))\n")
+    if reset_stats:
+        readiness.start_run()
+        metrics.start_run(query=query, mode=mode, workers=workers, max_results=max_results, resume=resume, engine=engine)
+    filters = filters if filters is not None else build_filters()
+    filters.reset()
+    social_cache = get_social_cache()
+    if social_cache and reset_stats:
+        social_cache.reset_stats()
+    if contact_crawler.enabled and reset_stats:
+        contact_crawler.reset_stats()
+
+    checkpoint = None
+    error = None
+    results = []
+    collected = 0
     try:
-        def live_callback(biz):
-            while pause_flag:
-                time.sleep(0.5)
-            log(f"✅ {biz['name']}\n")
-
-        results = extract_businesses(
-            driver,
-            max_results=max_results,
-            live_callback=live_callback,
-            stop_flag_func=lambda: stop_flag
-        )
-
-        if stop_flag:
-            log("\n🛑 Extraction manually stopped.\n")
+        settings = {"max_results": max_results, "mode": mode, "engine": engine}
+        key = query
+        if viewport is not None:
+            settings.update(query=query, viewport=list(viewport))
+            key = f"{query} @{viewport[0]:.6f},{viewport[1]:.6f},{viewport[2]:g}z"
+        checkpoint = RunCheckpoint.open(key, resume=resume, settings=settings)
+        records = iter_businesses(query, max_results, engine=engine, mode=mode, workers=workers, filters=filters,
+                                  required_fields=required_fields, checkpoint=checkpoint,
+                                  stop_flag_func=stop_event.is_set, viewport=viewport)
+        with closing(records):
+            for biz in records:
+                while pause_event.is_set() and not stop_event.is_set():
+                    time.sleep(0.5)
+                log(f"✅ {biz['name']}\n")
+                collected += 1
+                if keep_results:
+                    results.append(biz)
+
+        if stop_event.is_set():
+            log("\n🛑 Extraction manually stopped. Use 'resume' to continue it.\n")
         else:
-            log(f"\n🎉 Finished! Total: {len(results)} businesses found.\n")
+            checkpoint.discard()
+            log(f"\n🎉 Finished! Total: {collected} businesses found.\n")
 
     except Exception as e:
+        error = e
         log(f"❌ Error during extraction: {e}\n")
-        results = []
-
-    driver.quit()
+        if checkpoint:
+            log("💾 Progress was checkpointed; use 'resume' to continue this run.\n")
+        results, collected = [], 0
+    finally:
+        if checkpoint:
+            checkpoint.flush()
+            checkpoint.close()
+
+    log(filters.format_report())
+    log(readiness.format_report())
+    if social_cache:
+        log(social_cache.format_stats())
+    if contact_crawler.enabled:
+        log(contact_crawler.format_stats())
+    if reset_stats:
+        if engine != "http":
+            log(driver_manager.format_stats())
+        metrics.update_info(businesses=collected, stopped=stop_event.is_set())
+        report_metrics(log, metrics_json, metrics_prom)
+    if error is not None and raise_errors:
+        raise error
     return results
 
-def show_saved_json(text_box=None, file_path="businesses.json", log_func=None):
+def resume_options(run, run_options):
+    """
+    Options to resume checkpoint `run` with: the mode, engine and map view it was started with
+    replace the current ones, so its saved progress is continued the same way.
+    """
+    settings = run["settings"]
+    options = dict(run_options)
+    for key in ("mode", "engine"):
+        if settings.get(key):
+            options[key] = settings[key]
+    options["viewport"] = settings.get("viewport")
+    return options
+
+def describe_run(run):
+    """'query (panel mode, browser engine; 12 collected, 30 places processed)' for resume lists."""
+    settings = run["settings"]
+    return (f"{run['query']} ({settings.get('mode', 'panel')} mode, {settings.get('engine', 'browser')} engine; "
+            f"{run['records']} collected, {run['seen']} places processed)")
+
+def show_saved_json(file_path=STORE_FILE, log_func=None):
+    """Prints every saved business (CLI `show`; the GUI uses the paged SavedTable instead)."""
     def log(msg):
-        if text_box:
-            text_box.config(state=NORMAL)
-            text_box.insert(END, msg)
-            text_box.config(state=DISABLED)
-        elif log_func:
+        if log_func:
             log_func(msg)
         else:
             print(msg, end="")
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = get_store(file_path).iter_records()
         log("\n📂 Saved Businesses:\n\n")
         for i, biz in enumerate(data, start=1):
             name = biz.get("name", "N/A")
@@ -121,42 +180,209 @@ def show_saved_json(text_box=None, file_path="businesses.json", log_func=None):
     except Exception as e:
         log(f"⚠️ Could not read file: {e}\n")
 
-def export_to_csv(json_file="businesses.json"):
+def export_to_csv(store_file=STORE_FILE, widget=None):
+    """Asks for a target file and streams the store to it (CSV, JSONL, JSON or Parquet by extension).
+    With a Tk `widget` the export runs off the event loop and reports back through widget.after."""
+    from tkinter import messagebox, filedialog
+
     try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not data:
+        store = get_store(store_file)
+        if not store.count():
             messagebox.showinfo("Export", "No data to export.")
             return
-        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON Lines", "*.jsonl"), ("JSON", "*.json"), ("Parquet", "*.parquet")]
+        )
         if not file_path:
             return
-        with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
-            fieldnames = ["name", "address", "phone", "email", "website", "social_links"]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for biz in data:
-                writer.writerow({
-                    "name": biz.get("name", ""),
-                    "address": biz.get("address", ""),
-                    "phone": biz.get("phone", ""),
-                    "email": biz.get("email", ""),
-                    "website": biz.get("website", ""),
-                    "social_links": str(biz.get("social_links", "")),
-                })
-        messagebox.showinfo("Export", f"Exported to {file_path}")
     except Exception as e:
         messagebox.showerror("Export Error", str(e))
+        return
+
+    def run():
+        try:
+            count = export_records(store.iter_records(), file_path)
+            done = lambda: messagebox.showinfo("Export", f"Exported {count} businesses to {file_path}")
+        except Exception as e:
+            error = str(e)
+            done = lambda: messagebox.showerror("Export Error", error)
+        if widget is not None:
+            widget.after(0, done)
+        else:
+            done()
+
+    if widget is not None:
+        threading.Thread(target=run, daemon=True).start()
+    else:
+        run()
+
+def export_command(args):
+    """Non-interactive `export` subcommand."""
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else None
+    try:
+        count = export_records(
+            get_store(args.store).iter_records(batch_size=args.chunk_size),
+            args.output,
+            fmt=args.format,
+            fields=fields,
+            where=args.where,
+            chunk_size=args.chunk_size,
+        )
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+    print(f"📤 Exported {count} businesses to {args.output} ({args.format or guess_format(args.output)})")
+
+def dedupe_command(args):
+    """Non-interactive `dedupe` subcommand: merges near-duplicate businesses already in the store."""
+    store = get_store(args.store)
+    report = open(args.report, "w", encoding="utf-8") if args.report else None
+    merged = []
+
+    def on_decision(d):
+        merged.append(d["name"])
+        print(f"🔗 '{d['name']}' -> '{d['matched']}' ({d['reason']}, score {d['score']})")
+        if report:
+            report.write(json.dumps(d, ensure_ascii=False) + "\n")
+
+    try:
+        if args.dry_run:
+            unique = dedupe_records(store.iter_records(), on_decision=on_decision)
+            print(f"🔎 {len(unique)} unique of {len(unique) + len(merged)} businesses; nothing was changed (--dry-run)")
+        else:
+            stats = store.deduplicate(on_decision=on_decision)
+            print(f"🧹 Merged {stats['merged']} duplicates; {stats['records'] - stats['merged']} businesses remain")
+    finally:
+        if report:
+            report.close()
+            print(f"📝 Merge decisions written to {args.report}")
+
+def batch_command(args, run_options, filter_options):
+    """Non-interactive `batch` subcommand: runs every query in a file and writes one consolidated output."""
+    from readiness import readiness
+
+    try:
+        jobs = load_jobs(args.queries, args.max_results)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read queries: {e}")
+        sys.exit(1)
+    if not jobs:
+        print("📭 No queries to run.")
+        return
+
+    stop_event = threading.Event()
+
+    print(f"📚 Running {len(jobs)} queries, {args.concurrency} at a time")
+    readiness.start_run()
+    metrics.start_run(batch=args.queries, jobs=len(jobs), mode=run_options.get("mode"))
+    log_lock = threading.Lock()
+
+    def log(msg):
+        with log_lock:
+            print(msg, end="")
+
+    options = {k: v for k, v in run_options.items() if k not in ("filters", "metrics_json", "metrics_prom")}
+    try:
+        records, report = run_batch(
+            jobs,
+            run_extraction,
+            lambda: build_filters(**filter_options),
+            concurrency=args.concurrency,
+            retries=args.retries,
+            retry_delay=args.retry_delay,
+            resume=args.resume,
+            log=log,
+            stop_flag_func=stop_event.is_set,
+            request_stop=stop_event.set,
+            stop_event=stop_event,
+            **options
+        )
+    except KeyboardInterrupt:
+        print("\n🛑 Batch interrupted. Run it again with --resume to continue the unfinished queries.")
+        sys.exit(130)
+
+    count = export_records(records, args.output)
+    report_path = args.report or os.path.splitext(args.output)[0] + ".report.json"
+    write_report(report, report_path)
+    print(format_batch_report(report), end="")
+    metrics.update_info(businesses=count)
+    report_metrics(lambda msg: print(msg, end=""), run_options.get("metrics_json"), run_options.get("metrics_prom"))
+    print(f"📤 Wrote {count} unique businesses to {args.output} and the per-query report to {report_path}")
+    if any(entry["status"] == "failed" for entry in report):
+        sys.exit(1)
+
+def tiles_command(args, run_options, filter_options):
+    """Non-interactive `tiles` subcommand: covers a map area tile by tile, past the per-search result cap."""
+    from readiness import readiness
+    from tiles import parse_bounds, parse_grid, plan_tiles, run_tiles, format_report as format_tile_report, \
+        write_report as write_tile_report
+
+    try:
+        tiles = plan_tiles(parse_bounds(args.bounds), *parse_grid(args.grid))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    stop_event = threading.Event()
+
+    print(f"🗺️ Searching '{args.query}' in {len(tiles)} tiles, {args.concurrency} at a time "
+          f"(split when {args.cap} places are listed, up to {args.max_depth} times)")
+    readiness.start_run()
+    metrics.start_run(query=args.query, tiles=len(tiles), mode=run_options.get("mode"), engine=run_options.get("engine"))
+    log_lock = threading.Lock()
+
+    def log(msg):
+        with log_lock:
+            print(msg, end="")
+
+    options = {k: v for k, v in run_options.items() if k not in ("filters", "metrics_json", "metrics_prom")}
+    try:
+        records, report = run_tiles(
+            args.query,
+            tiles,
+            run_extraction,
+            lambda: build_filters(**filter_options),
+            cap=args.cap,
+            max_depth=args.max_depth,
+            concurrency=args.concurrency,
+            retries=args.retries,
+            retry_delay=args.retry_delay,
+            resume=args.resume,
+            log=log,
+            stop_flag_func=stop_event.is_set,
+            request_stop=stop_event.set,
+            stop_event=stop_event,
+            **options
+        )
+    except KeyboardInterrupt:
+        print("\n🛑 Tiling interrupted. Run it again with --resume to continue the unfinished tiles.")
+        sys.exit(130)
+
+    count = export_records(records, args.output)
+    report_path = args.report or os.path.splitext(args.output)[0] + ".tiles.json"
+    write_tile_report(report, report_path)
+    print(format_tile_report(report), end="")
+    metrics.update_info(businesses=count, tiles=len(report))
+    report_metrics(lambda msg: print(msg, end=""), run_options.get("metrics_json"), run_options.get("metrics_prom"))
+    print(f"📤 Wrote {count} unique businesses to {args.output} and the per-tile report to {report_path}")
+    if any(entry["status"] == "failed" for entry in report):
+        sys.exit(1)
 
 def show_about():
+    from tkinter import Toplevel, Label
+
     about = Toplevel()
     about.title("About")
     about.geometry("400x200")
     Label(about, text="Google Maps Business Scraper", font=("Arial", 14, "bold")).pack(pady=10)
     Label(about, text="By Muhidtech\n\nScrapes business info from Google Maps.\nSupports CLI and GUI.\n\n© 2025", justify="center").pack(pady=10)
 
-def launch_gui():
-    global stop_flag, pause_flag
+def launch_gui(run_options=None):
+    from tkinter import Tk, Entry, Button, Text, Scrollbar, Label, END, DISABLED, Frame
+    from views import LogView, SavedTable
+
+    run_options = run_options or {}
     root = Tk()
     root.title("Google Maps Business Scraper")
     root.geometry("900x750")
@@ -180,47 +406,74 @@ def launch_gui():
     scrollbar = Scrollbar(root, command=text_area.yview)
     text_area.configure(yscrollcommand=scrollbar.set)
     scrollbar.pack(side="right", fill="y")
+    log_view = LogView(text_area)
 
     # ==== Button Frame ====
     button_frame = Frame(root, bg="#181818")
     button_frame.pack(pady=5)
 
+    # Stop / pause events of the latest run; each run gets its own pair, so stopping one never
+    # leaks into the next.
+    controls = {"stop_event": threading.Event(), "pause_event": threading.Event()}
+
+    def new_run_controls():
+        controls.update(stop_event=threading.Event(), pause_event=threading.Event())
+        pause_button.config(text="Pause")
+        return dict(controls)
+
     def start_scrape_thread():
         query = query_entry.get().strip()
         max_results_raw = max_results_entry.get().strip()
         if not query:
-            text_area.config(state=NORMAL)
-            text_area.insert(END, "⚠️ Please enter a search query.\n")
-            text_area.config(state=DISABLED)
+            log_view.write("⚠️ Please enter a search query.\n")
             return
         try:
             max_results = int(max_results_raw)
         except ValueError:
-            text_area.config(state=NORMAL)
-            text_area.insert(END, "⚠️ Max results must be a number.\n")
-            text_area.config(state=DISABLED)
+            log_view.write("⚠️ Max results must be a number.\n")
             return
 
-        text_area.config(state=NORMAL)
-        text_area.delete("1.0", END)
-        text_area.config(state=DISABLED)
+        log_view.clear()
 
-        thread = threading.Thread(target=run_extraction, args=(query, max_results, text_area))
+        kwargs = dict(run_options, log_func=log_view.write, keep_results=False, **new_run_controls())
+        thread = threading.Thread(target=run_extraction, args=(query, max_results), kwargs=kwargs)
+        thread.start()
+
+    def resume_scrape_thread():
+        query = query_entry.get().strip()
+        runs = [run for run in list_checkpoints() if not query or run["query"] == query]
+        if not runs:
+            log_view.write(f"⚠️ No interrupted run{' for ' + query if query else ''} to resume.\n")
+            return
+        run = runs[0]
+        max_results = run["settings"].get("max_results", 3)
+        query_entry.delete(0, END)
+        query_entry.insert(0, run["query"])
+        max_results_entry.delete(0, END)
+        max_results_entry.insert(0, str(max_results))
+
+        log_view.clear()
+
+        log_view.write(f"▶️ Resuming {describe_run(run)}\n")
+        kwargs = dict(resume_options(run, run_options), resume=True, log_func=log_view.write, keep_results=False,
+                      **new_run_controls())
+        thread = threading.Thread(target=run_extraction, args=(run["settings"].get("query", run["query"]), max_results),
+                                  kwargs=kwargs)
         thread.start()
 
     def stop_scraping():
-        global stop_flag
-        stop_flag = True
+        controls["stop_event"].set()
 
     def toggle_pause():
-        global pause_flag
-        pause_flag = not pause_flag
-        pause_button.config(text="Resume" if pause_flag else "Pause")
+        pause = controls["pause_event"]
+        if pause.is_set():
+            pause.clear()
+        else:
+            pause.set()
+        pause_button.config(text="Resume" if pause.is_set() else "Pause")
 
     def clear_output():
-        text_area.config(state=NORMAL)
-        text_area.delete("1.0", END)
-        text_area.config(state=DISABLED)
+        log_view.clear()
 
     # ==== Buttons with improved visuals ====
     btn_opts = {"bg": "#2d2d2d", "fg": "white", "activebackground": "#444", "activeforeground": "#fff", "width": 14, "font": ("Arial", 10, "bold")}
@@ -229,28 +482,37 @@ def launch_gui():
     pause_button = Button(button_frame, text="Pause", command=toggle_pause, **btn_opts)
     pause_button.grid(row=0, column=2, padx=5)
     Button(button_frame, text="Clear", command=clear_output, **btn_opts).grid(row=0, column=3, padx=5)
-    Button(button_frame, text="Show Saved", command=lambda: show_saved_json(text_area), **btn_opts).grid(row=0, column=4, padx=5)
-    Button(button_frame, text="Export to CSV", command=export_to_csv, **btn_opts).grid(row=0, column=5, padx=5)
+    Button(button_frame, text="Show Saved", command=lambda: SavedTable(root), **btn_opts).grid(row=0, column=4, padx=5)
+    Button(button_frame, text="Export to CSV", command=lambda: export_to_csv(widget=text_area), **btn_opts).grid(row=0, column=5, padx=5)
     Button(button_frame, text="About", command=show_about, **btn_opts).grid(row=0, column=6, padx=5)
+    Button(button_frame, text="Resume Run", command=resume_scrape_thread, **btn_opts).grid(row=1, column=0, padx=5, pady=5)
 
     root.mainloop()
 
-def launch_cli():
+def launch_cli(run_options=None):
+    run_options = run_options or {}
     print("=== Google Maps Business Scraper CLI ===")
     print("Type 'help' for commands. Ctrl+C or 'exit' to quit.\n")
     while True:
         try:
-            cmd = input("Command (search/show/clear/exit/help): ").strip().lower()
+            cmd = input("Command (search/resume/show/clear/export/exit/help): ").strip().lower()
             if cmd in ("exit", "quit"):
                 print("Bye!")
                 break
             elif cmd == "help":
-                print("Commands:\n  search - Start a new search\n  show - Show saved businesses\n  clear - Clear saved businesses\n  exit - Quit\n")
+                print("Commands:\n  search - Start a new search\n  resume - Continue an interrupted search\n  show - Show saved businesses\n  clear - Clear saved businesses\n  export - Export saved businesses to a JSON file\n  exit - Quit\n")
             elif cmd == "show":
                 show_saved_json(log_func=lambda msg: print(msg, end=""))
             elif cmd == "clear":
-                open("businesses.json", "w", encoding="utf-8").write("[]")
+                get_store().clear()
                 print("Cleared saved businesses.\n")
+            elif cmd == "export":
+                path = input("Output file, .json/.csv/.jsonl/.parquet (default businesses.json): ").strip() or "businesses.json"
+                if guess_format(path) == "json":
+                    count = get_store().export_json(path)
+                else:
+                    count = export_records(get_store().iter_records(), path)
+                print(f"Exported {count} businesses to {path}\n")
             elif cmd == "search":
                 query = input("Enter search query: ").strip()
                 if not query:
@@ -261,7 +523,24 @@ def launch_cli():
                 except ValueError:
                     print("Invalid number.\n")
                     continue
-                run_extraction(query, max_results, log_func=lambda msg: print(msg, end=""))
+                run_extraction(query, max_results, log_func=lambda msg: print(msg, end=""), keep_results=False,
+                               **run_options)
+            elif cmd == "resume":
+                runs = list_checkpoints()
+                if not runs:
+                    print("No interrupted searches to resume.\n")
+                    continue
+                for i, run in enumerate(runs, start=1):
+                    print(f"  {i}. {describe_run(run)}")
+                try:
+                    run = runs[int(input("Search to resume (default 1): ").strip() or "1") - 1]
+                except (ValueError, IndexError):
+                    print("Invalid choice.\n")
+                    continue
+                max_results = run["settings"].get("max_results", 10)
+                run_extraction(run["settings"].get("query", run["query"]), max_results,
+                               log_func=lambda msg: print(msg, end=""), resume=True, keep_results=False,
+                               **resume_options(run, run_options))
             else:
                 print("Unknown command. Type 'help' for options.\n")
         except KeyboardInterrupt:
@@ -271,12 +550,104 @@ def launch_cli():
 def main():
     parser = argparse.ArgumentParser(description="Google Maps Business Scraper")
     parser.add_argument("-t", "--type", choices=["gui", "cli"], default="gui", help="Interface type: gui or cli (default: gui)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of parallel browser workers (default: 1)")
+    parser.add_argument("-m", "--mode", choices=["panel", "list"], default="panel",
+                        help="panel: open every place; list: read result cards and open places only when fields are missing")
+    parser.add_argument("--require-fields", default="phone",
+                        help="List mode: comma-separated fields that trigger opening the place panel when missing (default: phone)")
+    parser.add_argument("--include-websites", action="store_true", help="Keep businesses that have a website")
+    parser.add_argument("--require-phone", action="store_true", help="Only keep businesses with a phone number")
+    parser.add_argument("--address-contains", metavar="TEXT", help="Only keep businesses whose address contains TEXT")
+    parser.add_argument("--name-contains", metavar="TEXT", help="Only open businesses whose name contains TEXT")
+    parser.add_argument("-e", "--engine", choices=["browser", "http"], default="browser",
+                        help="browser: drive Chrome; http: read results over pooled HTTP without a browser")
+    parser.add_argument("--crawl-contacts", action="store_true",
+                        help="Crawl each business's website and social pages for emails and phones")
+    parser.add_argument("--lean", action="store_true",
+                        help="Block images, fonts, media and map tiles in the browser to cut page weight")
+    parser.add_argument("--metrics-json", metavar="PATH", help="Write per-stage timings of each run as JSON to PATH")
+    parser.add_argument("--metrics-prom", metavar="PATH",
+                        help="Write per-stage p50/p95/p99 timings in Prometheus text format to PATH (node_exporter textfile)")
+    subparsers = parser.add_subparsers(dest="command")
+    export_parser = subparsers.add_parser("export", help="Export saved businesses without the GUI or interactive CLI")
+    export_parser.add_argument("-o", "--output", required=True, help="Output file")
+    export_parser.add_argument("-f", "--format", choices=FORMATS, help="Output format (default: from the file extension)")
+    export_parser.add_argument("--fields", help=f"Comma-separated columns (default: {','.join(DEFAULT_FIELDS)})")
+    export_parser.add_argument("--where", action="append", metavar="COND", help="Row filter such as phone!=N/A or address~Accra (repeatable)")
+    export_parser.add_argument("--store", default=STORE_FILE, help=f"Result store to read (default: {STORE_FILE})")
+    export_parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per write batch (default: 1000)")
+    dedupe_parser = subparsers.add_parser("dedupe", help="Merge near-duplicate businesses already in the store")
+    dedupe_parser.add_argument("--store", default=STORE_FILE, help=f"Result store to clean (default: {STORE_FILE})")
+    dedupe_parser.add_argument("--report", metavar="PATH", help="Write every merge decision as JSON Lines to PATH")
+    dedupe_parser.add_argument("--dry-run", action="store_true", help="Only report what would be merged")
+    batch_parser = subparsers.add_parser("batch", help="Run every query in a file and write one consolidated output")
+    batch_parser.add_argument("queries", help="Queries file: one query per line, optionally 'query | max_results' (or .jsonl)")
+    batch_parser.add_argument("-o", "--output", required=True, help="Consolidated output file (.csv, .jsonl, .json, .parquet)")
+    batch_parser.add_argument("--report", help="Per-query report file (default: <output>.report.json)")
+    batch_parser.add_argument("--max-results", type=int, default=DEFAULT_MAX_RESULTS,
+                              help=f"Max results for queries that do not set their own (default: {DEFAULT_MAX_RESULTS})")
+    batch_parser.add_argument("-c", "--concurrency", type=int, default=1, help="Queries to run at the same time (default: 1)")
+    batch_parser.add_argument("--retries", type=int, default=2, help="Retries per failed query (default: 2)")
+    batch_parser.add_argument("--retry-delay", type=float, default=5.0, help="Seconds before the first retry, doubled each time (default: 5)")
+    batch_parser.add_argument("--resume", action="store_true", help="Continue queries from their checkpoints")
+    tiles_parser = subparsers.add_parser("tiles", help="Cover a map area tile by tile, past the ~120 results one search returns")
+    tiles_parser.add_argument("query", help="What to search for in each tile, without a place name (e.g. 'restaurants')")
+    tiles_parser.add_argument("--bounds", required=True, metavar="S,W,N,E",
+                              help="Area to cover in degrees: south,west,north,east (e.g. 5.52,-0.30,5.68,-0.12); "
+                                   "write --bounds=-1.35,36.70,... when south is negative")
+    tiles_parser.add_argument("-o", "--output", required=True, help="Merged output file (.csv, .jsonl, .json, .parquet)")
+    tiles_parser.add_argument("--report", help="Per-tile coverage report (default: <output>.tiles.json)")
+    tiles_parser.add_argument("--grid", default="2x2", metavar="ROWSxCOLS", help="Starting grid (default: 2x2)")
+    tiles_parser.add_argument("--cap", type=int, default=RESULT_CAP,
+                              help=f"Places listed at which a tile counts as cut off and is split (default: {RESULT_CAP})")
+    tiles_parser.add_argument("--max-depth", type=int, default=MAX_DEPTH,
+                              help=f"How many times a tile may be split into quarters (default: {MAX_DEPTH})")
+    tiles_parser.add_argument("-c", "--concurrency", type=int, default=1, help="Tiles to search at the same time (default: 1)")
+    tiles_parser.add_argument("--retries", type=int, default=2, help="Retries per failed tile (default: 2)")
+    tiles_parser.add_argument("--retry-delay", type=float, default=5.0, help="Seconds before the first retry, doubled each time (default: 5)")
+    tiles_parser.add_argument("--resume", action="store_true", help="Continue tiles from their checkpoints")
     args = parser.parse_args()
-
-    if args.type == "cli":
-        launch_cli()
+    if args.command == "export":
+        export_command(args)
+        return
+    if args.command == "dedupe":
+        dedupe_command(args)
+        return
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    concurrency = args.concurrency if args.command in ("batch", "tiles") else 1
+    if concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    driver_manager.lean = args.lean
+    if args.crawl_contacts:
+        from contacts import contact_crawler
+        contact_crawler.enabled = True
+    # Keep the search browser and every worker warm between searches.
+    driver_manager.max_idle = (args.workers + 1) * concurrency
+
+    filter_options = {
+        "include_websites": args.include_websites,
+        "require_phone": args.require_phone,
+        "address_text": args.address_contains,
+        "name_text": args.name_contains,
+    }
+    run_options = {
+        "workers": args.workers,
+        "filters": build_filters(**filter_options),
+        "mode": args.mode,
+        "required_fields": tuple(f.strip() for f in args.require_fields.split(",") if f.strip()),
+        "metrics_json": args.metrics_json,
+        "metrics_prom": args.metrics_prom,
+        "engine": args.engine,
+    }
+    if args.command == "batch":
+        batch_command(args, run_options, filter_options)
+    elif args.command == "tiles":
+        tiles_command(args, run_options, filter_options)
+    elif args.type == "cli":
+        launch_cli(run_options)
     else:
-        launch_gui()
+        launch_gui(run_options)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
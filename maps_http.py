@@ -0,0 +1,175 @@
+import json
+import math
+import re
+import threading
+import urllib.parse
+from typing import Any, Dict, List, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Endpoint the Maps web client calls for a page of search results. The response is JSON
+# (behind an anti-XSSI prefix) holding every place's name, address, phone and website, so
+# one request replaces scrolling the feed and opening each place's panel.
+SEARCH_URL = "https://www.google.com/search"
+PAGE_SIZE = 20
+# Protobuf-style parameters the web client sends: viewport camera distance in metres (!1d),
+# centre longitude and latitude (!2d, !3d; 0,0 lets the query's own location decide the area),
+# viewport size in pixels, field of view (!4f), results per page (!7i) and offset (!8i).
+SEARCH_PB = ("!4m8!1m3!1d{distance}!2d{lng}!3d{lat}!3m2!1i1024!2i768!4f13.1"
+             "!7i{page_size}!8i{offset}!10b1")
+DEFAULT_DISTANCE = 50000
+VIEWPORT_PX = (1024, 768)
+FIELD_OF_VIEW = 13.1
+# Metres per pixel at zoom 0 on the equator (256-pixel Web Mercator tiles).
+METRES_PER_PIXEL_Z0 = 156543.03392
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"),
+    "Accept-Language": "en-US,en;q=0.9",
+}
+XSSI_PREFIX = ")]}'"
+
+# Where each field sits in a place entry of the search payload. The payload is positional and
+# undocumented; keeping every index here means a layout change is fixed in one place.
+PLACE_PATH = (14,)
+PLACE_FIELDS = {
+    "name": (11,),
+    "address": (39,),
+    "address_lines": (2,),
+    "phone": (178, 0, 0),
+    "website": (7, 0),
+    "feature_id": (10,),
+    "category": (13, 0),
+    "rating": (4, 7),
+    "reviews": (4, 8),
+    "place_id": (78,),
+}
+# What each field holds when present. A value of another type means the layout moved, and the
+# page is rejected instead of yielding records with fields silently read from the wrong slot.
+PLACE_FIELD_TYPES = {
+    "name": str,
+    "address": str,
+    "address_lines": list,
+    "phone": str,
+    "website": str,
+    "feature_id": str,
+    "category": str,
+    "rating": (int, float),
+    "reviews": int,
+    "place_id": str,
+}
+# Every place in a results page has these.
+REQUIRED_PLACE_FIELDS = ("name", "feature_id")
+FEATURE_ID_RE = re.compile(r"^0x[0-9a-f]+:0x[0-9a-f]+$", re.IGNORECASE)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def make_session(pool_size: int = 10, retries: int = 3) -> requests.Session:
+    """A keep-alive session with `pool_size` pooled connections; 429/5xx answers are retried with backoff."""
+    retry = Retry(total=retries, backoff_factor=1.0, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET",), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+def get_session() -> requests.Session:
+    """Shared pooled session, so concurrent runs reuse warm connections."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+        return _session
+
+def viewport_distance(lat: float, zoom: float) -> float:
+    """Camera distance (metres) at which the client's viewport shows what a `zoom` map shows at `lat`."""
+    width = VIEWPORT_PX[0] * METRES_PER_PIXEL_Z0 * math.cos(math.radians(lat)) / 2 ** zoom
+    return width / 2 / math.tan(math.radians(FIELD_OF_VIEW / 2))
+
+def search_params(query: str, offset: int = 0, page_size: int = PAGE_SIZE, hl: str = "en",
+                  viewport: Optional[Sequence[float]] = None) -> Dict[str, str]:
+    """Query string for one results page; `viewport` (lat, lng, zoom) limits the search to that map view."""
+    if viewport is None:
+        camera = {"distance": DEFAULT_DISTANCE, "lat": 0, "lng": 0}
+    else:
+        lat, lng, zoom = viewport
+        camera = {"distance": round(viewport_distance(lat, zoom), 1), "lat": lat, "lng": lng}
+    return {
+        "tbm": "map",
+        "authuser": "0",
+        "hl": hl,
+        "q": query,
+        "pb": SEARCH_PB.format(page_size=page_size, offset=offset, **camera),
+    }
+
+def _strip_xssi(text: str) -> str:
+    text = text.lstrip()
+    return text[len(XSSI_PREFIX):].lstrip() if text.startswith(XSSI_PREFIX) else text
+
+def load_payload(text: str) -> Any:
+    """
+    Decodes a search response. Older responses are the prefixed JSON array itself; newer ones
+    wrap it as {"c": 0, "d": "<prefixed JSON>"} followed by a /*""*/ trailer.
+    """
+    text = _strip_xssi(text)
+    if text.startswith("{"):
+        text = text[:text.rindex("}") + 1]
+        text = _strip_xssi(json.loads(text)["d"])
+    return json.loads(text)
+
+def _get(data: Any, path) -> Any:
+    for index in path:
+        if not isinstance(data, list) or index >= len(data):
+            return None
+        data = data[index]
+    return data
+
+def check_place(place: List[Any]):
+    """Raises ValueError when a place entry does not have the layout PLACE_FIELDS describes."""
+    for name, path in PLACE_FIELDS.items():
+        value = _get(place, path)
+        if value is None:
+            if name in REQUIRED_PLACE_FIELDS:
+                raise ValueError(f"search payload layout changed: no {name} at {list(path)}")
+        elif not isinstance(value, PLACE_FIELD_TYPES[name]) or isinstance(value, bool):
+            raise ValueError(f"search payload layout changed: {name} at {list(path)} is {value!r:.60}")
+    if not FEATURE_ID_RE.match(_get(place, PLACE_FIELDS["feature_id"])):
+        raise ValueError("search payload layout changed: feature_id at "
+                         f"{list(PLACE_FIELDS['feature_id'])} is {_get(place, PLACE_FIELDS['feature_id'])!r:.60}")
+
+def parse_search_payload(payload: Any) -> List[List[Any]]:
+    """
+    The place entries of one results page (empty past the last page). Raises ValueError when a
+    place entry does not match PLACE_FIELDS, so a layout change fails the run loudly.
+    """
+    places = []
+    for entry in _get(payload, (0, 1)) or []:
+        place = _get(entry, PLACE_PATH)
+        if isinstance(place, list):
+            check_place(place)
+            places.append(place)
+    return places
+
+def place_fields(place: List[Any]) -> Dict[str, Any]:
+    """Raw field values of a place entry (None when missing)."""
+    fields = {name: _get(place, path) for name, path in PLACE_FIELDS.items()}
+    if not fields["address"] and isinstance(fields["address_lines"], list):
+        fields["address"] = ", ".join(str(line) for line in fields["address_lines"] if line)
+    website = fields["website"]
+    if isinstance(website, str) and website.startswith("/url?"):
+        # Outbound links are wrapped in Google's redirector: /url?q=<target>&...
+        fields["website"] = urllib.parse.parse_qs(urllib.parse.urlsplit(website).query).get("q", [None])[0]
+    return fields
+
+def fetch_search_page(session: requests.Session, query: str, offset: int = 0, page_size: int = PAGE_SIZE,
+                      timeout: float = 20.0, viewport: Optional[Sequence[float]] = None) -> List[List[Any]]:
+    """Fetches and parses one results page. Raises requests.RequestException / ValueError on failure."""
+    response = session.get(SEARCH_URL, params=search_params(query, offset, page_size, viewport=viewport),
+                           timeout=timeout)
+    response.raise_for_status()
+    return parse_search_payload(load_payload(response.text))
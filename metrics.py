@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+# Stages in the order a run reaches them.
+DRIVER_STARTUP = "driver_startup"  # launching Chrome, including ChromeDriverManager().install() on first use
+PAGE_LOAD = "page_load"            # search URL until the first result card is present
+FETCH = "fetch"                    # one HTTP request for a page of search results (http engine)
+DISCOVER = "discover"              # reading the loaded result cards
+SCROLL = "scroll"                  # scrolling the results feed and waiting for more cards
+CLICK = "click"                    # opening a place
+PANEL_WAIT = "panel_wait"          # waiting for the place panel to settle
+EXTRACT = "extract"                # reading the panel text out of the browser
+PARSE = "parse"                    # turning detail text into a record
+SOCIAL = "social"                  # one Custom Search lookup (cache hits are not timed)
+CRAWL = "crawl"                    # one website / social page fetched for contact details
+SAVE = "save"                      # writing the run's records to the store
+STAGES = [DRIVER_STARTUP, PAGE_LOAD, FETCH, DISCOVER, SCROLL, CLICK, PANEL_WAIT, EXTRACT, PARSE, SOCIAL, CRAWL, SAVE]
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+Listener = Callable[[str, float], None]
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+class RunMetrics:
+    """
+    Per-stage timings for one scraping run. Every timed block is kept as a sample (so
+    p50/p95/p99 are exact) and handed to registered listeners as (stage, seconds).
+    Thread-safe; parallel workers and enrichment threads report into the same run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listeners: List[Listener] = []
+        self.start_run()
+
+    def start_run(self, **info):
+        """Clears the samples; `info` (query, mode, ...) is carried into the summary."""
+        with self._lock:
+            self._started = time.time()
+            self._perf_started = time.perf_counter()
+            self._samples: Dict[str, List[float]] = {}
+            self.info: Dict[str, Any] = dict(info)
+
+    def update_info(self, **info):
+        with self._lock:
+            self.info.update(info)
+
+    def add_listener(self, listener: Listener):
+        """Calls `listener(stage, seconds)` after every timed block, on the thread that ran it."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(stage, []).append(seconds)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(stage, seconds)
+            except Exception as e:
+                print(f"⚠️ Metrics listener failed: {e}")
+
+    @contextmanager
+    def stage(self, name: str):
+        """Times the enclosed block as one sample of stage `name` (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Any]:
+        """Run info plus count, total, max and p50/p95/p99 (seconds) per stage."""
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+            info = dict(self.info)
+            elapsed = time.perf_counter() - self._perf_started
+            started = self._started
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        stages = {}
+        for stage in sorted(samples, key=lambda s: (order.get(s, len(order)), s)):
+            values = samples[stage]
+            stages[stage] = {
+                "count": len(values),
+                "total": sum(values),
+                "max": values[-1],
+                **{f"p{int(q * 100)}": percentile(values, q) for q in QUANTILES},
+            }
+        return {"started": started, "elapsed": elapsed, "info": info, "stages": stages}
+
+    def format_report(self) -> str:
+        summary = self.summary()
+        lines = [f"📊 Stage timings ({summary['elapsed']:.1f}s run):"]
+        for stage, s in summary["stages"].items():
+            lines.append(
+                f"   {stage}: {s['count']} x, total {s['total']:.1f}s, p50 {s['p50'] * 1000:.0f} ms, "
+                f"p95 {s['p95'] * 1000:.0f} ms, p99 {s['p99'] * 1000:.0f} ms"
+            )
+        return "\n".join(lines) + "\n"
+
+def _write_atomic(path: str, text: str):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def write_json_summary(run_metrics: RunMetrics, path: str):
+    """Writes the run summary as JSON."""
+    _write_atomic(path, json.dumps(run_metrics.summary(), indent=2, ensure_ascii=False))
+
+def _label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_prometheus(run_metrics: RunMetrics, prefix: str = "getbusiness") -> str:
+    """Prometheus text exposition: a summary per stage plus run duration, size and end time."""
+    summary = run_metrics.summary()
+    lines = [
+        f"# HELP {prefix}_stage_seconds Time spent per scraping stage in the last run.",
+        f"# TYPE {prefix}_stage_seconds summary",
+    ]
+    for stage, s in summary["stages"].items():
+        for q in QUANTILES:
+            lines.append(f'{prefix}_stage_seconds{{stage="{_label(stage)}",quantile="{q}"}} {s[f"p{int(q * 100)}"]:.6f}')
+        lines.append(f'{prefix}_stage_seconds_sum{{stage="{_label(stage)}"}} {s["total"]:.6f}')
+        lines.append(f'{prefix}_stage_seconds_count{{stage="{_label(stage)}"}} {s["count"]}')
+    lines += [
+        f"# HELP {prefix}_run_duration_seconds Wall time of the last run.",
+        f"# TYPE {prefix}_run_duration_seconds gauge",
+        f"{prefix}_run_duration_seconds {summary['elapsed']:.3f}",
+        f"# HELP {prefix}_run_businesses Businesses collected in the last run.",
+        f"# TYPE {prefix}_run_businesses gauge",
+        f"{prefix}_run_businesses {summary['info'].get('businesses', 0)}",
+        f"# HELP {prefix}_run_last_timestamp_seconds Unix time the last run finished.",
+        f"# TYPE {prefix}_run_last_timestamp_seconds gauge",
+        f"{prefix}_run_last_timestamp_seconds {time.time():.0f}",
+    ]
+    return "\n".join(lines) + "\n"
+
+def write_prometheus_textfile(run_metrics: RunMetrics, path: str):
+    """Writes format_prometheus() atomically, for node_exporter's textfile collector."""
+    _write_atomic(path, format_prometheus(run_metrics))
+
+metrics = RunMetrics()
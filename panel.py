@@ -0,0 +1,116 @@
+from typing import Any, Dict, Optional
+
+from bs4 import BeautifulSoup
+
+from parsing import parse_details
+
+# lxml is optional and deliberately not in requirements.txt: BeautifulSoup parses the panel
+# (and crawled contact pages) faster with it (`pip install lxml`), and falls
+# back to the standard library's html.parser without it.
+try:
+    import lxml  # noqa: F401  (only probing for the faster BeautifulSoup backend)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+TEXT_CLASSES = ["fontBodyMedium", "fontBodySmall", "HlvSq", "UsdlK", "rogA2c"]
+
+# Runs in the page and returns only what the parser needs, instead of shipping the whole
+# panel innerHTML over the WebDriver wire. Mirrors parse_panel_html() below; panel_fields()
+# turns either result into record fields.
+PANEL_EXTRACT_JS = """
+const regions = document.querySelectorAll('div.m6QErb.XiKgde[role="region"]');
+if (regions.length < 2) return null;
+const panel = regions[1];
+const strings = el => {
+    const out = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        const t = walker.currentNode.nodeValue.trim();
+        if (t) out.push(t);
+    }
+    return out;
+};
+const attr = (selector, name) => {
+    const el = panel.querySelector(selector);
+    return el ? el.getAttribute(name) : null;
+};
+const texts = [];
+const seen = new Set();
+const add = t => { if (t && !seen.has(t)) { seen.add(t); texts.push(t); } };
+for (const cls of arguments[0]) {
+    panel.querySelectorAll('div.' + cls).forEach(el => add(strings(el).join(' ')));
+}
+panel.querySelectorAll('span').forEach(el => add(strings(el).join('')));
+return {
+    texts: texts,
+    fields: {
+        address: attr('[data-item-id="address"]', 'aria-label'),
+        plus_code: attr('[data-item-id="oloc"]', 'aria-label'),
+        phone: attr('[data-item-id^="phone:tel:"]', 'data-item-id'),
+        website: attr('a[data-item-id="authority"]', 'href')
+    }
+};
+"""
+
+def _strip_label(value: Optional[str]) -> Optional[str]:
+    """'Address: 12 Oxford St' -> '12 Oxford St' (aria-labels carry a field prefix)."""
+    if not value:
+        return None
+    head, sep, tail = value.partition(":")
+    return (tail if sep and len(head) < 20 else value).strip() or None
+
+def structured_fields(fields: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    """The panel's own data-item-id values as record fields; None where the panel has none."""
+    address = _strip_label(fields.get("address")) or _strip_label(fields.get("plus_code"))
+    phone = fields.get("phone")
+    phone = phone[len("phone:tel:"):] if phone and phone.startswith("phone:tel:") else None
+    website = fields.get("website")
+    website = website if website and website.startswith("http") else None
+    return {"address": address, "phone": phone or None, "website": website}
+
+def panel_fields(content: Optional[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """
+    Record fields from a panel read (a PANEL_EXTRACT_JS result or parse_panel_html()): the
+    structured values exactly as read, and parse_details() on the free text only for the
+    fields the panel did not mark up (always the email).
+    """
+    content = content or {}
+    found = structured_fields(content.get("fields") or {})
+    parsed = parse_details(content.get("texts") or ())
+    return {key: found.get(key) or value for key, value in parsed.items()}
+
+def parse_panel_html(panel_html: str) -> Dict[str, Any]:
+    """
+    The panel innerHTML read into the same {"texts", "fields"} shape PANEL_EXTRACT_JS returns,
+    using the fastest available BeautifulSoup backend.
+    """
+    soup = BeautifulSoup(panel_html, HTML_PARSER)
+
+    def attr(selector, name):
+        el = soup.select_one(selector)
+        return el.get(name) if el else None
+
+    fields = {
+        "address": attr('[data-item-id="address"]', "aria-label"),
+        "plus_code": attr('[data-item-id="oloc"]', "aria-label"),
+        "phone": attr('[data-item-id^="phone:tel:"]', "data-item-id"),
+        "website": attr('a[data-item-id="authority"]', "href"),
+    }
+
+    seen_texts = set()
+    extracted_texts = []
+    for class_name in TEXT_CLASSES:
+        for div in soup.find_all("div", class_=class_name):
+            text = div.get_text(separator=' ', strip=True)
+            if text and text not in seen_texts:
+                seen_texts.add(text)
+                extracted_texts.append(text)
+
+    for span in soup.find_all("span"):
+        text = span.get_text(strip=True)
+        if text and text not in seen_texts:
+            seen_texts.add(text)
+            extracted_texts.append(text)
+
+    return {"texts": extracted_texts, "fields": fields}
@@ -0,0 +1,101 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+SOCIAL_DOMAINS = {
+    "facebook.com", "instagram.com", "twitter.com", "x.com", "linkedin.com",
+    "youtube.com", "tiktok.com", "snapchat.com", "whatsapp.com", "gmail.com"
+}
+NON_SOCIAL_TLDS = ['.com', '.org', '.net', '.edu', '.ai', '.co', '.io', '.me', '.store', '.biz', '.gh', '.com.gh']
+SHORT_DOMAINS = {"bit.ly", "bitly.com", "tinyurl.com", "goo.gl", "t.co", "linktr.ee"}
+
+# One combined token pattern, tried left to right on each detail line. Emails come first so
+# the domain part of an address like info@shop.com is not also read as a website.
+TOKEN_RE = re.compile(
+    r"(?P<email>[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)"
+    r"|(?P<url>https?://[^\s]+|www\.[^\s]+|[a-zA-Z0-9-]+(?:\.(?:com|org|net|gh|co|io|ai|me|store|biz|edu))+(?:/[^\s]*)?)"
+    r"|(?P<phone>(?:\+233|0)[235][0-9][ -]?\d{3}[ -]?\d{4}|\+?\d{10,15})"
+)
+ADDRESS_RE = re.compile(
+    r"(?i:\b(?:Street|St|Ave|Rd|Junction|Accra|Tema|Kumasi|Plot|No\.|Close|Crescent)\b)"
+    r"|[A-Z0-9]{4,}\+[A-Z0-9]{2,}"
+)
+# Cheap prefilter: a line without any of these characters cannot hold a phone, email or URL.
+_TOKEN_HINT_RE = re.compile(r"[@.\d]")
+
+def is_social_media_link(text: str) -> bool:
+    if not text or not isinstance(text, str):
+        return False
+    lowered = text.lower()
+    return any(domain in lowered for domain in SOCIAL_DOMAINS)
+
+def is_non_social_website(text: str) -> bool:
+    if not text or not isinstance(text, str):
+        return False
+    if ' ' in text or is_social_media_link(text):
+        return False
+    lowered = text.lower()
+    return any(tld in lowered for tld in NON_SOCIAL_TLDS)
+
+def has_non_social_website(texts: List[str]) -> bool:
+    if not isinstance(texts, list):
+        return False
+    for text in texts:
+        if is_non_social_website(text):
+            return True
+    return False
+
+def parse_details(details: Optional[Iterable[str]]) -> Dict[str, Optional[str]]:
+    """
+    Classifies panel detail lines in a single pass.
+    Returns the first phone, email, website and address found (None when missing);
+    scanning stops as soon as all four are known.
+    """
+    phone = email = website = address = None
+    for text in details or ():
+        if not isinstance(text, str):
+            continue
+        if address is None and ADDRESS_RE.search(text):
+            address = text
+        if (phone is None or email is None or website is None) and _TOKEN_HINT_RE.search(text):
+            for match in TOKEN_RE.finditer(text):
+                kind = match.lastgroup
+                value = match.group(kind)
+                if kind == "phone":
+                    phone = phone or value
+                elif kind == "email":
+                    email = email or value
+                elif website is None and is_non_social_website(value):
+                    website = value if value.startswith("http") else "https://" + value
+        if phone and email and website and address:
+            break
+    return {"phone": phone, "email": email, "website": website, "address": address}
+
+def to_record(name: str, fields: Dict[str, Optional[str]], social_links: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Business record in the shape saved to the store."""
+    return {
+        "name": name,
+        "address": fields["address"] or "N/A",
+        "phone": fields["phone"] or "N/A",
+        "email": fields["email"] or "N/A",
+        "website": fields["website"] or "N/A",
+        "social_links": social_links or {},
+    }
+
+def parse_details_batch(details_lists: Iterable[Optional[Iterable[str]]]) -> List[Dict[str, Optional[str]]]:
+    """parse_details over many detail lists, e.g. when re-parsing an archive offline."""
+    return [parse_details(details) for details in details_lists]
+
+def reparse_records(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rebuilds records from their stored `details` text, keeping any social links already found.
+    Records without `details` are passed through unchanged.
+    """
+    reparsed = []
+    for biz in records:
+        if not biz.get("details"):
+            reparsed.append(biz)
+            continue
+        record = to_record(biz.get("name", ""), parse_details(biz["details"]), biz.get("social_links"))
+        record["details"] = biz["details"]
+        reparsed.append(record)
+    return reparsed
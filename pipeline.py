@@ -0,0 +1,88 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+# Stages in the order a record reaches them. "card" predicates only see the card name and
+# place_key (dedupe.place_key) and run before the panel is opened; "parsed" predicates see
+# the parsed record and run before the costly social enrichment.
+CARD = "card"
+PARSED = "parsed"
+
+def no_website(biz: Dict[str, Any]) -> bool:
+    return not biz.get("website") or biz.get("website") == "N/A"
+
+def has_phone(biz: Dict[str, Any]) -> bool:
+    return bool(biz.get("phone")) and biz.get("phone") != "N/A"
+
+def address_contains(text: str) -> Predicate:
+    needle = text.casefold()
+    return lambda biz: needle in (biz.get("address") or "").casefold()
+
+def name_contains(text: str) -> Predicate:
+    needle = text.casefold()
+    return lambda biz: needle in (biz.get("name") or "").casefold()
+
+class FilterPipeline:
+    """
+    Ordered, named predicates applied lazily: a record stops at the first predicate it
+    fails, so later (and more expensive) stages only ever see survivors.
+    Keeps per-stage counters of records seen and dropped.
+    """
+
+    def __init__(self, filters: Optional[List[Tuple[str, str, Predicate]]] = None):
+        self.filters = list(filters or [])
+        self._lock = threading.Lock()
+        self.reset()
+
+    def add(self, stage: str, name: str, predicate: Predicate) -> "FilterPipeline":
+        self.filters.append((stage, name, predicate))
+        with self._lock:
+            self.counters.setdefault(name, {"stage": stage, "seen": 0, "dropped": 0})
+        return self
+
+    def reset(self):
+        with self._lock:
+            self.counters = {name: {"stage": stage, "seen": 0, "dropped": 0} for stage, name, _ in self.filters}
+            self.enriched = 0
+
+    def accepts(self, stage: str, biz: Dict[str, Any]) -> bool:
+        """Runs the predicates of `stage` in order; False as soon as one drops the record."""
+        for filter_stage, name, predicate in self.filters:
+            if filter_stage != stage:
+                continue
+            keep = predicate(biz)
+            with self._lock:
+                self.counters[name]["seen"] += 1
+                if not keep:
+                    self.counters[name]["dropped"] += 1
+            if not keep:
+                return False
+        return True
+
+    def count_enriched(self):
+        with self._lock:
+            self.enriched += 1
+
+    def format_report(self) -> str:
+        with self._lock:
+            counters = {name: dict(c) for name, c in self.counters.items()}
+            enriched = self.enriched
+        lines = ["🧮 Filter stages:"]
+        for name, c in counters.items():
+            lines.append(f"   [{c['stage']}] {name}: {c['seen']} seen, {c['dropped']} dropped")
+        lines.append(f"   [enrich] social lookups: {enriched}")
+        return "\n".join(lines) + "\n"
+
+def build_filters(include_websites=False, require_phone=False, address_text=None, name_text=None) -> FilterPipeline:
+    """Default pipeline: the optional card-name filter, then website presence and other cheap field checks."""
+    pipeline = FilterPipeline()
+    if name_text:
+        pipeline.add(CARD, f"name contains '{name_text}'", name_contains(name_text))
+    if not include_websites:
+        pipeline.add(PARSED, "no website", no_website)
+    if require_phone:
+        pipeline.add(PARSED, "has phone", has_phone)
+    if address_text:
+        pipeline.add(PARSED, f"address contains '{address_text}'", address_contains(address_text))
+    return pipeline
@@ -0,0 +1,189 @@
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, Callable
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+# One round-trip snapshot of the side panel: region count, size of the details
+# region and the title shown in the panel header.
+PANEL_STATE_JS = """
+const regions = document.querySelectorAll('div.m6QErb.XiKgde[role="region"]');
+const main = document.querySelector('div.m6QErb.WNBkOb.XiKgde[role="main"]');
+const title = document.querySelector('h1.DUwDvf');
+if (!main || regions.length < 2) return null;
+return {
+    size: regions[1].innerHTML.length,
+    text: regions[1].innerText.trim().length,
+    title: title ? title.textContent.trim() : ""
+};
+"""
+
+# Scrolls the results feed to its bottom, then resolves (execute_async_script) as soon as a
+# MutationObserver sees the feed hold more than arguments[0] cards, the end-of-list marker
+# appears, or arguments[1] ms pass. `found` is false when the feed element is missing.
+SCROLL_FEED_JS = """
+const done = arguments[arguments.length - 1];
+const previous = arguments[0];
+const feed = document.querySelector('div[role="feed"]')
+    || document.querySelector('div[role="main"] div[aria-label*="Results"]');
+const count = () => document.getElementsByClassName('Nv2PK').length;
+const atEnd = () => {
+    const marker = feed && feed.querySelector('div.PbZDve');
+    return !!(marker && marker.textContent.trim());
+};
+if (!feed) {
+    done({count: count(), end: false, found: false});
+    return;
+}
+let finished = false;
+let observer = null;
+let timer = null;
+const finish = () => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    done({count: count(), end: atEnd(), found: true});
+};
+const check = () => { if (count() > previous || atEnd()) finish(); };
+observer = new MutationObserver(check);
+observer.observe(feed, {childList: true, subtree: true});
+timer = setTimeout(finish, arguments[1]);
+feed.scrollTop = feed.scrollHeight;
+check();
+"""
+
+def _normalize_title(text: Optional[str]) -> str:
+    return " ".join((text or "").split()).casefold()
+
+class ReadinessEngine:
+    """
+    Waits on concrete DOM conditions instead of fixed sleeps.
+    Timeouts adapt per wait label from recent latencies, and the engine keeps a
+    per-run account of time spent waiting versus working (waits are summed
+    across worker threads, so "working" is a lower bound in parallel runs).
+    """
+
+    def __init__(self, min_timeout=2.0, max_timeout=15.0, history=30, poll=0.1, settle=0.25, headroom=3.0,
+                 ceilings: Optional[Dict[str, float]] = None):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        # Per-label upper bounds; an exhausted results list should not cost a full max_timeout.
+        self.ceilings = ceilings if ceilings is not None else {"scroll": 5.0}
+        self.history = history
+        self.poll = poll
+        self.settle = settle
+        self.headroom = headroom
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, deque] = {}
+        self.start_run()
+
+    def start_run(self):
+        """Resets the per-run wait accounting (learned latencies are kept)."""
+        with self._lock:
+            self._run_started = time.perf_counter()
+            self._waits: Dict[str, Dict[str, float]] = {}
+
+    def timeout_for(self, label: str) -> float:
+        """Adaptive timeout: headroom x p95 of recent latencies, clamped to [min, max]."""
+        ceiling = self.ceilings.get(label, self.max_timeout)
+        with self._lock:
+            samples = sorted(self._latencies.get(label, ()))
+        if len(samples) < 5:
+            return ceiling
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return max(self.min_timeout, min(ceiling, p95 * self.headroom))
+
+    def _record(self, label: str, elapsed: float, timed_out: bool):
+        with self._lock:
+            if not timed_out:
+                self._latencies.setdefault(label, deque(maxlen=self.history)).append(elapsed)
+            stats = self._waits.setdefault(label, {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+            stats["count"] += 1
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+            if timed_out:
+                stats["timeouts"] += 1
+
+    def wait_until(self, driver, condition: Callable[[Any], Any], label: str, timeout: Optional[float] = None):
+        """Polls `condition(driver)` until truthy. Returns its value, or None on timeout."""
+        timeout = timeout if timeout is not None else self.timeout_for(label)
+        started = time.perf_counter()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=self.poll).until(condition)
+        except TimeoutException:
+            self._record(label, time.perf_counter() - started, timed_out=True)
+            return None
+        self._record(label, time.perf_counter() - started, timed_out=False)
+        return result
+
+    def wait_for_panel(self, driver, name: Optional[str] = None) -> bool:
+        """
+        Waits until the second m6QErb.XiKgde region is populated, the panel title
+        matches `name` (when the title is present) and the region stops changing.
+        """
+        expected = _normalize_title(name)
+        last = {"size": None, "since": 0.0}
+
+        def panel_ready(drv):
+            state = drv.execute_script(PANEL_STATE_JS)
+            if not state or not state.get("text"):
+                return False
+            title = _normalize_title(state.get("title"))
+            if expected and title and title != expected:
+                return False
+            now = time.perf_counter()
+            if state["size"] != last["size"]:
+                last["size"], last["since"] = state["size"], now
+                return False
+            return now - last["since"] >= self.settle
+
+        return bool(self.wait_until(driver, panel_ready, "panel"))
+
+    def scroll_for_more_cards(self, driver, previous_count: int) -> Dict[str, Any]:
+        """
+        Scrolls the feed to the bottom and waits on a MutationObserver until it holds more
+        than `previous_count` cards or shows the end-of-list marker.
+        Returns {"count", "grew", "end", "found"}.
+        """
+        timeout = self.timeout_for("scroll")
+        started = time.perf_counter()
+        try:
+            result = driver.execute_async_script(SCROLL_FEED_JS, previous_count, int(timeout * 1000)) or {}
+        except TimeoutException:
+            result = {}
+        count = result.get("count") or 0
+        grew = count > previous_count
+        end = bool(result.get("end"))
+        self._record("scroll", time.perf_counter() - started, timed_out=not (grew or end))
+        return {"count": max(count, previous_count), "grew": grew, "end": end, "found": result.get("found", True)}
+
+    def report(self) -> Dict[str, Any]:
+        """Time spent waiting versus working since start_run(), with per-label breakdown."""
+        with self._lock:
+            elapsed = time.perf_counter() - self._run_started
+            waits = {label: dict(stats) for label, stats in self._waits.items()}
+        waiting = sum(stats["total"] for stats in waits.values())
+        for label, stats in waits.items():
+            stats["avg"] = stats["total"] / stats["count"] if stats["count"] else 0.0
+            stats["timeout"] = self.timeout_for(label)
+        return {
+            "elapsed": elapsed,
+            "waiting": waiting,
+            "working": max(0.0, elapsed - waiting),
+            "waits": waits,
+        }
+
+    def format_report(self) -> str:
+        rep = self.report()
+        lines = [f"⏱️ Waiting {rep['waiting']:.1f}s / working {rep['working']:.1f}s (elapsed {rep['elapsed']:.1f}s)"]
+        for label, stats in sorted(rep["waits"].items()):
+            lines.append(
+                f"   {label}: {stats['count']} waits, avg {stats['avg']:.2f}s, max {stats['max']:.2f}s, "
+                f"{stats['timeouts']} timeouts, next timeout {stats['timeout']:.1f}s"
+            )
+        return "\n".join(lines) + "\n"
+
+readiness = ReadinessEngine()
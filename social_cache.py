@@ -0,0 +1,133 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional, Any
+
+DAY = 24 * 60 * 60
+
+def normalize_business_name(name: str) -> str:
+    """Case-folds, strips punctuation and collapses whitespace so trivial spelling variants share a key."""
+    text = unicodedata.normalize("NFKC", name or "").casefold()
+    text = re.sub(r"[^\w&]+", " ", text)
+    return " ".join(text.split())
+
+class SocialCache:
+    """
+    On-disk cache for social link lookups, keyed by normalized business name plus query template.
+    Entries expire after `ttl` seconds ("no socials found" results after `negative_ttl`), and the
+    least recently used rows are evicted once the cache holds more than `max_entries` (checked every
+    500 writes, so it can briefly overshoot).
+    """
+
+    def __init__(self, path="social_cache.db", ttl=30 * DAY, negative_ttl=7 * DAY, max_entries=50000):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS social_links (
+                name TEXT NOT NULL,
+                template TEXT NOT NULL,
+                links TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (name, template)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_social_links_last_used ON social_links (last_used)")
+        self._conn.commit()
+
+    def get(self, business_name: str, template: str) -> Optional[Dict[str, str]]:
+        """Returns cached links ({} for a cached negative result), or None on a miss or expired entry."""
+        key = normalize_business_name(business_name)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT links, created FROM social_links WHERE name = ? AND template = ?", (key, template)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            links = json.loads(row[0])
+            ttl = self.ttl if links else self.negative_ttl
+            if now - row[1] > ttl:
+                self._conn.execute("DELETE FROM social_links WHERE name = ? AND template = ?", (key, template))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE social_links SET last_used = ? WHERE name = ? AND template = ?", (now, key, template)
+            )
+            self._conn.commit()
+            if links:
+                self.hits += 1
+            else:
+                self.negative_hits += 1
+            return links
+
+    def put(self, business_name: str, template: str, links: Dict[str, str]):
+        """Stores a lookup result; an empty dict is cached as a negative result."""
+        key = normalize_business_name(business_name)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO social_links (name, template, links, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, template, json.dumps(links or {}), now, now)
+            )
+            self._writes += 1
+            # Counting rows on every write would dominate a large run; trim every 500 writes instead.
+            if self._writes % 500 == 0:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM social_links").fetchone()
+                overflow = count - self.max_entries
+                if overflow > 0:
+                    self._conn.execute(
+                        "DELETE FROM social_links WHERE rowid IN "
+                        "(SELECT rowid FROM social_links ORDER BY last_used ASC LIMIT ?)", (overflow,)
+                    )
+                    self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM social_links")
+            self._conn.commit()
+
+    def reset_stats(self):
+        self.hits = self.negative_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM social_links").fetchone()
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": size,
+            "hit_rate": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        return (
+            f"🗃️ Social cache: {s['hits']} hits, {s['negative_hits']} negative hits, {s['misses']} misses "
+            f"({s['hit_rate']:.0%} hit rate), {s['size']} entries, {s['evictions']} evicted\n"
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
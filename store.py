@@ -0,0 +1,293 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from dedupe import DedupeIndex, fingerprint, identity_key, key_of, merge_records, decision
+
+STORE_FILE = "businesses.db"
+# Bumped whenever fingerprint() or identity keys change, so stores re-index themselves on open.
+DEDUPE_VERSION = "2"
+
+def record_key(biz: Dict[str, Any]) -> str:
+    """
+    Exact duplicate-check key for a business record ("" for a nameless one, which matches
+    nothing); near-duplicates are left to the dedupe index.
+    """
+    return identity_key(biz)
+
+def _row_key(fp: Dict[str, Any]) -> str:
+    """Value for the unique key column: the identity key, or a one-off key when there is none."""
+    return key_of(fp) or f"~{uuid.uuid4().hex}"
+
+def _paths(path: str):
+    """Maps a legacy `.json` output path to its store file, returning (db_path, legacy_json_path)."""
+    root, ext = os.path.splitext(path)
+    if ext.lower() == ".json":
+        return root + ".db", path
+    return path, root + ".json"
+
+class _StoreIndex(DedupeIndex):
+    """DedupeIndex whose blocks live in the store's dedupe_blocks table. Callers hold the store lock."""
+
+    # Fingerprints run to ~2 KB each, so a small cache keeps long runs flat; a miss is one indexed
+    # row read and a re-fingerprint, which costs about the same as the LRU bookkeeping.
+    def __init__(self, conn: sqlite3.Connection, cache_size: int = 5000, **kwargs):
+        super().__init__(**kwargs)
+        self._conn = conn
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        # Blocks only grow, so one that has outgrown max_block is never read again.
+        self._oversized = set()
+
+    def members(self, block: str) -> List[int]:
+        if block in self._oversized:
+            return []
+        ids = [row_id for (row_id,) in self._conn.execute(
+            "SELECT id FROM dedupe_blocks WHERE block = ? LIMIT ?", (block, self.max_block + 1))]
+        if len(ids) > self.max_block:
+            self._oversized.add(block)
+            return []
+        return ids
+
+    def record(self, ref: int) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT data FROM businesses WHERE id = ?", (ref,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def fingerprint_of(self, ref: int) -> Optional[Dict[str, Any]]:
+        fp = self._cache.get(ref)
+        if fp is None:
+            biz = self.record(ref)
+            if biz is None:
+                return None
+            fp = fingerprint(biz)
+            self._remember(ref, fp)
+        return fp
+
+    def _remember(self, ref: int, fp: Dict[str, Any]):
+        self._cache[ref] = fp
+        self._cache.move_to_end(ref)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def add(self, ref: int, fp: Dict[str, Any]):
+        self._remember(ref, fp)
+        self._conn.executemany("INSERT OR IGNORE INTO dedupe_blocks (block, id) VALUES (?, ?)",
+                               [(block, ref) for block in fp["blocks"]])
+
+    def reset(self):
+        self._cache.clear()
+        self._oversized.clear()
+        self._conn.execute("DELETE FROM dedupe_blocks")
+
+class BusinessStore:
+    """
+    SQLite-backed, append-only store of business records.
+    New records are checked against the store with the dedupe engine: an exact identity key hits
+    a unique index, near-duplicates are found through the dedupe_blocks index and merged into the
+    record already stored. Each batch is checked and committed in one write transaction, so several
+    processes can append to the same file, and WAL mode lets others read meanwhile. A legacy businesses.json next to the store is imported once on first open.
+    """
+
+    def __init__(self, path: str = STORE_FILE):
+        self.path, self.legacy_json = _paths(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS businesses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL UNIQUE,
+                    name TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    added REAL NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS dedupe_blocks (
+                    block TEXT NOT NULL,
+                    id INTEGER NOT NULL,
+                    PRIMARY KEY (block, id)
+                ) WITHOUT ROWID"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS dedupe_blocks_id ON dedupe_blocks (id)")
+        self._index = _StoreIndex(self._conn)
+        with self._lock:
+            version = self._conn.execute("SELECT value FROM meta WHERE key = 'dedupe_version'").fetchone()
+        if not version or version[0] != DEDUPE_VERSION:
+            self._reindex(merge=False)
+        self._import_legacy_json()
+
+    def _import_legacy_json(self):
+        with self._lock:
+            done = self._conn.execute("SELECT value FROM meta WHERE key = 'legacy_imported'").fetchone()
+        if done or not os.path.exists(self.legacy_json):
+            return
+        try:
+            with open(self.legacy_json, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not import {self.legacy_json}: {e}")
+            return
+        added = self.add_many(legacy if isinstance(legacy, list) else [])
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', ?)", (str(time.time()),))
+        if added:
+            print(f"📥 Imported {len(added)} businesses from {self.legacy_json}")
+
+    def contains(self, biz: Dict[str, Any]) -> bool:
+        key = record_key(biz)
+        if not key:
+            return False
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM businesses WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def add_many(self, businesses: Iterable[Dict[str, Any]],
+                 on_decision: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Appends records that do not match a stored business, in one transaction, and returns them.
+        A record that does match fills in the stored record's missing fields instead and is
+        reported to `on_decision` (see dedupe.decision).
+        """
+        now = time.time()
+        added = []
+        with self._lock, self._conn:
+            # Take the write lock before the first lookup: another process writing the same file
+            # then waits for this batch instead of inserting a key between its check and insert.
+            self._conn.execute("BEGIN IMMEDIATE")
+            for biz in businesses:
+                fp = fingerprint(biz)
+                key = key_of(fp)
+                row = self._conn.execute("SELECT id FROM businesses WHERE key = ?", (key,)).fetchone() if key else None
+                found = (row[0], 1.0, "same key") if row else self._index.match(fp)
+                if found is None:
+                    cur = self._conn.execute(
+                        "INSERT INTO businesses (key, name, data, added) VALUES (?, ?, ?, ?)",
+                        (_row_key(fp), biz.get("name", ""), json.dumps(biz, ensure_ascii=False), now)
+                    )
+                    self._index.add(cur.lastrowid, fp)
+                    added.append(biz)
+                    continue
+                ref, score, reason = found
+                self._merge_into(ref, biz, score, reason, on_decision)
+        return added
+
+    def _merge_into(self, ref: int, biz: Dict[str, Any], score: float, reason: str, on_decision=None):
+        stored = self._index.record(ref)
+        merged = merge_records(stored, biz)
+        if merged != stored:
+            self._conn.execute("UPDATE businesses SET data = ? WHERE id = ?",
+                               (json.dumps(merged, ensure_ascii=False), ref))
+            self._index.add(ref, fingerprint(merged))
+        if on_decision:
+            on_decision(decision(biz, stored, score, reason))
+
+    def deduplicate(self, on_decision: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, int]:
+        """
+        Offline pass over the whole store: rebuilds the dedupe index in insertion order and merges
+        every record that matches an earlier one into it. Returns {"records", "merged"}.
+        """
+        return self._reindex(merge=True, on_decision=on_decision)
+
+    def _reindex(self, merge: bool, on_decision=None, batch_size: int = 1000) -> Dict[str, int]:
+        stats = {"records": 0, "merged": 0}
+        last_id = 0
+        with self._lock:
+            with self._conn:
+                self._index.reset()
+            while True:
+                rows = self._conn.execute(
+                    "SELECT id, data FROM businesses WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                with self._conn:
+                    for row_id, data in rows:
+                        stats["records"] += 1
+                        biz = json.loads(data)
+                        fp = fingerprint(biz)
+                        found = self._index.match(fp) if merge else None
+                        if found is None:
+                            # Keys from an older scheme are rewritten; a clash leaves the old key in place.
+                            self._conn.execute("UPDATE OR IGNORE businesses SET key = ? WHERE id = ?", (_row_key(fp), row_id))
+                            self._index.add(row_id, fp)
+                            continue
+                        ref, score, reason = found
+                        self._conn.execute("DELETE FROM businesses WHERE id = ?", (row_id,))
+                        self._merge_into(ref, biz, score, reason, on_decision)
+                        stats["merged"] += 1
+                last_id = rows[-1][0]
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dedupe_version', ?)", (DEDUPE_VERSION,))
+        return stats
+
+    def count(self) -> int:
+        with self._lock:
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM businesses").fetchone()
+        return n
+
+    def iter_records(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yields stored records in insertion order, reading `batch_size` rows at a time."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, data FROM businesses WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row_id, data in rows:
+                yield json.loads(data)
+            last_id = rows[-1][0]
+
+    def page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """`limit` stored records starting at position `offset` in insertion order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM businesses ORDER BY id LIMIT ? OFFSET ?", (limit, max(0, offset))
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM businesses")
+            self._index.reset()
+            # Keep the legacy file from being re-imported into a store the user just emptied.
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', ?)", (str(time.time()),))
+
+    def export_json(self, path: str) -> int:
+        """Writes all records as a JSON array (the old businesses.json format). Returns the row count."""
+        tmp_path = path + ".tmp"
+        count = 0
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for biz in self.iter_records():
+                f.write(",\n" if count else "\n")
+                f.write(json.dumps(biz, indent=4, ensure_ascii=False))
+                count += 1
+            f.write("\n]" if count else "]")
+        os.replace(tmp_path, path)
+        return count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_stores: Dict[str, BusinessStore] = {}
+_stores_lock = threading.Lock()
+
+def get_store(path: Optional[str] = None) -> BusinessStore:
+    """Shared store per file, so repeated saves reuse one connection."""
+    db_path, _ = _paths(path or STORE_FILE)
+    with _stores_lock:
+        if db_path not in _stores:
+            _stores[db_path] = BusinessStore(path or STORE_FILE)
+        return _stores[db_path]
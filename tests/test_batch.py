@@ -0,0 +1,37 @@
+from batch import run_batch
+from pipeline import build_filters, CARD, PARSED
+
+# Businesses each query's fake search lists: two same-named branches and one place both queries find.
+LISTINGS = {
+    "pharmacies in Tema": [
+        {"name": "Ernest Chemists", "address": "Community 1, Tema", "phone": "030 220 0001"},
+        {"name": "Top Up Pharmacy", "address": "Spintex Road, Accra", "phone": "024 400 0002"},
+    ],
+    "pharmacies in Accra": [
+        {"name": "Ernest Chemists", "address": "Oxford Street, Osu, Accra", "phone": "030 270 0003"},
+        {"name": "Top Up Pharmacy", "address": "Spintex Road, Accra", "phone": "024 400 0002"},
+        {"name": "北京药房", "address": "N/A", "phone": "N/A"},
+    ],
+}
+
+def fake_run(query, max_results, filters, **kwargs):
+    records = []
+    for listed in LISTINGS[query]:
+        if not filters.accepts(CARD, {"name": listed["name"]}):
+            continue
+        biz = dict(listed, website="N/A", email="N/A", social_links={})
+        if filters.accepts(PARSED, biz):
+            records.append(biz)
+    return records
+
+def test_batch_keeps_same_named_branches_and_skips_shared_places():
+    jobs = [{"query": query, "max_results": 10} for query in LISTINGS]
+    records, report = run_batch(jobs, fake_run, lambda: build_filters(include_websites=True), log=lambda msg: None)
+    names = sorted((biz["name"], biz["address"]) for biz in records)
+    assert names == [
+        ("Ernest Chemists", "Community 1, Tema"),
+        ("Ernest Chemists", "Oxford Street, Osu, Accra"),
+        ("Top Up Pharmacy", "Spintex Road, Accra"),
+        ("北京药房", "N/A"),
+    ]
+    assert [entry["duplicates"] for entry in report] == [0, 1]
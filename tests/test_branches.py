@@ -0,0 +1,47 @@
+import contextlib
+import os
+
+import pytest
+
+import extract_businesses as eb
+from benchmarks.bench_scrape import offline_environment
+from benchmarks.fake_maps import FakeMaps, FakeMapsDriver, FakeMapsSession, FakeCSEService
+from dedupe import place_key
+from pipeline import build_filters
+from readiness import readiness
+
+def run_engine(engine, maps, max_results):
+    filters = build_filters(include_websites=True)
+    with offline_environment(FakeCSEService()), open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        readiness.start_run()
+        if engine == "http":
+            return list(eb.iter_http_businesses("bench", max_results, filters=filters, session=FakeMapsSession(maps)))
+        driver = FakeMapsDriver(maps)
+        driver.get("https://www.google.com/maps/search/bench")
+        if engine == "panel":
+            return list(eb.iter_panel_businesses(driver, max_results, filters=filters))
+        if engine == "list":
+            return list(eb.iter_list_businesses(driver, max_results, filters=filters))
+        return list(eb.iter_parallel_businesses(driver, lambda: FakeMapsDriver(maps), max_results, workers=3,
+                                                filters=filters))
+
+@pytest.mark.parametrize("engine", ["panel", "list", "http", "parallel"])
+def test_same_named_branches_in_one_search_are_all_kept(engine):
+    maps = FakeMaps(30, chain="KFC", chain_every=5)
+    records = run_engine(engine, maps, 30)
+    branches = [biz for biz in records if biz["name"] == "KFC"]
+    assert len(records) == 30
+    assert len(branches) == 6 and len({biz["address"] for biz in branches}) == 6
+
+def test_place_key_prefers_the_feature_id_in_the_url():
+    url = "https://www.google.com/maps/place/KFC/data=!4m7!3m6!1s0xfdf9b5e5c2b1a2d:0x1!8m2!3d5.6!4d-0.18?hl=en"
+    assert place_key({"name": "KFC", "url": url}) == "0xfdf9b5e5c2b1a2d:0x1"
+    assert place_key({"name": "KFC", "url": url.replace(":0x1", "%3A0x1")}) == "0xfdf9b5e5c2b1a2d:0x1"
+    assert place_key({"name": "KFC", "feature_id": "0xFDF9B5E5C2B1A2D:0x1", "place_id": "ChIJ1"}) == \
+        "0xfdf9b5e5c2b1a2d:0x1"
+    assert place_key({"name": "KFC", "place_id": "ChIJ1"}) == "id:ChIJ1"
+    assert place_key({"name": "KFC", "url": "https://www.google.com/maps/place/KFC?hl=en"}) == \
+        "url:https://www.google.com/maps/place/KFC"
+    assert place_key({"name": "KFC"}) == "name:KFC"
+    assert place_key({"name": ""}) == ""
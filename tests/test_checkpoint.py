@@ -0,0 +1,50 @@
+import contextlib
+import os
+import sqlite3
+
+import extract_businesses as eb
+from benchmarks.bench_scrape import offline_environment
+from benchmarks.fake_maps import FakeMaps, FakeMapsSession, FakeCSEService
+from checkpoint import RunCheckpoint, list_checkpoints
+from pipeline import build_filters
+from readiness import readiness
+
+def http_run(maps, max_results, checkpoint):
+    with offline_environment(FakeCSEService()), open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        readiness.start_run()
+        return list(eb.iter_http_businesses("bench", max_results, filters=build_filters(include_websites=True),
+                                            checkpoint=checkpoint, session=FakeMapsSession(maps), page_size=5))
+
+def test_resumed_run_keeps_branches_that_share_a_saved_name(tmp_path):
+    path = str(tmp_path / "checkpoint.db")
+    maps = FakeMaps(30, chain="KFC", chain_every=5)
+    checkpoint = RunCheckpoint.open("bench", path=path)
+    first = http_run(maps, 8, checkpoint)
+    checkpoint.flush()
+    assert [biz["name"] for biz in first].count("KFC") == 2
+    assert all("place_key" not in biz for biz in first)
+
+    resumed = http_run(maps, 30, RunCheckpoint.open("bench", resume=True, path=path))
+    branches = [biz for biz in resumed if biz["name"] == "KFC"]
+    assert len(resumed) == 30
+    assert len(branches) == 6 and len({biz["address"] for biz in branches}) == 6
+
+def test_legacy_name_checkpoints_are_migrated(tmp_path):
+    path = str(tmp_path / "checkpoint.db")
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE runs (query TEXT PRIMARY KEY, settings TEXT NOT NULL, "
+                     "scroll INTEGER NOT NULL DEFAULT 0, updated REAL NOT NULL)")
+        conn.execute("CREATE TABLE seen (query TEXT NOT NULL, name TEXT NOT NULL, PRIMARY KEY (query, name))")
+        conn.execute("INSERT INTO runs VALUES ('bench', '{}', 40, 0)")
+        conn.execute("INSERT INTO seen VALUES ('bench', 'KFC')")
+    conn.close()
+
+    checkpoint = RunCheckpoint.open("bench", resume=True, path=path)
+    assert checkpoint.is_done("0xbe000005:0x9ab0", "KFC")
+    assert not checkpoint.is_done("0xbe000005:0x9ab0", "Shell")
+    checkpoint.mark_seen("0xbe000006:0x1")
+    checkpoint.flush()
+    assert checkpoint.is_done("0xbe000006:0x1")
+    assert list_checkpoints(path)[0]["seen"] == 2
@@ -0,0 +1,138 @@
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from benchmarks.bench_contacts import site_pages
+from contacts import ContactCrawler, HostLimiter, _clean_email, extract_contacts
+from dedupe import e164_phone
+
+@contextmanager
+def local_host(pages, latency=0.0):
+    """One fake host serving `pages` (path -> HTML); yields (base url, log of (start, end) per request)."""
+    log = []
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            started = time.monotonic()
+            time.sleep(latency)
+            body = pages.get(self.path)
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            data = (body or "<h1>Not found</h1>").encode("utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            with lock:
+                log.append((started, time.monotonic()))
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", log
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def record(i, website, social_links=None):
+    return {"name": f"Biz {i}", "website": website, "email": "N/A", "phone": "N/A", "social_links": social_links or {}}
+
+def test_extract_contacts_reads_links_and_text():
+    html = """<html><head><script>var a = "tracker@sentry.io 030 000 0000";</script></head><body>
+        <a href="mailto:Info@MamasKitchen.com.gh?subject=Hi">Mail</a> <a href="tel:024 412 3456">Call</a>
+        <a href="/about#team">Who we are</a> <a href="https://other.com/menu">Menu</a> <a href="/x">Contact us</a>
+        <p>Bookings: bookings@mamaskitchen.com.gh or +233 (0)30 276 1234.</p>
+        <img src="logo@2x.png"> <p>Sample: someone@example.com</p></body></html>"""
+    contacts = extract_contacts(html, "https://mamaskitchen.com.gh/home/")
+    assert contacts["emails"] == ["info@mamaskitchen.com.gh", "bookings@mamaskitchen.com.gh"]
+    assert contacts["phones"] == ["+233244123456", "+233302761234"]
+    assert contacts["links"] == ["https://mamaskitchen.com.gh/about", "https://mamaskitchen.com.gh/x"]
+
+@pytest.mark.parametrize("raw, clean", [
+    ("Info%40Biz.com.gh.", "info@biz.com.gh"),
+    ("icon@2x.png", None),
+    ("someone@example.com", None),
+    ("abc123@o123.ingest.sentry.io", None),
+    ("not-an-email", None),
+])
+def test_clean_email(raw, clean):
+    assert _clean_email(raw) == clean
+
+def test_crawl_finds_contacts_on_sites_and_socials_then_serves_the_cache(tmp_path):
+    pages = {}
+    for site in range(15):
+        pages.update(site_pages(site))
+    # A site with no contacts at all, whose Facebook page lists an email.
+    pages["/bare/"] = "<html><body><p>Welcome</p></body></html>"
+    pages["/facebook.com/bare"] = "<html><body>Email: hello@bare.com.gh</body></html>"
+    with local_host(pages) as (base, log):
+        records = [record(site, f"{base}/s{site}/") for site in range(15)]
+        records.append(record(15, f"{base}/gone/"))
+        records.append(record(16, f"{base}/bare/", {"Facebook": f"{base}/facebook.com/bare"}))
+        crawler = ContactCrawler(workers=8, per_host=4, host_delay=0, cache_file=str(tmp_path / "crawl.db"))
+        crawler.crawl_many(records)
+
+        for site, biz in enumerate(records[:15]):
+            assert biz["email"] == f"info@biz{site}.com.gh"
+            assert biz["emails"] == f"info@biz{site}.com.gh"
+            # Sites with only a home page (every fifth) have no phone to find.
+            assert biz["phone"] == ("N/A" if site % 5 == 0 else e164_phone(f"030 2{site:02d} {site:04d}"))
+        assert records[15]["email"] == records[15]["phone"] == "N/A"
+        assert records[16]["email"] == "hello@bare.com.gh"
+        assert crawler.stats["records"] == 17 and crawler.stats["emails"] == 16
+        fetched = len(log)
+        assert crawler.stats["pages"] + crawler.stats["errors"] == fetched
+        # Sites share the host's /contact fallback pages, so the cold run already has cache hits.
+        lookups = fetched + crawler.stats["cached"]
+
+        again = [record(site, biz["website"], biz["social_links"]) for site, biz in enumerate(records)]
+        crawler.reset_stats()
+        crawler.crawl_many(again)
+        assert len(log) == fetched
+        assert crawler.stats["pages"] == crawler.stats["errors"] == 0
+        assert crawler.stats["cached"] == lookups
+        assert [biz["email"] for biz in again] == [biz["email"] for biz in records]
+        assert [biz["phone"] for biz in again] == [biz["phone"] for biz in records]
+        crawler.cache.close()
+
+def test_crawler_paces_each_host(tmp_path):
+    pages = {f"/p{i}": "<html><body>x</body></html>" for i in range(12)}
+    with local_host(pages, latency=0.1) as (slow, slow_log), local_host(pages) as (fast, fast_log):
+        crawler = ContactCrawler(workers=12, per_host=2, host_delay=0.02, cache_file=None)
+        urls = [f"{slow}/p{i}" for i in range(12)] + [f"{fast}/p{i}" for i in range(12)]
+        started = time.monotonic()
+        threads = [threading.Thread(target=crawler.fetch, args=(url,)) for url in urls]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(slow_log) == len(fast_log) == 12
+        # Never more than two requests in flight to the slow host...
+        for start, _ in slow_log:
+            assert sum(s <= start < e for s, e in slow_log) <= 2
+        # ...and request starts to one host are spaced by the delay (less the server's timing slack).
+        for log in (slow_log, fast_log):
+            starts = sorted(s for s, _ in log)
+            assert min(b - a for a, b in zip(starts, starts[1:])) >= 0.01
+        # The fast host is not held up behind the slow one.
+        assert max(e for _, e in fast_log) - started < max(e for _, e in slow_log) - started
+
+def test_host_limiter_releases_slots():
+    limiter = HostLimiter(per_host=1, delay=0)
+    limiter.acquire("a")
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: (limiter.acquire("a"), acquired.set()))
+    waiter.start()
+    limiter.acquire("b")
+    assert not acquired.wait(0.1)
+    limiter.release("a")
+    assert acquired.wait(1)
+    waiter.join()
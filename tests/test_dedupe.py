@@ -0,0 +1,55 @@
+from dedupe import canonical_name, compare, dedupe_records, fingerprint, identity_key
+from store import BusinessStore
+
+def biz(name, phone=None, address=None, website=None):
+    return {"name": name, "phone": phone or "N/A", "address": address or "N/A", "website": website or "N/A",
+            "email": "N/A", "social_links": {}}
+
+def test_canonical_name_keeps_non_latin_and_stopword_only_names():
+    assert canonical_name("Mama’s Kitchen Ltd.") == "mamas kitchen"
+    assert canonical_name("北京烤鸭") == "北京烤鸭"
+    assert canonical_name("東京寿司") == "東京寿司"
+    assert canonical_name("Ltd") == "ltd"
+    assert canonical_name("ＬＴＤ") == "ltd"
+
+def test_names_without_location_get_distinct_keys():
+    keys = {identity_key(biz(name)) for name in ("北京烤鸭", "東京寿司", "Ltd")}
+    assert len(keys) == 3 and "|" not in keys
+
+def test_nameless_record_has_no_key_and_matches_nothing():
+    assert identity_key(biz("")) == ""
+    score, reason = compare(fingerprint(biz("")), fingerprint(biz("N/A")))
+    assert reason == "different name"
+
+def test_store_keeps_non_latin_and_stopword_only_names_apart(tmp_path):
+    store = BusinessStore(str(tmp_path / "b.db"))
+    decisions = []
+    added = store.add_many([biz("北京烤鸭"), biz("東京寿司"), biz("Ltd")], on_decision=decisions.append)
+    assert len(added) == 3 and store.count() == 3 and not decisions
+    # The same names again are exact duplicates.
+    assert store.add_many([biz("北京烤鸭"), biz("Ltd")]) == []
+    assert store.count() == 3
+
+def test_store_keeps_nameless_records_apart(tmp_path):
+    store = BusinessStore(str(tmp_path / "b.db"))
+    assert len(store.add_many([biz(""), biz("")])) == 2
+    assert not store.contains(biz(""))
+
+def test_same_name_branches_at_different_addresses_stay_apart():
+    oxford = fingerprint(biz("KFC", address="12 Oxford Street, Accra"))
+    spintex = fingerprint(biz("KFC", address="Spintex Road, Accra"))
+    score, reason = compare(oxford, spintex)
+    assert reason == "different location" and score < 0.85
+    assert len(dedupe_records([biz("KFC", address="12 Oxford Street, Accra"),
+                               biz("KFC", address="Spintex Road, Accra")])) == 2
+
+def test_same_name_merges_when_no_location_is_known_or_another_signal_agrees():
+    assert compare(fingerprint(biz("KFC")), fingerprint(biz("KFC", address="Spintex Road, Accra"))) == (1.0, "same name")
+    score, reason = compare(fingerprint(biz("KFC Oxford", phone="024 412 3456")),
+                            fingerprint(biz("KFC Oxford", phone="+233 24 412 3456")))
+    assert reason == "phone" and score == 1.0
+
+def test_address_spelling_variants_still_match():
+    score, reason = compare(fingerprint(biz("Mama's Kitchen", address="12 Oxford Street, Accra")),
+                            fingerprint(biz("Mamas Kitchen", address="12 Oxford St., Accra")))
+    assert reason == "address" and score >= 0.85
@@ -0,0 +1,69 @@
+import copy
+import json
+import os
+
+import pytest
+
+from benchmarks.fake_maps import FIXTURES
+from maps_http import PLACE_FIELDS, PLACE_PATH, XSSI_PREFIX, load_payload, parse_search_payload, place_fields
+
+def recorded_text():
+    with open(os.path.join(FIXTURES, "search_page.txt"), encoding="utf-8") as f:
+        return f.read()
+
+def recorded_place():
+    return parse_search_payload(load_payload(recorded_text()))[0]
+
+def page_with(place):
+    payload = load_payload(recorded_text())
+    entry = [None] * PLACE_PATH[0] + [place]
+    return [[payload[0][0], [payload[0][1][0], entry]]]
+
+def test_load_payload_reads_both_response_wrappings():
+    payload = load_payload(recorded_text())
+    assert payload[0][0] == "restaurants in Accra"
+    # Older responses are the prefixed array itself.
+    assert load_payload(XSSI_PREFIX + "\n" + json.dumps(payload)) == payload
+
+def test_recorded_page_fields():
+    places = parse_search_payload(load_payload(recorded_text()))
+    assert len(places) == 1
+    assert place_fields(places[0]) == {
+        "name": "Mama's Kitchen",
+        "address": "12 Oxford Street, Accra",
+        "address_lines": ["12 Oxford Street", "Accra"],
+        "phone": "024 412 3456",
+        "website": "https://mamaskitchen.com.gh/",
+        "feature_id": "0xfdf9b1d2c6d3e2f:0x5b1c2c3d4e5f6a7b",
+        "category": "Restaurant",
+        "rating": 4.3,
+        "reviews": 128,
+        "place_id": "ChIJL2Pr0tFZ3w8Re2pfTj0sHFs",
+    }
+
+def test_address_falls_back_to_its_lines():
+    place = recorded_place()
+    place[PLACE_FIELDS["address"][0]] = None
+    assert place_fields(place)["address"] == "12 Oxford Street, Accra"
+
+def test_page_past_the_last_result_is_empty():
+    payload = load_payload(recorded_text())
+    assert parse_search_payload([[payload[0][0], [payload[0][1][0]]]]) == []
+    assert parse_search_payload([]) == []
+
+def test_truncated_response_fails():
+    text = recorded_text()
+    with pytest.raises(ValueError):
+        load_payload(text[:len(text) // 2])
+
+def test_truncated_place_entry_fails():
+    place = recorded_place()[:PLACE_FIELDS["name"][0]]
+    with pytest.raises(ValueError, match="no name"):
+        parse_search_payload(page_with(place))
+
+@pytest.mark.parametrize("shift", [1, -1])
+def test_shifted_place_entry_fails(shift):
+    place = copy.deepcopy(recorded_place())
+    place = [None] * shift + place if shift > 0 else place[-shift:]
+    with pytest.raises(ValueError, match="layout changed"):
+        parse_search_payload(page_with(place))
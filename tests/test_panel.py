@@ -0,0 +1,88 @@
+import os
+import shutil
+from urllib.parse import quote
+
+import pytest
+
+from benchmarks.fake_maps import FIXTURES, FakeMaps, FakeMapsDriver
+from extract_businesses import get_panel_details
+from panel import PANEL_EXTRACT_JS, TEXT_CLASSES, panel_fields, parse_panel_html
+
+def fixture_html():
+    with open(os.path.join(FIXTURES, "panel_region.html"), encoding="utf-8") as f:
+        return f.read()
+
+def unusual_panel_html():
+    """The fixture with values parse_details() cannot recognise from the text alone."""
+    html = fixture_html()
+    for old, new in [("12 Oxford Street, Accra", "Osu Badu Link, East Legon"),
+                     ("mamaskitchen.com.gh", "mamaskitchen.restaurant"),
+                     ("024 412 3456", "(030) 277 1234"), ("0244123456", "+233302771234")]:
+        html = html.replace(old, new)
+    return html
+
+def test_parse_panel_html_reads_the_structured_fields_and_text():
+    panel = parse_panel_html(fixture_html())
+    assert panel["fields"] == {
+        "address": "Address: 12 Oxford Street, Accra",
+        "plus_code": "Plus code: CCV5+QX Accra",
+        "phone": "phone:tel:0244123456",
+        "website": "https://mamaskitchen.com.gh/",
+    }
+    for text in ("12 Oxford Street, Accra", "Open ⋅ Closes 10 pm", "Identifies as women-owned", "Suggest an edit"):
+        assert text in panel["texts"]
+    assert len(panel["texts"]) == len(set(panel["texts"]))
+
+def test_panel_fields_from_the_fixture():
+    assert panel_fields(parse_panel_html(fixture_html())) == {
+        "phone": "0244123456", "email": None,
+        "website": "https://mamaskitchen.com.gh/", "address": "12 Oxford Street, Accra",
+    }
+
+def test_structured_fields_are_kept_where_the_text_heuristics_would_drop_them():
+    assert panel_fields(parse_panel_html(unusual_panel_html())) == {
+        "phone": "+233302771234", "email": None,
+        "website": "https://mamaskitchen.restaurant/", "address": "Osu Badu Link, East Legon",
+    }
+
+def test_text_heuristics_fill_only_the_missing_fields():
+    html = fixture_html().replace('data-item-id="address"', 'data-item-id="other"')
+    html = html.replace('data-item-id="oloc"', 'data-item-id="other"')
+    fields = panel_fields({"texts": parse_panel_html(html)["texts"] + ["info@mamaskitchen.com.gh"],
+                           "fields": parse_panel_html(html)["fields"]})
+    assert fields["address"] == "12 Oxford Street, Accra"
+    assert fields["email"] == "info@mamaskitchen.com.gh"
+    assert fields["phone"] == "0244123456"
+
+def test_script_and_html_modes_give_the_same_record():
+    driver = FakeMapsDriver(FakeMaps(5), latency=0)
+    driver.get("https://www.google.com/maps/search/bench")
+    driver.open_index = 2
+    script = panel_fields(get_panel_details(driver, mode="script"))
+    html = panel_fields(get_panel_details(driver, mode="html"))
+    assert script == html and script["phone"] and script["address"]
+
+def _chrome_binary():
+    return next((path for path in map(shutil.which, ("google-chrome", "chromium", "chromium-browser", "chrome"))
+                 if path), None)
+
+@pytest.mark.skipif(_chrome_binary() is None, reason="no headless Chrome here")
+@pytest.mark.parametrize("make_html", [fixture_html, unusual_panel_html])
+def test_panel_extract_js_matches_parse_panel_html(make_html):
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.binary_location = _chrome_binary()
+    for arg in ("--headless=new", "--no-sandbox", "--disable-gpu"):
+        options.add_argument(arg)
+    driver = webdriver.Chrome(options=options)
+    try:
+        page = ('<div class="m6QErb XiKgde" role="region"></div>'
+                f'<div class="m6QErb XiKgde" role="region">{make_html()}</div>')
+        driver.get("data:text/html;charset=utf-8," + quote(page))
+        result = driver.execute_script(PANEL_EXTRACT_JS, TEXT_CLASSES)
+    finally:
+        driver.quit()
+    expected = parse_panel_html(make_html())
+    assert result["fields"] == expected["fields"]
+    assert panel_fields(result) == panel_fields(expected)
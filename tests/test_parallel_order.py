@@ -0,0 +1,93 @@
+import contextlib
+import os
+import re
+import threading
+
+from urllib3.exceptions import MaxRetryError
+
+import extract_businesses as eb
+from benchmarks.bench_scrape import offline_environment
+from benchmarks.fake_maps import FakeMaps, FakeMapsDriver, FakeCSEService
+from checkpoint import RunCheckpoint
+from pipeline import build_filters
+from readiness import readiness
+
+def test_discovery_order_releases_records_once_earlier_places_settle():
+    order = eb._DiscoveryOrder()
+    order.settle(1, {"name": "b"})
+    order.settle(3, {"name": "d"})
+    assert order.ready() == []
+    order.settle(0, {"name": "a"})
+    assert [biz["name"] for biz in order.ready()] == ["a", "b"]
+    order.settle(2)
+    assert [biz["name"] for biz in order.ready()] == ["d"]
+
+def test_parallel_engine_keeps_discovery_order(tmp_path):
+    maps = FakeMaps(120)
+    with offline_environment(FakeCSEService(latency=0.01)), open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        readiness.start_run()
+        driver = FakeMapsDriver(maps, latency=0.001)
+        driver.get("https://www.google.com/maps/search/bench")
+        records = eb.extract_businesses_parallel(
+            driver, lambda: FakeMapsDriver(maps, latency=0.001), max_results=80, workers=4,
+            output_file=str(tmp_path / "b.db"), filters=build_filters(include_websites=True))
+    indexes = [int(re.findall(r"\d+", biz["name"])[-1]) for biz in records]
+    assert len(indexes) >= 80 and indexes == sorted(indexes)
+
+class CrashingDriver(FakeMapsDriver):
+    """Fake driver whose browser dies (urllib3 MaxRetryError) when it opens place `crash_at`."""
+
+    def __init__(self, maps, crash_at, **kwargs):
+        super().__init__(maps, **kwargs)
+        self.crash_at = crash_at
+
+    def get(self, url):
+        if self.maps.index_of(url) == self.crash_at:
+            raise MaxRetryError(None, url, "Connection refused")
+        return super().get(url)
+
+def run_parallel(maps, driver_factory, max_results, tmp_path):
+    with offline_environment(FakeCSEService()), open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        readiness.start_run()
+        driver = FakeMapsDriver(maps)
+        driver.get("https://www.google.com/maps/search/bench")
+        return eb.extract_businesses_parallel(driver, driver_factory, max_results=max_results, workers=3,
+                                              output_file=str(tmp_path / "b.db"),
+                                              filters=build_filters(include_websites=True))
+
+def test_a_crashed_worker_browser_skips_only_its_place(tmp_path):
+    maps = FakeMaps(60)
+    records = run_parallel(maps, lambda: CrashingDriver(maps, crash_at=5), 40, tmp_path)
+    indexes = [int(re.findall(r"\d+", biz["name"])[-1]) for biz in records]
+    assert len(indexes) == 40 and indexes == sorted(indexes) and 5 not in indexes
+
+def test_run_ends_when_every_worker_is_gone(tmp_path):
+    maps = FakeMaps(60)
+
+    def broken_factory():
+        raise RuntimeError("chromedriver missing")
+
+    result = []
+    thread = threading.Thread(target=lambda: result.append(run_parallel(maps, broken_factory, 40, tmp_path)))
+    thread.start()
+    thread.join(timeout=30)
+    assert not thread.is_alive() and result == [[]]
+
+def test_resumed_run_at_max_results_collects_nothing_more(tmp_path):
+    maps = FakeMaps(30)
+    path = str(tmp_path / "checkpoint.db")
+    checkpoint = RunCheckpoint.open("bench", path=path)
+    with offline_environment(FakeCSEService()), open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        readiness.start_run()
+        for max_results in (5, 5):
+            driver = FakeMapsDriver(maps)
+            driver.get("https://www.google.com/maps/search/bench")
+            records = list(eb.iter_parallel_businesses(driver, lambda: FakeMapsDriver(maps), max_results, workers=3,
+                                                       filters=build_filters(include_websites=True),
+                                                       checkpoint=checkpoint))
+            assert len(records) == 5
+            checkpoint = RunCheckpoint.open("bench", resume=True, path=path)
+    assert checkpoint.resumed_records == 5
@@ -0,0 +1,26 @@
+import threading
+
+from checkpoint import list_checkpoints
+from getbusinesses import resume_options, run_extraction
+from pipeline import build_filters
+from test_stop import fake_http_maps
+
+def test_resume_uses_the_saved_mode_and_engine():
+    stop_event = threading.Event()
+    stop_event.set()
+    current = {"mode": "panel", "engine": "browser", "workers": 2}
+    with fake_http_maps():
+        run_extraction("bench", 40, log_func=lambda msg: None, engine="http", mode="list",
+                       filters=build_filters(include_websites=True), stop_event=stop_event)
+        run = list_checkpoints()[0]
+        options = resume_options(run, current)
+        assert options == {"mode": "list", "engine": "http", "workers": 2, "viewport": None}
+        # Resumed through the browser engine this would try to start Chrome.
+        records = run_extraction(run["query"], run["settings"]["max_results"], log_func=lambda msg: None,
+                                 resume=True, filters=build_filters(include_websites=True), **options)
+    assert len(records) == 40
+    assert current["engine"] == "browser"
+
+def test_resume_keeps_current_options_for_checkpoints_without_settings():
+    run = {"query": "q", "settings": {}, "records": 0, "seen": 0}
+    assert resume_options(run, {"mode": "list", "engine": "http"}) == {"mode": "list", "engine": "http", "viewport": None}
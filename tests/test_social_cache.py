@@ -0,0 +1,18 @@
+from social_cache import SocialCache
+
+def test_put_trims_least_recently_used_every_500_writes(tmp_path):
+    cache = SocialCache(str(tmp_path / "social.db"), max_entries=100)
+    for i in range(499):
+        cache.put(f"Business {i}", "{name} facebook", {"facebook": f"https://facebook.com/b{i}"})
+    assert cache.stats()["size"] == 499
+    assert cache.evictions == 0
+
+    assert cache.get("Business 0", "{name} facebook") == {"facebook": "https://facebook.com/b0"}
+    cache.put("Business 499", "{name} facebook", {})
+    assert cache.stats()["size"] == 100
+    assert cache.evictions == 400
+    # The entry read just before the trim was recently used, so it survives.
+    assert cache.get("Business 0", "{name} facebook") is not None
+    assert cache.get("Business 1", "{name} facebook") is None
+    assert cache.get("Business 499", "{name} facebook") == {}
+    cache.close()
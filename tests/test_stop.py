@@ -0,0 +1,44 @@
+import contextlib
+import os
+import threading
+
+from benchmarks.bench_scrape import offline_environment
+from benchmarks.bench_tiles import scratch_session
+from benchmarks.fake_maps import FakeMaps, FakeTiledMapsSession, FakeCSEService
+from getbusinesses import run_extraction
+from pipeline import build_filters
+from tiles import plan_tiles, run_tiles
+
+BOUNDS = (5.52, -0.30, 5.68, -0.12)
+
+@contextlib.contextmanager
+def fake_http_maps(places=300):
+    session = FakeTiledMapsSession(FakeMaps(places), BOUNDS, cap=120, latency=0)
+    with scratch_session(session), offline_environment(FakeCSEService()), \
+            open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield session
+
+def test_a_new_run_does_not_clear_the_callers_stop_request():
+    stop_event = threading.Event()
+    stop_event.set()
+    with fake_http_maps():
+        records = run_extraction("bench", 50, log_func=lambda msg: None, engine="http",
+                                 filters=build_filters(include_websites=True), stop_event=stop_event)
+    assert records == [] and stop_event.is_set()
+
+def test_stop_reaches_tile_jobs_that_start_afterwards():
+    stop_event = threading.Event()
+
+    def run(*args, **kwargs):
+        # The first tile's job asks to stop; the tiles queued behind it must see that.
+        stop_event.set()
+        return run_extraction(*args, **kwargs)
+
+    with fake_http_maps() as session:
+        records, report = run_tiles("bench", plan_tiles(BOUNDS, 2, 2), run,
+                                    lambda: build_filters(include_websites=True), concurrency=1, retries=0,
+                                    log=lambda msg: None, stop_flag_func=stop_event.is_set,
+                                    request_stop=stop_event.set, engine="http", stop_event=stop_event)
+    assert stop_event.is_set() and records == []
+    assert [entry["status"] for entry in report].count("skipped") == 3
+    assert session.searches <= 1
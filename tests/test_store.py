@@ -0,0 +1,120 @@
+import csv
+import json
+import threading
+
+import pytest
+
+from exporters import DEFAULT_FIELDS, export_records
+from store import BusinessStore
+
+def biz(name, phone="N/A", address="N/A", email="N/A", website="N/A", social_links=None):
+    return {"name": name, "phone": phone, "address": address, "email": email, "website": website,
+            "social_links": social_links or {}}
+
+RECORDS = [
+    biz("Mama's Kitchen", "024 412 3456", "12 Oxford Street, Accra", website="https://mamaskitchen.com.gh/",
+        social_links={"facebook": "https://facebook.com/mamaskitchen"}),
+    biz("Top Up Pharmacy", "030 277 1234", "Ring Road, Accra", email="info@topup.com.gh"),
+    biz("北京烤鸭", "055 123 4567", "Osu, Accra"),
+]
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "businesses.json"
+    legacy.write_text(json.dumps(RECORDS, ensure_ascii=False), encoding="utf-8")
+    store = BusinessStore(str(legacy))
+    assert store.path == str(tmp_path / "businesses.db")
+    assert [b["name"] for b in store.iter_records()] == [b["name"] for b in RECORDS]
+    store.close()
+
+    legacy.write_text(json.dumps(RECORDS + [biz("Later Shop", "020 000 0001")]), encoding="utf-8")
+    store = BusinessStore(str(legacy))
+    assert store.count() == 3
+    store.clear()
+    store.close()
+    assert BusinessStore(str(legacy)).count() == 0
+
+def test_resaving_a_business_merges_into_the_stored_record(tmp_path):
+    store = BusinessStore(str(tmp_path / "b.db"))
+    assert len(store.add_many([biz("Top Up Pharmacy", "030 277 1234", "Ring Road, Accra")])) == 1
+    decisions = []
+    added = store.add_many([biz("Top Up Pharmacy Ltd", "+233 30 277 1234", email="info@topup.com.gh")],
+                           on_decision=decisions.append)
+    assert added == [] and store.count() == 1
+    [stored] = list(store.iter_records())
+    assert stored["email"] == "info@topup.com.gh" and stored["address"] == "Ring Road, Accra"
+    assert [d["reason"] for d in decisions] == ["same key"]
+
+    # A near-duplicate (no phone, spelling variants) is found through the dedupe index.
+    store.add_many([biz("Top-Up Pharmacy", address="Ring Rd, Accra", website="https://topup.com.gh/")],
+                   on_decision=decisions.append)
+    assert store.count() == 1 and decisions[-1]["reason"] == "address"
+    [stored] = list(store.iter_records())
+    assert stored["website"] == "https://topup.com.gh/"
+
+def test_writers_on_separate_connections_do_not_collide(tmp_path):
+    path = str(tmp_path / "b.db")
+    BusinessStore(path).close()
+    records = [biz(f"Shop {i}", f"024{i:07d}", f"{i} Ring Road, Accra") for i in range(200)]
+    errors = []
+
+    def write():
+        # One store per thread stands in for another process writing the same file.
+        store = BusinessStore(path)
+        try:
+            for start in range(0, len(records), 10):
+                store.add_many(records[start:start + 10])
+        except Exception as e:
+            errors.append(e)
+        finally:
+            store.close()
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == [] and BusinessStore(path).count() == 200
+
+def expected_rows():
+    rows = []
+    for record in RECORDS:
+        row = {field: record.get(field, "") for field in DEFAULT_FIELDS if not field.startswith("social_")}
+        for platform in ("facebook", "instagram", "twitter", "linkedin", "youtube", "tiktok"):
+            row[f"social_{platform}"] = record["social_links"].get(platform, "")
+        rows.append(row)
+    return rows
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl", "json"])
+def test_export_round_trip(tmp_path, fmt):
+    store = BusinessStore(str(tmp_path / "b.db"))
+    store.add_many(RECORDS)
+    path = tmp_path / f"out.{fmt}"
+    assert export_records(store.iter_records(), str(path)) == 3
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            rows = list(csv.DictReader(f))
+        elif fmt == "jsonl":
+            rows = [json.loads(line) for line in f]
+        else:
+            rows = json.load(f)
+    assert rows == expected_rows()
+    assert not (tmp_path / f"out.{fmt}.tmp").exists()
+
+def test_parquet_export_round_trip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+    assert export_records(RECORDS, str(path)) == 3
+    assert pq.read_table(str(path)).to_pylist() == expected_rows()
+
+def test_export_where_and_fields(tmp_path):
+    path = tmp_path / "out.jsonl"
+    count = export_records(RECORDS, str(path), fields=["name", "phone"], where=["address~accra", "email!=N/A"])
+    assert count == 1
+    assert json.loads(path.read_text(encoding="utf-8")) == {"name": "Top Up Pharmacy", "phone": "030 277 1234"}
+
+def test_store_export_json_matches_the_legacy_format(tmp_path):
+    store = BusinessStore(str(tmp_path / "b.db"))
+    store.add_many(RECORDS)
+    path = tmp_path / "businesses-export.json"
+    assert store.export_json(str(path)) == 3
+    assert json.loads(path.read_text(encoding="utf-8")) == RECORDS
@@ -0,0 +1,29 @@
+import contextlib
+import os
+
+from benchmarks.bench_scrape import offline_environment
+from benchmarks.bench_tiles import scratch_session
+from benchmarks.fake_maps import FakeMaps, FakeTiledMapsSession, FakeCSEService
+from getbusinesses import run_extraction
+from pipeline import CARD, build_filters
+from tiles import plan_tiles, run_tiles
+
+BOUNDS = (5.52, -0.30, 5.68, -0.12)
+
+def test_capped_tile_of_chain_branches_is_split_and_covered():
+    maps = FakeMaps(1000, chain="Shell", chain_every=5)
+    session = FakeTiledMapsSession(maps, BOUNDS, cap=120)
+    opened = set()
+
+    def make_filters():
+        # Records every place that gets past the tiles' own card filters.
+        return build_filters(include_websites=True).add(CARD, "opened", lambda biz: opened.add(biz["place_key"]) or True)
+
+    with scratch_session(session), offline_environment(FakeCSEService()), \
+            open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        records, report = run_tiles("bench", plan_tiles(BOUNDS), run_extraction, make_filters, cap=120,
+                                    max_depth=4, retries=0, log=lambda msg: None, engine="http")
+    root = next(entry for entry in report if entry["tile"] == "r1c1")
+    assert root["status"] == "split" and root["listed"] == 120
+    assert len(opened) == 1000
+    assert sum(biz["name"] == "Shell" for biz in records) > 1
@@ -0,0 +1,241 @@
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from dedupe import DedupeIndex, fingerprint, merge_records
+from pipeline import FilterPipeline, CARD
+
+# Google Maps stops listing a search after about 120 places. A tile that lists this many was
+# most likely cut off, so it is split into four quarters that are searched again.
+RESULT_CAP = 120
+MAX_DEPTH = 3
+# Map area a tile's zoom is fitted to: the viewport the HTTP engine requests, which is also
+# smaller than the map pane of the browser's 1920x1080 window.
+VIEWPORT_PX = (1024, 768)
+MAX_ZOOM = 21
+KM_PER_DEGREE = 111.32
+LISTED_FILTER = "listed in this tile"
+PARENT_FILTER = "not listed by a parent tile"
+
+class Tile:
+    """One rectangular map cell (degrees), searched through the viewport that fits it."""
+
+    def __init__(self, south: float, west: float, north: float, east: float, label: str = "r1c1", depth: int = 0):
+        self.south, self.west, self.north, self.east = south, west, north, east
+        self.label = label
+        self.depth = depth
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    @property
+    def zoom(self) -> float:
+        """Highest zoom (to 0.01) at which the whole tile fits in VIEWPORT_PX."""
+        lat = math.radians(self.center[0])
+        by_width = VIEWPORT_PX[0] * 360 / (256 * (self.east - self.west))
+        by_height = VIEWPORT_PX[1] * 360 * math.cos(lat) / (256 * (self.north - self.south))
+        return min(MAX_ZOOM, math.floor(math.log2(min(by_width, by_height)) * 100) / 100)
+
+    @property
+    def viewport(self) -> Tuple[float, float, float]:
+        """(lat, lng, zoom) as search_url and the HTTP engine take it."""
+        lat, lng = self.center
+        return round(lat, 6), round(lng, 6), self.zoom
+
+    @property
+    def area_km2(self) -> float:
+        height = (self.north - self.south) * KM_PER_DEGREE
+        width = (self.east - self.west) * KM_PER_DEGREE * math.cos(math.radians(self.center[0]))
+        return height * width
+
+    def split(self) -> List["Tile"]:
+        """The four quarters: south-west, south-east, north-west, north-east."""
+        lat, lng = self.center
+        return [
+            Tile(self.south, self.west, lat, lng, f"{self.label}.1", self.depth + 1),
+            Tile(self.south, lng, lat, self.east, f"{self.label}.2", self.depth + 1),
+            Tile(lat, self.west, self.north, lng, f"{self.label}.3", self.depth + 1),
+            Tile(lat, lng, self.north, self.east, f"{self.label}.4", self.depth + 1),
+        ]
+
+    def bounds(self) -> List[float]:
+        return [self.south, self.west, self.north, self.east]
+
+def _place(biz: Dict[str, Any]) -> Optional[str]:
+    """A listed card's place_key (its name when the engine gave none), so chain branches count apart."""
+    return biz.get("place_key") or biz.get("name")
+
+def parse_bounds(text: str) -> Tuple[float, float, float, float]:
+    """'south,west,north,east' in degrees, e.g. '5.52,-0.30,5.68,-0.12' for central Accra."""
+    try:
+        south, west, north, east = (float(part) for part in text.split(","))
+    except ValueError:
+        raise ValueError(f"expected south,west,north,east in degrees, got '{text}'")
+    if not (-90 <= south < north <= 90 and -180 <= west < east <= 180):
+        raise ValueError(f"'{text}' is not a south,west,north,east box")
+    return south, west, north, east
+
+def parse_grid(text: str) -> Tuple[int, int]:
+    """'3x4' -> (3 rows, 4 columns); '3' -> (3, 3)."""
+    rows, _, cols = text.lower().partition("x")
+    try:
+        rows, cols = int(rows), int(cols or rows)
+    except ValueError:
+        raise ValueError(f"expected ROWSxCOLS, got '{text}'")
+    if rows < 1 or cols < 1:
+        raise ValueError(f"grid '{text}' needs at least one row and column")
+    return rows, cols
+
+def plan_tiles(bounds: Tuple[float, float, float, float], rows: int = 1, cols: int = 1) -> List[Tile]:
+    """Splits `bounds` into a rows x cols grid, labelled r1c1 (south-west corner) onwards."""
+    south, west, north, east = bounds
+    height, width = (north - south) / rows, (east - west) / cols
+    return [
+        Tile(south + r * height, west + c * width, south + (r + 1) * height, west + (c + 1) * width,
+             f"r{r + 1}c{c + 1}")
+        for r in range(rows) for c in range(cols)
+    ]
+
+def run_tiles(query: str, tiles: List[Tile], run: Callable[..., List[Dict[str, Any]]],
+              make_filters: Callable[[], FilterPipeline], cap: int = RESULT_CAP, max_depth: int = MAX_DEPTH,
+              concurrency=1, retries=1, retry_delay=5.0, resume=False, log: Callable[[str], None] = print,
+              stop_flag_func: Optional[Callable[[], bool]] = None, request_stop: Optional[Callable[[], None]] = None,
+              **run_options) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Searches `query` in every tile through `run` (run_extraction, or a fake source in the
+    benchmarks) on `concurrency` threads. A tile that lists `cap` places is split into four
+    and its quarters are queued, down to `max_depth` splits; a quarter drops the places its
+    parent tiles listed (by place_key) at the card stage, so their panels are not opened twice. Results are
+    merged as tiles finish: a place found by neighbouring tiles is kept once.
+    Returns (unique records, one report entry per tile searched).
+    """
+    index = DedupeIndex()
+    unique: List[Dict[str, Any]] = []
+    report: List[Dict[str, Any]] = []
+    total_area = sum(tile.area_km2 for tile in tiles)
+
+    def run_tile(tile: Tile, skip: Set[str]) -> Tuple[List[Dict[str, Any]], Set[str], Dict[str, Any]]:
+        lat, lng, zoom = tile.viewport
+        entry = {"tile": tile.label, "depth": tile.depth, "bounds": tile.bounds(), "center": [lat, lng],
+                 "zoom": zoom, "area_share": round(tile.area_km2 / total_area, 6), "status": "skipped",
+                 "attempts": 0, "listed": 0, "collected": 0, "new": 0, "seconds": 0.0, "error": None}
+        if stop_flag_func and stop_flag_func():
+            return [], set(), entry
+        tag = f"[{tile.label}] "
+        records: List[Dict[str, Any]] = []
+        listed: Set[str] = set()
+        started = time.perf_counter()
+        for attempt in range(retries + 1):
+            entry["attempts"] = attempt + 1
+            listed = set()
+            filters = FilterPipeline([(CARD, LISTED_FILTER, lambda biz: listed.add(_place(biz)) or True)]
+                                     + make_filters().filters)
+            if skip:
+                filters.add(CARD, PARENT_FILTER, lambda biz: _place(biz) not in skip)
+            try:
+                records = run(query, cap, filters=filters, viewport=tile.viewport, resume=resume or attempt > 0,
+                              log_func=lambda msg: log(tag + msg), reset_stats=False, raise_errors=True,
+                              **run_options)
+                entry["status"] = "stopped" if stop_flag_func and stop_flag_func() else "ok"
+                entry["error"] = None
+                break
+            except Exception as e:
+                entry["status"] = "failed"
+                entry["error"] = str(e)
+                if attempt < retries and not (stop_flag_func and stop_flag_func()):
+                    delay = retry_delay * (2 ** attempt)
+                    log(f"{tag}🔁 tile failed ({e}); retrying in {delay:.0f}s\n")
+                    time.sleep(delay)
+                else:
+                    break
+        entry["listed"] = len(listed)
+        entry["collected"] = len(records)
+        entry["seconds"] = round(time.perf_counter() - started, 1)
+        return records, listed | skip, entry
+
+    merged = 0
+
+    def merge(records: List[Dict[str, Any]]) -> int:
+        nonlocal merged
+        new = 0
+        for biz in records:
+            fp = fingerprint(biz)
+            found = index.match(fp)
+            if found is None:
+                index.add(len(unique), fp)
+                unique.append(biz)
+                new += 1
+                continue
+            ref = found[0]
+            merged += 1
+            unique[ref] = merge_records(unique[ref], biz)
+            index.add(ref, fingerprint(unique[ref]))
+        return new
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="tile")
+    pending = {executor.submit(run_tile, tile, set()): tile for tile in tiles}
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                tile = pending.pop(future)
+                records, skip, entry = future.result()
+                entry["new"] = merge(records)
+                report.append(entry)
+                if entry["status"] != "ok" or entry["listed"] < cap:
+                    continue
+                if tile.depth >= max_depth:
+                    entry["status"] = "capped"
+                    log(f"[{tile.label}] ⚠️ Still {entry['listed']} places at the deepest split; some may be missing\n")
+                    continue
+                entry["status"] = "split"
+                log(f"[{tile.label}] ✂️ {entry['listed']} places listed (cap {cap}); searching its four quarters\n")
+                for child in tile.split():
+                    pending[executor.submit(run_tile, child, skip)] = child
+    except KeyboardInterrupt:
+        if request_stop:
+            request_stop()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    if merged:
+        log(f"🔗 Merged {merged} records that more than one tile found\n")
+    return unique, report
+
+def coverage(report: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Share of the planned area by outcome of the tiles that cover it: "complete" (listed under
+    the cap), "capped" (cut off at the deepest split), "failed" and "skipped" (stopped).
+    Split tiles count through their quarters.
+    """
+    shares = {"complete": 0.0, "capped": 0.0, "failed": 0.0, "skipped": 0.0}
+    for entry in report:
+        status = {"ok": "complete", "stopped": "skipped"}.get(entry["status"], entry["status"])
+        if status in shares:
+            shares[status] += entry["area_share"]
+    return {name: round(share, 4) for name, share in shares.items()}
+
+def format_report(report: List[Dict[str, Any]]) -> str:
+    lines = ["🗺️ Tile report:"]
+    for entry in sorted(report, key=lambda e: e["tile"]):
+        line = (f"   {entry['status']:>7}  {entry['tile']} (z{entry['zoom']:g}, {entry['area_share']:.1%} of the area): "
+                f"{entry['listed']} listed, {entry['collected']} collected, {entry['new']} new, "
+                f"{entry['attempts']} attempt(s), {entry['seconds']}s")
+        if entry["error"]:
+            line += f" ({entry['error']})"
+        lines.append(line)
+    shares = coverage(report)
+    lines.append(f"   Coverage: {shares['complete']:.1%} complete, {shares['capped']:.1%} capped at the deepest split, "
+                 f"{shares['failed']:.1%} failed, {shares['skipped']:.1%} skipped")
+    return "\n".join(lines) + "\n"
+
+def write_report(report: List[Dict[str, Any]], path: str):
+    """The per-tile entries and the coverage summary as one JSON document."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"coverage": coverage(report), "tiles": report}, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
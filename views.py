@@ -0,0 +1,157 @@
+import threading
+from collections import deque
+from tkinter import Toplevel, Frame, Label, Button, Scrollbar, END, DISABLED, NORMAL
+from tkinter import ttk
+from typing import Any, Dict, List, Optional
+
+from store import STORE_FILE, get_store
+
+class LogView:
+    """
+    Thread-safe log sink for a Tk Text widget. write() only queues the message; the Tk thread
+    drains the queue every `interval_ms` and inserts everything pending in one call. Pending
+    messages and the widget itself both keep at most `max_lines`, so a flood of messages
+    (or a stalled event loop) costs bounded memory and the oldest lines are dropped first.
+    """
+
+    def __init__(self, text, max_lines: int = 5000, interval_ms: int = 50):
+        self.text = text
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self._pending = deque(maxlen=max_lines)
+        self._dropped = 0
+        self._clear = False
+        self._lock = threading.Lock()
+        self.text.after(self.interval_ms, self._flush)
+
+    def write(self, msg: str):
+        """Queues `msg`; safe to call from any thread."""
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append(msg)
+
+    def clear(self):
+        """Empties the widget and drops queued messages at the next flush."""
+        with self._lock:
+            self._pending.clear()
+            self._dropped = 0
+            self._clear = True
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, deque(maxlen=self.max_lines)
+            dropped, self._dropped = self._dropped, 0
+            clear, self._clear = self._clear, False
+        try:
+            if clear or pending:
+                self._insert(pending, dropped, clear)
+        finally:
+            self.text.after(self.interval_ms, self._flush)
+
+    def _insert(self, pending, dropped: int, clear: bool):
+        # Only follow the output when the user has not scrolled up to read something.
+        follow = self.text.yview()[1] >= 0.999
+        self.text.config(state=NORMAL)
+        if clear:
+            self.text.delete("1.0", END)
+        if dropped:
+            self.text.insert(END, f"… {dropped} older messages skipped\n")
+        self.text.insert(END, "".join(pending))
+        lines = int(self.text.index("end-1c").split(".")[0])
+        if lines > self.max_lines:
+            self.text.delete("1.0", f"{lines - self.max_lines + 1}.0")
+        self.text.config(state=DISABLED)
+        if follow:
+            self.text.see(END)
+
+def _cell(value: Any) -> str:
+    if isinstance(value, dict):
+        value = ", ".join(str(v) for v in value.values() if v)
+    elif isinstance(value, (list, tuple)):
+        value = ", ".join(str(v) for v in value if v)
+    return str(value) if value not in (None, "") else "N/A"
+
+class SavedTable:
+    """
+    Window listing the saved businesses as a table. The Treeview only ever holds the visible
+    rows: scrolling moves an offset into the store and the page at that offset is read on
+    demand, so opening and scrolling cost the same for 100 or 100k records.
+    """
+
+    COLUMNS = (("#", 70), ("name", 220), ("phone", 130), ("address", 260), ("website", 180), ("social_links", 260))
+
+    def __init__(self, master, file_path: str = STORE_FILE, rows: int = 30):
+        self.store = get_store(file_path)
+        self.rows = rows
+        self.offset = 0
+        self.total = 0
+        self._render_pending = False
+
+        self.window = Toplevel(master)
+        self.window.title("Saved Businesses")
+        self.window.geometry("1150x700")
+
+        body = Frame(self.window)
+        body.pack(expand=True, fill="both", padx=10, pady=(10, 0))
+        self.tree = ttk.Treeview(body, columns=[name for name, _ in self.COLUMNS], show="headings",
+                                 height=rows, selectmode="browse")
+        for name, width in self.COLUMNS:
+            self.tree.heading(name, text=name.replace("_", " ").title() if name != "#" else "#")
+            self.tree.column(name, width=width, stretch=name != "#", anchor="w")
+        self.tree.pack(side="left", expand=True, fill="both")
+        self.scrollbar = Scrollbar(body, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        footer = Frame(self.window)
+        footer.pack(fill="x", padx=10, pady=5)
+        self.status = Label(footer, anchor="w")
+        self.status.pack(side="left")
+        Button(footer, text="Refresh", command=self.refresh).pack(side="right")
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.offset - self.rows))
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.offset + self.rows))
+        self.tree.bind("<Home>", lambda e: self.scroll_to(0))
+        self.tree.bind("<End>", lambda e: self.scroll_to(self.total))
+        self.refresh()
+
+    def refresh(self):
+        """Re-reads the record count (new results may have been saved) and redraws the current page."""
+        self.total = self.store.count()
+        self.scroll_to(self.offset)
+
+    def scroll_to(self, offset: int):
+        self.offset = max(0, min(int(offset), self.total - self.rows))
+        # Dragging the scrollbar fires many events per frame; only the last position is drawn.
+        if not self._render_pending:
+            self._render_pending = True
+            self.window.after_idle(self._render)
+        return "break"
+
+    def _render(self):
+        self._render_pending = False
+        records: List[Dict[str, Any]] = self.store.page(self.offset, self.rows)
+        self.tree.delete(*self.tree.get_children())
+        for i, biz in enumerate(records, start=self.offset + 1):
+            self.tree.insert("", END, values=[i] + [_cell(biz.get(name)) for name, _ in self.COLUMNS[1:]])
+        if self.total:
+            first = self.offset / self.total
+            self.scrollbar.set(first, min(1.0, (self.offset + self.rows) / self.total))
+            self.status.config(text=f"Rows {self.offset + 1}–{self.offset + len(records)} of {self.total}")
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.status.config(text="No saved businesses yet.")
+
+    def _on_scrollbar(self, action: str, value: str, unit: Optional[str] = None):
+        if action == "moveto":
+            self.scroll_to(round(float(value) * self.total))
+        elif action == "scroll":
+            step = self.rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(value) * step)
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            return self.scroll_to(self.offset - 3)
+        return self.scroll_to(self.offset + 3)